@@ -0,0 +1,57 @@
+"""
+Decode and encode throughput of the JSON backends on answer pages.
+
+Builds answer pages of the shape returned by `fetch_answer` and times the previous
+decode path (`json.loads(response.text)`, which decodes the body bytes to str first)
+against `parse_json_response(response.content)` with every installed backend.
+
+    python benchmarks/json_benchmark.py --rows 100 --iterations 2000
+"""
+import argparse, json, timeit
+from huma_sdk import _utils
+from huma_sdk._utils import parse_json_response, json_dumps, set_json_backend
+
+
+def create_answer_page(rows):
+    return {
+        "answer": {
+            "type": "table",
+            "columns": ["Sponsor", "Trials", "Phase", "Indication", "Enrollment", "Start Date"],
+            "data": [
+                {
+                    "Sponsor": f"Sponsor {index}", "Trials": index * 3, "Phase": "Phase 2/Phase 3",
+                    "Indication": "Non-small cell lung cancer (NSCLC), stage IIIB–IV", "Enrollment": 120.5 + index,
+                    "Start Date": "2023-04-17T00:00:00Z", "Active": index % 2 == 0, "Links": [f"https://clinicaltrials.gov/ct2/show/NCT0{index:07d}"]
+                } for index in range(rows)
+            ]
+        },
+        "metadata": {"page": 1, "page_count": 100, "total_count": rows * 100, "has_next_page": True}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    options = parser.parse_args()
+
+    answer_page = create_answer_page(options.rows)
+    body = json.dumps(answer_page).encode("utf-8")
+    print(f"answer page: {options.rows} rows, {len(body)} bytes")
+
+    baseline = timeit.timeit(lambda: json.loads(body.decode("utf-8")), number=options.iterations)
+    print(f"{'json.loads(text)':<22} decode: {options.iterations / baseline:8.0f} pages/s")
+
+    for backend in _utils._JSON_CODECS:
+        try:
+            set_json_backend(backend)
+        except ImportError:
+            print(f"{backend:<22} not installed")
+            continue
+        decode = timeit.timeit(lambda: parse_json_response(body), number=options.iterations)
+        encode = timeit.timeit(lambda: json_dumps(answer_page), number=options.iterations)
+        print(f"{backend:<22} decode: {options.iterations / decode:8.0f} pages/s ({baseline / decode:.2f}x)   encode: {options.iterations / encode:8.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Requests/sec of the pooled transport versus one-shot `requests.request` calls.
+
+Starts a local keep-alive stub server that serves an answer page and issues the same
+GET repeatedly, first with a fresh connection per call (the previous behaviour of
+`_Services._make_request`) and then through the shared `_Transport`.
+
+    python benchmarks/transport_benchmark.py --requests 2000 --workers 8
+"""
+import argparse, json, threading, time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from huma_sdk._transport import _Transport
+
+ANSWER_PAGE = json.dumps({
+    "answer": {"type": "table", "data": [{"sponsor": f"Sponsor {index}", "trials": index} for index in range(50)]},
+    "metadata": {"page": 1, "page_count": 100, "total_count": 5000, "has_next_page": True}
+}).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(ANSWER_PAGE)))
+        self.end_headers()
+        self.wfile.write(ANSWER_PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(send_request, url, total_requests, workers):
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: send_request(method="GET", url=url).content, range(total_requests)))
+    return total_requests / (time.perf_counter() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    options = parser.parse_args()
+
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/questions/ticket/result"
+    transport = _Transport(pool_maxsize=options.workers)
+
+    try:
+        for workers in sorted({1, options.workers}):
+            before = run(requests.request, url, options.requests, workers)
+            after = run(transport.request, url, options.requests, workers)
+            print(f"workers={workers:<3} requests.request: {before:8.0f} req/s   _Transport: {after:8.0f} req/s   speedup: {after / before:.2f}x")
+    finally:
+        transport.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
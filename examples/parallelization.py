@@ -51,6 +51,8 @@ def submit_questions(questions: List, commands: List=[]):
     pass
 
 def submit_questions_thread_manager(questions: List[str], commands: List=[]):
+    # Smooth the submissions of all worker threads to 5 per second, with bursts of 10
+    huma_sdk.configure_rate_limits({"questions": (5, 10)})
     list_of_batches_of_questions = _get_question_batches(questions, batch_size=15)
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
         futures = [executor.submit(submit_questions, batch, commands) for batch in list_of_batches_of_questions]
@@ -1,6 +1,24 @@
 from huma_sdk._session import _Session
+from huma_sdk._resources import http_cache_stats
+from huma_sdk._transport import configure_transport, configure_asyncio_transport, transport_stats
+from huma_sdk._helpers.retry_helpers import RetryPolicy, RetryBudget
+from huma_sdk._helpers.timeout_helpers import deadline_scope
+from huma_sdk._utils import set_json_backend
+from huma_sdk._helpers.coalesce_helpers import coalescing_stats
+from huma_sdk._helpers.rate_limit_helpers import configure_rate_limits
+from huma_sdk._helpers.concurrency_helpers import concurrency_stats
+from huma_sdk._helpers.circuit_breaker_helpers import configure_circuit_breakers, circuit_breaker_stats
+from huma_sdk._helpers.hedge_helpers import HedgePolicy
+from huma_sdk._helpers.middleware_helpers import Middleware, configure_middleware
+from huma_sdk._helpers.tracing_helpers import configure_tracer
+from huma_sdk._schema.events import EventType, ChatEvent, QuestionAskedEvent, StreamEvent, ProgressEvent, DebugEvent, \
+    VisualEvent, FollowUpEvent, ErrorEvent, MessageCompletedEvent
 
 
 def session(*args, **kwargs):
     session = _Session(*args, **kwargs)
-    return session.create_connection(*args, **kwargs)
\ No newline at end of file
+    return session.create_connection(*args, **kwargs)
+
+
+def prewarm(service_names=None, **kwargs):
+    return _Session.prewarm(service_names, **kwargs)
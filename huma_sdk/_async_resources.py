@@ -1,12 +1,19 @@
-import requests, threading, json
+import time, contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing_extensions import override
-from huma_sdk._utils import parse_json_response
+from huma_sdk._utils import parse_json_response, json_loads, json_dumps
+from huma_sdk._transport import get_transport
+from huma_sdk._helpers.middleware_helpers import RequestContext, MiddlewareChain, get_middleware
+from huma_sdk._helpers.stats_helpers import ClientStats, graphql_operation, request_body_size
+from huma_sdk._helpers.tracing_helpers import start_span, start_detached_span
 from huma_sdk._schema.inputs import SendMessageInput
 from huma_sdk._helpers.questions_helper import QuestionQueue
 from huma_sdk._helpers.event_helpers import ThreadEventManager, EventHandler
 from huma_sdk._helpers.async_helpers import SubscriptionClient, AppsyncSchemaClient
 
 # Constants
+ANSWER_DATA_PAGE_SIZE = 100
+ANSWER_DATA_MAX_WORKERS = 4
 RED = "\033[91m"
 GREEN = "\033[92m"
 YELLOW = "\033[93m"
@@ -14,16 +21,30 @@ RESET = "\033[0m"
 
 
 class BaseChatService(SubscriptionClient, AppsyncSchemaClient):
-    def __init__(self, service_name=None, api_version="v1", **kwargs):
+    def __init__(self, service_name=None, api_version="v1", transport=None, middleware=None,
+                 answer_page_size: int=ANSWER_DATA_PAGE_SIZE, answer_max_workers: int=ANSWER_DATA_MAX_WORKERS, **kwargs):
         self.service_name = service_name
         self.api_version = api_version
+        self.transport = transport or get_transport()
+        self._middleware = MiddlewareChain(middleware) if isinstance(middleware, (list, tuple)) else middleware
+        self._stats = ClientStats()
         self.chat_id = None
         self.message_id = None
         self.should_stop = False  # Variable to control the loop
         self.final_messages = None  # Variable to store final messages
         self.questions_queue = QuestionQueue()
+        self.answer_page_size = answer_page_size
+        self.answer_max_workers = max(answer_max_workers or 1, 1)
         super().__init__(**kwargs)
 
+    @property
+    def middleware(self):
+        return self._middleware or get_middleware()
+
+    def stats(self):
+        """Return the GraphQL requests sent by this client, with latency percentiles per operation (e.g. `POST graphql newChat`)."""
+        return self._stats.snapshot()
+
     def get_headers(self):
         return {'authorization': f"Bearer {self.api_secret_key}"}
 
@@ -35,20 +56,32 @@ class BaseChatService(SubscriptionClient, AppsyncSchemaClient):
             'query': query,
             'variables': variables,
         }
-        response = requests.post(self.graphql_api_url, headers=self.get_headers(), json=data)
-        return response.json()
+        headers = {**self.get_headers(), 'Content-Type': "application/json"}
+        request_payload = {'method': "POST", 'url': self.graphql_api_url, 'headers': headers, 'data': json_dumps(data)}
+        operation = graphql_operation(query)
+        endpoint, started_at = f"POST graphql {operation}", time.monotonic()
+        with start_span("huma_sdk.graphql", {"graphql.operation.name": operation, "huma.service": self.service_name}) as span:
+            try:
+                response = self.middleware.send(RequestContext(request_payload, self.service_name), self.transport.request)
+            except Exception as request_error:
+                self._stats.record(endpoint, time.monotonic() - started_at, error=type(request_error).__name__)
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+        self._stats.record(endpoint, time.monotonic() - started_at, status_code=response.status_code,
+                           bytes_out=request_body_size(response), bytes_in=len(response.content))
+        return json_loads(response.content)
 
     def handle_subscription(self, subscription_query, variables, callback, connection_name):
-        threading.Thread(target=self.subscription_thread, args=(subscription_query, variables, callback, connection_name)).start()
+        return self.subscribe(subscription_query, variables, callback, connection_name)
 
     def event_manager(self, data):
         """Callback Function"""
 
-    def subscribe_to_messages(self, variables=None, connection_name=None):
+    def subscribe_to_messages(self, variables=None, connection_name=None, callback=None):
         subscription_schema = self.get_schema(type="UpdateMessageSubscription", version=self.api_version)
-        self.handle_subscription(
+        return self.handle_subscription(
             subscription_schema, variables,
-            self.event_manager, connection_name=connection_name
+            callback or self.event_manager, connection_name=connection_name
         )
 
     def fetch_answer_data(self, variables=None):
@@ -56,6 +89,34 @@ class BaseChatService(SubscriptionClient, AppsyncSchemaClient):
         response = self.execute_gql(query, variables)
         return response['data']['getAnswerData']
 
+    def fetch_answer_pages(self, utterance_content, has_next_page_key):
+        """
+        Fetch every `getAnswerData` page of a visual answer, in page order.
+
+        Pages have a fixed size of `answer_page_size` records. The API reports no page count,
+        so after the first page the next `answer_max_workers` pages are fetched concurrently,
+        window after window, until a page reports no next page; pages past it are dropped.
+        """
+        page_size = self.answer_page_size
+        fetch_page = lambda page: self.fetch_answer_data(self.get_utterance_id_variables(utterance_content, page, page_size))
+        self.logger.info(f'Received Answer Id, Fetching answer data in batches of {page_size} records')
+        pages = [fetch_page(1)]
+        if not pages[-1].get(has_next_page_key) or self.answer_max_workers <= 1:
+            while pages[-1].get(has_next_page_key):
+                pages.append(fetch_page(len(pages) + 1))
+            return pages
+
+        with ThreadPoolExecutor(max_workers=self.answer_max_workers) as executor:
+            while pages[-1].get(has_next_page_key):
+                first_page = len(pages) + 1
+                self.logger.info(f'Fetching answer data for batches {first_page} to {first_page + self.answer_max_workers - 1}')
+                futures = [executor.submit(contextvars.copy_context().run, fetch_page, page) for page in range(first_page, first_page + self.answer_max_workers)]
+                for future in futures:
+                    pages.append(future.result())
+                    if not pages[-1].get(has_next_page_key):
+                        break
+        return pages
+
     def determine_topic(self, question: list, topic: str):
         if not topic:
             if isinstance(question[0], str):
@@ -75,15 +136,8 @@ class ChatServiceV1(BaseChatService):
         return {'utteranceId': utterance_id, "page": page, "limit": limit}
 
     def manage_visual_response(self, message):
-        page, limit, has_next_page, result = 1, 100, True, []
-        self.logger.info(f'Received Answer Id, Fetching answer data in batches of {limit} records')
-        while has_next_page:
-            self.logger.info(f'Fetching answer data for batch {page}')
-            variables = self.get_utterance_id_variables(message['content'], page, limit)
-            response = self.fetch_answer_data(variables)
-            has_next_page = response.get('hasNextPage')
-            page+=1
-            limit+=100
+        result = []
+        for response in self.fetch_answer_pages(message['content'], 'hasNextPage'):
             result.extend(parse_json_response(response.get('data')))
 
         message['content'] = result
@@ -96,15 +150,17 @@ class ChatServiceV1(BaseChatService):
 
         return self.event_handler._emit_subscription_event(message, self.api_version)
 
-    def get_messages(self, thread_id, **kwargs):
-        query = self.get_schema(type="GetMessages", api_version=self.api_version)
-        variables = {
+    def get_messages_variables(self, thread_id, **kwargs):
+        return {
             "chatId": thread_id,
             "page": kwargs.get('page', 1),
             "limit": kwargs.get('limit', 5),
             "type": kwargs.get('type', 'status'),
         }
-        response = self.execute_gql(query, variables)
+
+    def get_messages(self, thread_id, **kwargs):
+        query = self.get_schema(type="GetMessages", api_version=self.api_version)
+        response = self.execute_gql(query, self.get_messages_variables(thread_id, **kwargs))
         return response['data']['GetMessages']
 
     def verify_thread_id(self, thread_id):
@@ -119,9 +175,8 @@ class ChatServiceV1(BaseChatService):
         response = self.execute_gql(query)
         self.chat_id = response['data']['newChat']['id']
 
-    def execute_process_utterance(self, message_content, **kwargs):
-        query = self.get_schema(type="ProcessUtterance", version=self.api_version)
-        variables = {
+    def get_process_utterance_variables(self, message_content, **kwargs):
+        return {
             "chatId": self.chat_id,
             "respondingToMessageId": self.message_id,
             "utterance": message_content,
@@ -129,11 +184,13 @@ class ChatServiceV1(BaseChatService):
             "sources": kwargs.get('sources'),
             "agent": self.agent
         }
-        response = self.execute_gql(query, variables)
+
+    def execute_process_utterance(self, message_content, **kwargs):
+        query = self.get_schema(type="ProcessUtterance", version=self.api_version)
+        response = self.execute_gql(query, self.get_process_utterance_variables(message_content, **kwargs))
         return response
 
-    def execute_send_message(self, message_content, **kwargs):
-        query = self.get_schema(type="SendMessage", version=self.api_version)
+    def get_send_message_variables(self, message_content, **kwargs):
         message_input = {
             "respondingToMessageId": "",
             "contentType": "question",
@@ -143,8 +200,11 @@ class ChatServiceV1(BaseChatService):
             "sources": kwargs.get('sources', []),
             "agent": self.agent
         }
-        variables = {"chatId": self.chat_id, "message": message_input, "source": "bot"}
-        response = self.execute_gql(query, variables)
+        return {"chatId": self.chat_id, "message": message_input, "source": "bot"}
+
+    def execute_send_message(self, message_content, **kwargs):
+        query = self.get_schema(type="SendMessage", version=self.api_version)
+        response = self.execute_gql(query, self.get_send_message_variables(message_content, **kwargs))
         return response
 
     def send_message(self, message_content, **kwargs):
@@ -154,24 +214,37 @@ class ChatServiceV1(BaseChatService):
         self.is_new_chat = False
         return self.message_id
 
-    def ask_question(self, question: list, thread_id: str=None, topic: str = None, agent: str="Home", event_handler: EventHandler=None):
-        if not thread_id:
-            topic = self.determine_topic(question, topic)
-            self.start_new_chat(topic=topic, agent=agent)
-        else:
-            self.verify_thread_id(thread_id)
-
-        self.agent = agent
-        variables = {'chatId': self.chat_id}
-        self.event_handler = event_handler
-        self.subscribe_to_messages(variables=variables, connection_name="subscribeUpdateMessage")
+    def ask_question(self, question: list, thread_id: str=None, topic: str = None, agent: str="Home", event_handler: EventHandler=None, max_in_flight: int=1):
+        # Ended by the event handler once every question is answered
+        span = start_detached_span("huma_sdk.ask_question", {"huma.api_version": self.api_version, "huma.questions": len(question)})
+        try:
+            if not thread_id:
+                topic = self.determine_topic(question, topic)
+                self.start_new_chat(topic=topic, agent=agent)
+            else:
+                self.verify_thread_id(thread_id)
+
+            self.agent = agent
+            variables = {'chatId': self.chat_id}
+            self.event_handler = event_handler
+            subscription_id = self.subscribe_to_messages(variables=variables, connection_name="subscribeUpdateMessage")
+        except BaseException as error:
+            # No event handler owns the span yet
+            span.record_exception(error)
+            span.end()
+            raise
+
         self.questions_queue.push_multiple(question)
 
+        span.set_attribute("huma.thread_id", self.chat_id)
         return ThreadEventManager(
             event_handler=event_handler,
             result={}, thread_id=self.chat_id,
             questions_queue=self.questions_queue,
-            send_message_function=self.send_message
+            send_message_function=self.send_message,
+            span=span,
+            stop_subscription=lambda: self.unsubscribe(subscription_id),
+            max_in_flight=max_in_flight
         )
 
 
@@ -184,19 +257,9 @@ class ChatServiceV2(BaseChatService):
         return {'utterance_id': utterance_id, "page": page, "limit": limit }
 
     def manage_visual_response(self, message):
-        page, limit, has_next_page, result = 1, 100, True, []
-        self.logger.info(f'Received Answer Id, Fetching answer data in batches of {limit} records')
-        while has_next_page:
-            self.logger.info(f'Fetching answer data for batch {page}')
-            visual = message['event_metadata']['event_data']['sub_message_metadata']['delta']
-            variables = self.get_utterance_id_variables(visual['delta'], page, limit)
-            response = self.fetch_answer_data(variables)
-            has_next_page = response.get('has_next_page')
-            page+=1
-            limit+=100
-            result.append(parse_json_response(response.get('data')))
-
-        message['event_metadata']['event_data']['sub_message_metadata']['delta']['delta'] = result
+        visual = message['event_metadata']['event_data']['sub_message_metadata']['delta']
+        pages = self.fetch_answer_pages(visual['delta'], 'has_next_page')
+        visual['delta'] = [parse_json_response(response.get('data')) for response in pages]
         return message
 
     @override
@@ -208,7 +271,7 @@ class ChatServiceV2(BaseChatService):
 
     def set_user_details(self, response):
         author_metadata = response['data']['newChat']['author']['metadata']
-        self.user_details = json.loads(author_metadata).get('user_details')
+        self.user_details = json_loads(author_metadata).get('user_details')
 
     def verify_thread_id(self, thread_id):
         response = self.get_messages(thread_id)
@@ -233,15 +296,17 @@ class ChatServiceV2(BaseChatService):
             }
         }).model_dump()
 
-    def get_messages(self, thread_id, **kwargs):
-        query = self.get_schema(type="GetMessages", version=self.api_version)
-        variables = {
+    def get_messages_variables(self, thread_id, **kwargs):
+        return {
             "chat_id": thread_id,
             "page": kwargs.get('page', 1),
             "limit": kwargs.get('limit', 5),
             "offset": kwargs.get('offset', 0)
         }
-        response = self.execute_gql(query, variables=variables)
+
+    def get_messages(self, thread_id, **kwargs):
+        query = self.get_schema(type="GetMessages", version=self.api_version)
+        response = self.execute_gql(query, variables=self.get_messages_variables(thread_id, **kwargs))
         return response['data']['getMessages']
 
     def start_new_chat(self, topic=None, agent="home"):
@@ -260,21 +325,34 @@ class ChatServiceV2(BaseChatService):
         response = self.execute_gql(query, variables)
         return response['data']['sendMessage']['event_metadata']['event_data']['id']
 
-    def ask_question(self, question: list, thread_id: str=None, topic: str=None, agent: str="Home", event_handler: EventHandler=None):
-        if not thread_id:
-            self.determine_topic(question, topic)
-            self.start_new_chat(topic=topic, agent=agent)
-        else:
-            self.verify_thread_id(thread_id)
+    def ask_question(self, question: list, thread_id: str=None, topic: str=None, agent: str="Home", event_handler: EventHandler=None, max_in_flight: int=1):
+        # Ended by the event handler once every question is answered
+        span = start_detached_span("huma_sdk.ask_question", {"huma.api_version": self.api_version, "huma.questions": len(question)})
+        try:
+            if not thread_id:
+                self.determine_topic(question, topic)
+                self.start_new_chat(topic=topic, agent=agent)
+            else:
+                self.verify_thread_id(thread_id)
+
+            self.event_handler = event_handler
+            variables = {'user_id': self.user_details.get('user_id')}
+            subscription_id = self.subscribe_to_messages(variables=variables, connection_name="eventReceiver")
+        except BaseException as error:
+            # No event handler owns the span yet
+            span.record_exception(error)
+            span.end()
+            raise
 
-        self.event_handler = event_handler
-        variables = {'user_id': self.user_details.get('user_id')}
-        self.subscribe_to_messages(variables=variables, connection_name="eventReceiver")
         self.questions_queue.push_multiple(question)
 
+        span.set_attribute("huma.thread_id", self.chat_id)
         return ThreadEventManager(
             event_handler=event_handler,
             result={}, thread_id=self.chat_id,
             questions_queue=self.questions_queue,
-            send_message_function=self.send_message
+            send_message_function=self.send_message,
+            span=span,
+            stop_subscription=lambda: self.unsubscribe(subscription_id),
+            max_in_flight=max_in_flight
         )
\ No newline at end of file
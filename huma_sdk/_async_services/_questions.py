@@ -12,6 +12,9 @@ class _AsyncQuestions:
         else:
             raise ValueError(f"Unsupported API version: {api_version}")
 
+    def stats(self):
+        return self.chat_service.stats()
+
     def get_questions_list(self, question, commands):
         command_to_add = ''.join(f" {command}" for command in commands)
 
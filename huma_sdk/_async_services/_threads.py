@@ -11,6 +11,9 @@ class _Threads:
         else:
             raise ValueError(f"Unsupported API version: {api_version}")
 
+    def stats(self):
+        return self.chat_service.stats()
+
 
     def _create(self, topic: str=None, **kwargs):
         self.chat_service.start_new_chat(topic=topic, *kwargs)
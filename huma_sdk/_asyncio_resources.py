@@ -0,0 +1,356 @@
+import time, asyncio, httpx
+from huma_sdk.exceptions import DeadlineExceededError
+from huma_sdk._resources import _Services, _access_probe_cache
+from huma_sdk._helpers.coalesce_helpers import async_request_group
+from huma_sdk._transport import get_asyncio_transport
+from huma_sdk._asyncio_services._paginator import _AsyncioPaginator
+from huma_sdk._helpers.retry_helpers import RETRY_STATUSES, CONNECT_ERROR, CONNECTION_ERROR, TIMEOUT_ERROR
+from huma_sdk._helpers.timeout_helpers import current_deadline
+from huma_sdk._helpers.concurrency_helpers import current_limiter
+from huma_sdk._helpers.circuit_breaker_helpers import FAILURE_STATUSES
+from huma_sdk._helpers.middleware_helpers import RequestContext
+from huma_sdk._helpers.tracing_helpers import start_span, start_detached_span
+from huma_sdk._helpers.stats_helpers import graphql_operation, request_body_size
+from huma_sdk._helpers.event_helpers import ChatEventStream
+from huma_sdk._async_resources import ChatServiceV1, ChatServiceV2
+from huma_sdk._utils import parse_json_response, json_loads, json_dumps
+
+
+class _AsyncioServices(_Services):
+    """
+    asyncio-native base of the REST service clients.
+
+    The asyncio clients reuse the request building of the sync services, but `_make_request`
+    is a coroutine sent through the shared `_AsyncioTransport`, so every public method
+    returns an awaitable and the iterators become async iterators. The access-permission
+    probe cannot block the constructor, so it always runs before the first request.
+    """
+    paginator_class = _AsyncioPaginator
+
+    def __init__(self, *args, transport=None, lazy_probe=True, **kwargs):
+        super().__init__(*args, transport=transport or get_asyncio_transport(), lazy_probe=True, **kwargs)
+        self._async_access_lock = None
+        self._refresh_tasks = set()
+
+    async def verify_access(self):
+        # Created on first use so the lock binds to the loop that runs the client
+        if self._async_access_lock is None:
+            self._async_access_lock = asyncio.Lock()
+
+        async with self._async_access_lock:
+            cache_key = self._probe_cache_key()
+            probe_response = _access_probe_cache.get(cache_key)
+            if probe_response is not None:
+                self._access_verified = True
+                return probe_response
+
+            # Mark first so the probe's own _make_request call does not probe again
+            self._access_verified = True
+            try:
+                probe_response = await self.test_connection()
+            except Exception:
+                self._access_verified = False
+                raise
+
+            if isinstance(probe_response, dict) and "error_message" not in probe_response:
+                _access_probe_cache.set(cache_key, probe_response, self.probe_ttl)
+
+            return probe_response
+
+    def _classify_request_error(self, request_error):
+        if isinstance(request_error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return CONNECT_ERROR
+        if isinstance(request_error, httpx.TimeoutException):
+            return TIMEOUT_ERROR
+        return CONNECTION_ERROR
+
+    def _handle_request_error(self, request_error):
+        if isinstance(request_error, httpx.TimeoutException):
+            self.logger.error(f"TimeoutError: {request_error}")
+            return {"error_message": "Request timed out"}
+
+        self.logger.error(f"ConnectionError: {request_error}")
+        return {"error_message": f"ConnectionError: {request_error}"}
+
+    async def _acquire_concurrency_slot(self, request_payload):
+        limiter, deadline = current_limiter(), current_deadline()
+        if limiter is None:
+            return None
+        if not await limiter.acquire_async(timeout=deadline.remaining() if deadline else None):
+            raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+        return limiter
+
+    async def _refresh_cached(self, cache_key, loader):
+        try:
+            response_data = await loader()
+            if self._is_cacheable(response_data):
+                self.response_cache.set(cache_key, response_data)
+        except Exception:
+            self.logger.exception(f"Background refresh of {cache_key[2]} failed, serving the stale response")
+        finally:
+            self.response_cache.end_refresh(cache_key)
+
+    async def _cached_call(self, cache_key, loader):
+        found, response_data, needs_refresh = self.response_cache.lookup(cache_key)
+        if found:
+            if needs_refresh:
+                # Keep a reference so the refresh task is not garbage collected while it runs
+                refresh_task = asyncio.get_running_loop().create_task(self._refresh_cached(cache_key, loader))
+                self._refresh_tasks.add(refresh_task)
+                refresh_task.add_done_callback(self._refresh_tasks.discard)
+            return response_data
+
+        response_data = await loader()
+        if self._is_cacheable(response_data):
+            self.response_cache.set(cache_key, response_data)
+        return response_data
+
+    async def _make_request(self, revalidate=False, **request_payload):
+        with start_span("huma_sdk.request", self._span_attributes(request_payload)):
+            if not self._access_verified:
+                await self.verify_access()
+
+            http_cache_key, cached_entry = None, None
+            if revalidate:
+                http_cache_key, cached_entry, request_payload = self._prepare_revalidation(request_payload)
+
+            send_request = lambda: self._send_request(http_cache_key, cached_entry, **request_payload)
+            coalescing_key = self._coalescing_key(request_payload)
+            if coalescing_key is None:
+                return await send_request()
+
+            try:
+                return await async_request_group.do(coalescing_key, send_request, timeout=self._coalescing_timeout(), leader_errors=(DeadlineExceededError,))
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+
+    async def _send_request(self, http_cache_key=None, cached_entry=None, **request_payload):
+        method, attempt = request_payload.get('method', "GET"), 1
+        self.retry_policy.record_request()
+        while True:
+            # Retries start only while the deadline has time left, whatever their backoff
+            self._check_deadline(request_payload)
+            circuit_breaker = self.circuit_breakers.get(request_payload.get('url'))
+            circuit_breaker.before_request()
+            rate_limit_delay = None
+            try:
+                rate_limit_delay = self._reserve_rate_limit(request_payload)
+                if rate_limit_delay:
+                    await asyncio.sleep(rate_limit_delay)
+                limiter = await self._acquire_concurrency_slot(request_payload)
+            except BaseException:
+                # Hand back a half-open probe slot when the request is never sent (deadline, cancellation)
+                circuit_breaker.record(None)
+                if rate_limit_delay is not None:
+                    # Nor does it keep the rate-limit token other clients could use
+                    self.rate_limiter.refund(request_payload.get('url'))
+                raise
+            started_at, latency, overloaded, healthy = time.monotonic(), None, False, None
+            response, error_name = None, None
+            try:
+                request = RequestContext(self._apply_timeout(request_payload), self.service_name, attempt)
+                response = await self.middleware.send_async(request, self.transport.request)
+            except httpx.TransportError as request_error:
+                overloaded, healthy, error_name = True, False, type(request_error).__name__
+                self._check_deadline(request_payload)
+                delay = self.retry_policy.next_delay(method, attempt, error_kind=self._classify_request_error(request_error))
+                if delay is None:
+                    return self._handle_request_error(request_error)
+                reason = error_name
+            else:
+                latency, overloaded = time.monotonic() - started_at, response.status_code in RETRY_STATUSES
+                healthy = response.status_code not in FAILURE_STATUSES
+                delay = self.retry_policy.next_delay(method, attempt, status_code=response.status_code, retry_after=response.headers.get('Retry-After'))
+                if delay is None:
+                    return self._handle_api_response(response, http_cache_key, cached_entry)
+                reason = f"status code {response.status_code}"
+            finally:
+                circuit_breaker.record(healthy)
+                if limiter is not None:
+                    limiter.release(latency, overloaded, self._endpoint(request_payload))
+                self._record_attempt(request_payload, attempt, time.monotonic() - started_at, response, error_name)
+
+            self._check_deadline(request_payload, delay)
+            self._log_retry_info(request_payload, attempt, delay, reason)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class _AsyncioChatService:
+    """
+    asyncio-native base of the chat clients, mixed in before `ChatServiceV1` / `ChatServiceV2`.
+
+    GraphQL calls are coroutines sent through the shared `_AsyncioTransport` and the
+    subscription runs on the shared realtime connection, whose events are handed to the
+    event loop. `ask_question` returns a `ChatEventStream` instead of blocking in
+    `until_done()`, so one loop can drive many questions at once.
+    """
+    def __init__(self, *args, transport=None, **kwargs):
+        super().__init__(*args, transport=transport or get_asyncio_transport(), **kwargs)
+
+    async def execute_gql(self, query, variables=None):
+        data = {
+            'query': query,
+            'variables': variables,
+        }
+        headers = {**self.get_headers(), 'Content-Type': "application/json"}
+        request_payload = {'method': "POST", 'url': self.graphql_api_url, 'headers': headers, 'content': json_dumps(data)}
+        operation = graphql_operation(query)
+        endpoint, started_at = f"POST graphql {operation}", time.monotonic()
+        with start_span("huma_sdk.graphql", {"graphql.operation.name": operation, "huma.service": self.service_name}) as span:
+            try:
+                response = await self.middleware.send_async(RequestContext(request_payload, self.service_name), self.transport.request)
+            except Exception as request_error:
+                self._stats.record(endpoint, time.monotonic() - started_at, error=type(request_error).__name__)
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+        self._stats.record(endpoint, time.monotonic() - started_at, status_code=response.status_code,
+                           bytes_out=request_body_size(response), bytes_in=len(response.content))
+        return json_loads(response.content)
+
+    async def fetch_answer_data(self, variables=None):
+        query = self.get_schema(type="GetAnswerData", version=self.api_version)
+        response = await self.execute_gql(query, variables)
+        return response['data']['getAnswerData']
+
+    async def fetch_answer_pages(self, utterance_content, has_next_page_key):
+        page_size = self.answer_page_size
+        fetch_page = lambda page: self.fetch_answer_data(self.get_utterance_id_variables(utterance_content, page, page_size))
+        self.logger.info(f'Received Answer Id, Fetching answer data in batches of {page_size} records')
+        pages = [await fetch_page(1)]
+        while pages[-1].get(has_next_page_key):
+            first_page = len(pages) + 1
+            window = await asyncio.gather(*[fetch_page(page) for page in range(first_page, first_page + self.answer_max_workers)])
+            for response in window:
+                pages.append(response)
+                if not response.get(has_next_page_key):
+                    break
+        return pages
+
+    async def verify_thread_id(self, thread_id):
+        response = await self.get_messages(thread_id)
+        if not response:
+            raise Exception("Wrong thread Id")
+
+        self.chat_id = thread_id
+        return response
+
+    async def _open_event_stream(self, question, variables, connection_name, span, max_in_flight):
+        self.questions_queue.push_multiple(question)
+        event_stream = ChatEventStream(self, self.questions_queue, span, max_in_flight)
+        event_stream.subscription_id = self.subscribe_to_messages(
+            variables=variables, connection_name=connection_name, callback=event_stream.receive
+        )
+        span.set_attribute("huma.thread_id", self.chat_id)
+        return event_stream
+
+
+class AsyncioChatServiceV1(_AsyncioChatService, ChatServiceV1):
+
+    async def manage_visual_response(self, message):
+        result = []
+        for response in await self.fetch_answer_pages(message['content'], 'hasNextPage'):
+            result.extend(parse_json_response(response.get('data')))
+
+        message['content'] = result
+        return message
+
+    async def prepare_message(self, message):
+        if message.get('contentType') == "analyzer" and message.get('debug_and_status_state') == "complete":
+            message = await self.manage_visual_response(message)
+        return message
+
+    async def get_messages(self, thread_id, **kwargs):
+        query = self.get_schema(type="GetMessages", api_version=self.api_version)
+        response = await self.execute_gql(query, self.get_messages_variables(thread_id, **kwargs))
+        return response['data']['GetMessages']
+
+    async def start_new_chat(self, topic=None, agent=None):
+        query = self.get_schema(type="NewChat", version=self.api_version, topic=topic, agent=agent)
+        response = await self.execute_gql(query)
+        self.chat_id = response['data']['newChat']['id']
+
+    async def execute_process_utterance(self, message_content, **kwargs):
+        query = self.get_schema(type="ProcessUtterance", version=self.api_version)
+        return await self.execute_gql(query, self.get_process_utterance_variables(message_content, **kwargs))
+
+    async def execute_send_message(self, message_content, **kwargs):
+        query = self.get_schema(type="SendMessage", version=self.api_version)
+        return await self.execute_gql(query, self.get_send_message_variables(message_content, **kwargs))
+
+    async def send_message(self, message_content, **kwargs):
+        response = await self.execute_send_message(message_content, **kwargs)
+        self.message_id = response['data']['sendMessage']['messageId']
+        await self.execute_process_utterance(message_content, **kwargs)
+        self.is_new_chat = False
+        return self.message_id
+
+    async def ask_question(self, question: list, thread_id: str=None, topic: str=None, agent: str="Home", max_in_flight: int=1):
+        # Ended by the event stream once every question is answered
+        span = start_detached_span("huma_sdk.ask_question", {"huma.api_version": self.api_version, "huma.questions": len(question)})
+        try:
+            if not thread_id:
+                topic = self.determine_topic(question, topic)
+                await self.start_new_chat(topic=topic, agent=agent)
+            else:
+                await self.verify_thread_id(thread_id)
+
+            self.agent = agent
+            return await self._open_event_stream(question, {'chatId': self.chat_id}, "subscribeUpdateMessage", span, max_in_flight)
+        except BaseException as error:
+            # No event stream owns the span yet
+            span.record_exception(error)
+            span.end()
+            raise
+
+
+class AsyncioChatServiceV2(_AsyncioChatService, ChatServiceV2):
+
+    async def manage_visual_response(self, message):
+        visual = message['event_metadata']['event_data']['sub_message_metadata']['delta']
+        pages = await self.fetch_answer_pages(visual['delta'], 'has_next_page')
+        visual['delta'] = [parse_json_response(response.get('data')) for response in pages]
+        return message
+
+    async def prepare_message(self, message):
+        if message['author']['role'] == "visual_assistant":
+            message = await self.manage_visual_response(message)
+        return message
+
+    async def verify_thread_id(self, thread_id):
+        response = await super().verify_thread_id(thread_id)
+        self.user_details = response['chat_details']['users'][0]
+
+    async def get_messages(self, thread_id, **kwargs):
+        query = self.get_schema(type="GetMessages", version=self.api_version)
+        response = await self.execute_gql(query, variables=self.get_messages_variables(thread_id, **kwargs))
+        return response['data']['getMessages']
+
+    async def start_new_chat(self, topic=None, agent="home"):
+        query = self.get_schema(type="NewChat", version=self.api_version, topic=topic)
+        response = await self.execute_gql(query, variables={"topic": topic, "agent": agent})
+        self.set_user_details(response)
+        self.chat_id = response['data']['newChat']['id']
+
+    async def send_message(self, question, **kwargs):
+        query = self.get_schema(type="SendMessage", version=self.api_version)
+        response = await self.execute_gql(query, self.get_send_message_variables(question=question, **kwargs))
+        return response['data']['sendMessage']['event_metadata']['event_data']['id']
+
+    async def ask_question(self, question: list, thread_id: str=None, topic: str=None, agent: str="Home", max_in_flight: int=1):
+        # Ended by the event stream once every question is answered
+        span = start_detached_span("huma_sdk.ask_question", {"huma.api_version": self.api_version, "huma.questions": len(question)})
+        try:
+            if not thread_id:
+                topic = self.determine_topic(question, topic)
+                await self.start_new_chat(topic=topic, agent=agent)
+            else:
+                await self.verify_thread_id(thread_id)
+
+            variables = {'user_id': self.user_details.get('user_id')}
+            return await self._open_event_stream(question, variables, "eventReceiver", span, max_in_flight)
+        except BaseException as error:
+            # No event stream owns the span yet
+            span.record_exception(error)
+            span.end()
+            raise
@@ -0,0 +1,7 @@
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._aliases import _Aliases
+
+
+class _AsyncioAliases(_AsyncioServices, _Aliases):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
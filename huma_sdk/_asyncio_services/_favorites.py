@@ -0,0 +1,7 @@
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._favorites import _Favorites
+
+
+class _AsyncioFavorites(_AsyncioServices, _Favorites):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,7 @@
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._histories import _Histories
+
+
+class _AsyncioHistories(_AsyncioServices, _Histories):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
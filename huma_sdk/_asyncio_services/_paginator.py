@@ -0,0 +1,115 @@
+import asyncio
+from huma_sdk._services._paginator import _Paginator
+from huma_sdk.exceptions import UnauthorizedException, PageFetchError, DeadlineExceededError, CircuitOpenError
+from huma_sdk._helpers.timeout_helpers import deadline_scope
+from huma_sdk._helpers.concurrency_helpers import concurrency_scope
+from huma_sdk._helpers.tracing_helpers import start_span
+
+
+class _AsyncioPaginator(_Paginator):
+    """Awaitable counterpart of `_Paginator` whose caller functions return coroutines."""
+
+    async def _call_api(self, caller_function, page=1, limit=10, *args, **kwargs):
+        kwargs.update({'page': page, "limit": limit})
+        with start_span("huma_sdk.page", {"huma.module": self.module, "huma.page": page}):
+            return await caller_function(*args, **kwargs)
+
+    async def _fetch_page(self, caller_function, page, limit, *args, **kwargs):
+        self._check_deadline(page)
+        try:
+            result_response = await self._call_api(caller_function, page, limit, *args, **kwargs)
+        except (UnauthorizedException, DeadlineExceededError, CircuitOpenError):
+            raise
+        except Exception as e:
+            return None, str(e)
+
+        if not isinstance(result_response, dict):
+            return None, f"Unexpected response {result_response}"
+        if "error_message" in result_response:
+            return None, result_response["error_message"]
+        return result_response, None
+
+    async def _fetch_pages(self, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        pages = list(range(next_page, pages_to_fetch+1))
+        max_workers = min(self._validate_max_workers(self.max_workers), len(pages))
+        if max_workers <= 1:
+            return [(page, *await self._fetch_page(caller_function, page, limit, *args, **kwargs)) for page in pages]
+
+        self.logger.info(f"Fetching {len(pages)} pages with up to {max_workers} concurrent tasks.")
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch_bounded_page(page):
+            async with semaphore:
+                return await self._fetch_page(caller_function, page, limit, *args, **kwargs)
+
+        # Tasks copy the current context, so the deadline and the adaptive limiter follow every page request
+        with concurrency_scope(self.resource_client.concurrency_limiter):
+            tasks = [asyncio.ensure_future(fetch_bounded_page(page)) for page in pages]
+        try:
+            page_results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [(page, *page_result) for page, page_result in zip(pages, page_results)]
+
+    async def fetch_answer_data(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        page_outcomes = await self._fetch_pages(caller_function, next_page, limit, pages_to_fetch, *args, **kwargs)
+        return self._merge_pages(result_response, page_outcomes, limit, pages_to_fetch)
+
+    async def fetch_records(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        page_outcomes = await self._fetch_pages(caller_function, next_page, limit, pages_to_fetch, *args, **kwargs)
+        return self._merge_pages(result_response, page_outcomes, limit, pages_to_fetch)
+
+    async def fetch_single_page(self, caller_function, page, limit, *args, **kwargs):
+        with deadline_scope(self.deadline):
+            return await self._call_api(caller_function, page, limit, *args, **kwargs)
+
+    async def paginate_result(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        with deadline_scope(self.deadline), start_span("huma_sdk.paginate", self._span_attributes(max_page_count, limit)):
+            return await self._paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
+
+    async def _paginate_result(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        page = page or 1
+        result_response = await self._call_api(caller_function, page, limit, *args, **kwargs)
+
+        if isinstance(result_response, dict) and 'metadata' in result_response and result_response['metadata'].get('has_next_page'):
+            limit = self._resolve_limit(limit, result_response)
+            max_page_count = self._validate_max_page_count(max_page_count)
+            total_records_present = result_response['metadata'].get('total_count', 0)
+
+            self._log_total_records_info(total_records_present)
+            pages_to_fetch, total_records = self._calculate_pages_and_records((page-1)+max_page_count, limit, result_response)
+
+            start_record_index =  ((page-1)*limit)+1
+            self.logger.info(f"Index Range of Records to be fetched in this batch: {start_record_index}-{total_records}")
+            self._log_fetch_page_info(page, limit, pages_to_fetch)
+
+            # Fetch additional pages
+            my_args = (result_response, caller_function, page+1, limit, pages_to_fetch, *args)
+            result_response = await (self.fetch_answer_data(*my_args, **kwargs) if self.is_answer_data else self.fetch_records(*my_args, **kwargs))
+
+        return result_response
+
+    async def iter_pages(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        """Asynchronously yield page responses one at a time; see `_Paginator.iter_pages`."""
+        pages_fetched = 0
+        while True:
+            page_response, error_message = await self._fetch_page(caller_function, page, limit, *args, **kwargs)
+            if page_response is None:
+                self._log_failed_page_info(page, error_message)
+                raise PageFetchError(page, error_message)
+
+            yield page_response
+            pages_fetched += 1
+
+            metadata = page_response.get('metadata') or {}
+            if not metadata.get('has_next_page') or (max_page_count and pages_fetched >= max_page_count):
+                return
+            page += 1
+
+    async def iter_records(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        """Asynchronously yield the individual records of every page yielded by `iter_pages`."""
+        async for page_response in self.iter_pages(max_page_count, caller_function, page, limit, *args, **kwargs):
+            for record in self._extract_records(page_response):
+                yield record
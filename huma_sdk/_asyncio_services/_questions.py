@@ -0,0 +1,20 @@
+import asyncio
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._questions import _Questions
+from huma_sdk._helpers.concurrency_helpers import concurrency_scope
+
+
+class _AsyncioQuestions(_AsyncioServices, _Questions):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    async def submit_questions(self, questions: list, commands: list=None, answer_format: str="json", max_workers: int=8):
+        semaphore = asyncio.Semaphore(max(max_workers, 1))
+
+        async def submit_bounded_question(question):
+            async with semaphore:
+                return await self.submit_question(question, commands, answer_format)
+
+        with concurrency_scope(self.concurrency_limiter):
+            tasks = [asyncio.ensure_future(submit_bounded_question(question)) for question in questions]
+        return await asyncio.gather(*tasks)
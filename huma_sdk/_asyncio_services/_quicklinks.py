@@ -0,0 +1,7 @@
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._quicklinks import _Quicklinks
+
+
+class _AsyncioQuicklinks(_AsyncioServices, _Quicklinks):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
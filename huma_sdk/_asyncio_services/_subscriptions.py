@@ -0,0 +1,7 @@
+from huma_sdk._asyncio_resources import _AsyncioServices
+from huma_sdk._services._subscriptions import _Subscriptions
+
+
+class _AsyncioSubscriptions(_AsyncioServices, _Subscriptions):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,17 @@
+from huma_sdk._async_services._questions import _AsyncQuestions
+from huma_sdk._asyncio_resources import AsyncioChatServiceV1, AsyncioChatServiceV2
+
+
+class _AsyncioThreads(_AsyncQuestions):
+    def __init__(self, service_name=None, api_version="v1", **kwargs):
+        # Initialize the appropriate asyncio chat service based on the API version
+        if api_version == "v1":
+            self.chat_service = AsyncioChatServiceV1(service_name=service_name, **kwargs)
+        elif api_version == "v2":
+            self.chat_service = AsyncioChatServiceV2(service_name=service_name, **kwargs)
+        else:
+            raise ValueError(f"Unsupported API version: {api_version}")
+
+    async def create(self, topic: str=None, **kwargs):
+        await self.chat_service.start_new_chat(topic=topic, **kwargs)
+        return self.chat_service.chat_id
@@ -1,21 +1,21 @@
-import json
-import os, websocket
+import os, warnings, threading
 from base64 import b64encode
 from urllib.parse import urlparse
-from huma_sdk._utils import parse_json_response
+from huma_sdk._utils import parse_json_response, json_dumps
 from huma_sdk.utils._log_utils import get_logger
+from huma_sdk._helpers.realtime_helpers import get_realtime_connection, CONNECTION_INIT, RED, GREEN, YELLOW, RESET
 
-# Constants
-RED = "\033[91m"
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-RESET = "\033[0m"
+
+def _warn_deprecated(name, replacement):
+    warnings.warn(f"SubscriptionClient.{name} is deprecated, use {replacement} instead", DeprecationWarning, stacklevel=3)
 
 
 class SubscriptionClient:
     def __init__(self, api_secret_key=None, **kwargs) -> None:
         self.api_secret_key = api_secret_key or os.environ.get('API_SECRET_KEY')
         self.graphql_api_url = kwargs.get('graphql_api_url') or os.environ.get('GRAPHQL_API_URL')
+        # Subscriptions are stopped on the connection that started them, even once the registry opened a new one
+        self._subscription_connections = {}
         self.logger = get_logger(__name__)
 
     def construct_subscription_query(self, subscription_query, variables):
@@ -29,42 +29,126 @@ class SubscriptionClient:
         Returns:
             str: The JSON-encoded subscription query.
         """
-        return json.dumps({ "query" : subscription_query, "variables" : variables })
+        return json_dumps({ "query" : subscription_query, "variables" : variables })
+
+    def extract_host(self):
+        """
+        Extract the host from the AppSync URL stored in environment variables.
+
+        Returns:
+            str: The host part of the AppSync URL.
+        """
+        parsed_url = urlparse(self.graphql_api_url)
+        return parsed_url.netloc
+
+    def get_api_header(self):
+        return {
+            "host": self.extract_host(),
+            "authorization": self.api_secret_key
+        }
+
+    def encode_header(self, header_obj):
+        """
+        Encode the header object to a base64-encoded string.
+
+        Args:
+            header_obj (dict): The header object to be encoded.
+
+        Returns:
+            str: The base64-encoded header string.
+        """
+        return b64encode(json_dumps(header_obj).encode('utf-8')).decode('utf-8')
+
+    def construct_ws_connection_url(self):
+        """
+        Construct the WebSocket connection URL.
+
+        Returns:
+            str: The WebSocket connection URL.
+        """
+        ws_url = self.graphql_api_url.replace("https", "wss") + "/realtime"
+        header = self.encode_header(self.get_api_header())
+        connection_url = f"{ws_url}?header={header}&payload=e30="
+        return connection_url
+
+    @property
+    def realtime_connection(self):
+        """The realtime connection shared by every client of this endpoint and API key."""
+        return get_realtime_connection(self.construct_ws_connection_url(), self.get_api_header())
+
+    def subscribe(self, subscription_query, variables, callback, connection_name):
+        """
+        Start a subscription on the shared realtime connection.
+
+        Args:
+            subscription_query (str): The GraphQL subscription query string.
+            variables (dict): The variables to be included in the subscription query.
+            callback (function): The callback function to process the subscription data; returning True stops the subscription.
+            connection_name (str): The field of the subscription data passed to the callback.
+
+        Returns:
+            str: The subscription id, to be passed to `unsubscribe`.
+        """
+        connection = self.realtime_connection
+        subscription_id = connection.subscribe(
+            self.construct_subscription_query(subscription_query, variables), callback, connection_name
+        )
+        self._subscription_connections[subscription_id] = connection
+        return subscription_id
+
+    def unsubscribe(self, subscription_id):
+        """
+        Stop a subscription started with `subscribe`.
+
+        Args:
+            subscription_id (str): The id returned by `subscribe`.
+        """
+        connection = self._subscription_connections.pop(subscription_id, None) or self.realtime_connection
+        connection.unsubscribe(subscription_id)
 
     def on_open(self, ws):
         """
         Callback function to handle WebSocket opening event.
 
+        Deprecated: subscriptions run on the shared realtime connection, which opens its own socket.
+
         Args:
             ws (websocket.WebSocketApp): The WebSocketApp instance.
         """
-        init = {'type': 'connection_init',"payload": {"connectionTimeoutMs":300000000}}
-        init_conn = json.dumps(init)
-        ws.send(init_conn)
+        _warn_deprecated("on_open", "subscribe")
+        ws.send(json_dumps(CONNECTION_INIT))
         self.logger.info(f"{GREEN}Connection built{RESET}")
 
     def on_error(self, ws, error):
         """
         Callback function to handle WebSocket error event.
 
+        Deprecated: subscriptions run on the shared realtime connection, which handles its own errors.
+
         Args:
             ws (websocket.WebSocketApp): The WebSocketApp instance.
             error (str): The error message.
         """
+        _warn_deprecated("on_error", "subscribe")
         self.logger.error(f"{RED}Error{RESET}")
 
     def on_close(self, ws, close_status_code, close_msg):
         """
         Callback function to handle WebSocket closing event.
 
+        Deprecated: subscriptions run on the shared realtime connection, which reconnects by itself.
+
         Args:
             ws (websocket.WebSocketApp): The WebSocketApp instance.
         """
+        _warn_deprecated("on_close", "subscribe")
         self.logger.info(f"{YELLOW}Connection closed! {RESET}")
 
     def create_on_message(self, subscription_query, variables, callback, connection_name):
         """
-        Create a callback function to handle WebSocket message event.
+        Create a callback function to handle WebSocket message event of a socket carrying a single subscription.
+
+        Deprecated: use `subscribe`, which multiplexes the subscription on the shared realtime connection.
 
         Args:
             subscription_query (str): The GraphQL subscription query string.
@@ -74,101 +158,52 @@ class SubscriptionClient:
         Returns:
             function: A function to handle WebSocket messages.
         """
-        def on_message(ws, message):
-            """
-            Handle WebSocket message event.
+        _warn_deprecated("create_on_message", "subscribe")
 
-            Args:
-                ws (websocket.WebSocketApp): The WebSocketApp instance.
-                message (str): The received message.
-            """
+        def on_message(ws, message):
             message_object = parse_json_response(message)
-            message_type   = message_object['type']
-
-            if( message_type == 'connection_ack' ):
-                register = {
+            message_type = message_object.get('type')
+            if message_type == 'connection_ack':
+                ws.send(json_dumps({
                     "id": "1",
                     'type': 'start',
                     "payload": {
                         "data": self.construct_subscription_query(subscription_query, variables),
-                        "extensions": {
-                            "authorization": {
-                                "host": self.extract_host(),
-                                "authorization": self.api_secret_key
-                            }
-                        }
+                        "extensions": {"authorization": self.get_api_header()}
                     },
-                }
-                start_sub = json.dumps(register)
-                ws.send(start_sub)
-
-            elif(message_type == 'data'):
-                message_object = parse_json_response(message)
+                }))
+            elif message_type == 'data':
                 message_payload = message_object['payload']['data'].get(connection_name)
                 if callback(message_payload):
                     ws.close()
 
         return on_message
 
-    def extract_host(self):
-        """
-        Extract the host from the AppSync URL stored in environment variables.
-
-        Returns:
-            str: The host part of the AppSync URL.
-        """
-        parsed_url = urlparse(self.graphql_api_url)
-        return parsed_url.netloc
-
-    def get_api_header(self):
-        return {
-            "host": self.extract_host(),
-            "authorization": self.api_secret_key
-        }
-
-    def encode_header(self, header_obj):
-        """
-        Encode the header object to a base64-encoded string.
-
-        Args:
-            header_obj (dict): The header object to be encoded.
-
-        Returns:
-            str: The base64-encoded header string.
-        """
-        return b64encode(json.dumps(header_obj).encode('utf-8')).decode('utf-8')
-
-    def construct_ws_connection_url(self):
-        """
-        Construct the WebSocket connection URL.
-
-        Returns:
-            str: The WebSocket connection URL.
-        """
-        ws_url = self.graphql_api_url.replace("https", "wss") + "/realtime"
-        header = self.encode_header(self.get_api_header())
-        connection_url = f"{ws_url}?header={header}&payload=e30="
-        return connection_url
-
     def subscription_thread(self, subscription_query, variables, callback, connection_name):
         """
-        Create and run a WebSocket subscription thread.
+        Run a subscription and block until its callback returns True.
+
+        Deprecated: use `subscribe` and `unsubscribe`, which do not hold a thread per subscription.
 
         Args:
             subscription_query (str): The GraphQL subscription query string.
             variables (dict): The variables to be included in the subscription query.
             callback (function): The callback function to process the subscription data.
         """
-        ws_url = self.construct_ws_connection_url()
-        ws = websocket.WebSocketApp(
-            ws_url,
-            subprotocols=["graphql-ws"],
-            on_open = self.on_open,
-            on_message = self.create_on_message(subscription_query, variables, callback, connection_name),
-            on_error = self.on_error,
-            on_close = self.on_close
-        )
-        ws.run_forever()
+        _warn_deprecated("subscription_thread", "subscribe")
+        stopped = threading.Event()
+
+        def stop_on_true(message_payload):
+            if callback(message_payload):
+                stopped.set()
+                return True
+            return False
+
+        subscription_id = self.subscribe(subscription_query, variables, stop_on_true, connection_name)
+        try:
+            stopped.wait()
+        finally:
+            self.unsubscribe(subscription_id)
 
 class AppsyncSchemaClient:
     def __init__(self, *args, **kwargs): ...
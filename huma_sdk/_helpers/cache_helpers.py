@@ -0,0 +1,181 @@
+import time, threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire `ttl` seconds after they are stored."""
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            return value
+
+    def set(self, key, value, ttl):
+        if not ttl or ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class HTTPCacheEntry:
+    def __init__(self, etag, last_modified, data, size):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.data = data
+        self.size = size
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    Thread-safe LRU store of validated responses for HTTP conditional requests.
+
+    Entries keep the `ETag` / `Last-Modified` validators and the decoded body of a
+    response. The footprint is bounded by the sum of the response body sizes; the least
+    recently used entries are evicted beyond `max_bytes`.
+    """
+    def __init__(self, max_bytes: int=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, headers, data, size):
+        """Store a response when it carries a validator and fits in the cache."""
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (etag or last_modified) or size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self.size -= previous_entry.size
+
+            self._entries[key] = HTTPCacheEntry(etag, last_modified, data, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self.size -= evicted_entry.size
+                self.evictions += 1
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.size = 0
+            else:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.size -= entry.size
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.size, "evictions": self.evictions}
+
+
+class StaleWhileRevalidateCache:
+    """
+    Thread-safe LRU cache that keeps serving entries after they go stale while they are refreshed.
+
+    An entry is fresh for `ttl` seconds. For `max_stale` seconds after that it is still
+    served, and the first caller to see it stale is told to refresh it; older entries
+    count as missing. At most `max_entries` entries are kept.
+    """
+    def __init__(self, ttl: float=60, max_stale: float=600, max_entries: int=256):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        """Counter bumped by every `invalidate`; pass it to `set` to drop values loaded before an invalidation."""
+        with self._lock:
+            return self._generation
+
+    def lookup(self, key):
+        """Return `(found, value, needs_refresh)`; `needs_refresh` is True for exactly one caller per stale entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None, False
+
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age > self.ttl + self.max_stale:
+                del self._entries[key]
+                return False, None, False
+
+            self._entries.move_to_end(key)
+            needs_refresh = age > self.ttl and key not in self._refreshing
+            if needs_refresh:
+                self._refreshing.add(key)
+            return True, value, needs_refresh
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, prefix=()):
+        """Drop the entries whose key starts with `prefix`, or every entry when no prefix is given."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+                del self._entries[key]
@@ -0,0 +1,114 @@
+import time, threading
+from urllib.parse import urlparse
+from huma_sdk.exceptions import CircuitOpenError
+from huma_sdk._helpers.rate_limit_helpers import endpoint_group
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Responses that count as a failure of the endpoint, besides connection errors and timeouts
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an endpoint family is failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests raise
+    `CircuitOpenError` without being sent. After `cooldown` seconds it half-opens and lets
+    up to `half_open_probes` requests through: a success closes it, a failure opens it again.
+    """
+    def __init__(self, name, failure_threshold: int=5, cooldown: float=30, half_open_probes: int=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Admit a request, or raise `CircuitOpenError` when the circuit is open."""
+        with self._lock:
+            if self.state == OPEN:
+                retry_after = self.opened_at + self.cooldown - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(self.name, retry_after)
+                self.state = HALF_OPEN
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    raise CircuitOpenError(self.name, 0)
+                self._probes_in_flight += 1
+
+    def record(self, healthy):
+        """Record the outcome of an admitted request; `None` releases it without an outcome."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+            if healthy is None:
+                return
+            if healthy:
+                self.state, self.consecutive_failures = CLOSED, 0
+                return
+
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state, self.opened_at = OPEN, time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.consecutive_failures}
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers per API host and endpoint family, shared by every client in the process."""
+    def __init__(self, failure_threshold: int=5, cooldown: float=30, half_open_probes: int=1):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        key = (urlparse(url or "").netloc, endpoint_group(url))
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(key[1], self.failure_threshold, self.cooldown, self.half_open_probes)
+            return self._breakers[key]
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {f"{host}/{family}": breaker.stats() for (host, family), breaker in breakers.items()}
+
+
+_shared_circuit_breakers = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers():
+    return _shared_circuit_breakers
+
+
+def configure_circuit_breakers(failure_threshold: int=5, cooldown: float=30, half_open_probes: int=1):
+    """
+    Replace the process-wide circuit breakers of the REST endpoints.
+
+    Args:
+        failure_threshold (int): Consecutive failures (connection errors, timeouts, 5xx) that open a circuit.
+        cooldown (float): Seconds an open circuit fails fast before it lets probe requests through.
+        half_open_probes (int): Requests let through concurrently while a circuit is half-open.
+
+    Returns:
+        CircuitBreakerRegistry: The new shared registry.
+    """
+    global _shared_circuit_breakers
+    _shared_circuit_breakers = CircuitBreakerRegistry(failure_threshold, cooldown, half_open_probes)
+    return _shared_circuit_breakers
+
+
+def circuit_breaker_stats():
+    """Return the state of every circuit breaker, keyed by `host/endpoint family`."""
+    return _shared_circuit_breakers.stats()
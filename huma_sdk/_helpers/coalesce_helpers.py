@@ -0,0 +1,142 @@
+import time, asyncio, threading
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _copy_error(error):
+    """Return a copy of `error` for one waiter, chained to the leader's exception whose traceback it keeps."""
+    copied_error = type(error).__new__(type(error), *error.args)
+    copied_error.__dict__.update(error.__dict__)
+    copied_error.__cause__, copied_error.__suppress_context__ = error, True
+    return copied_error
+
+
+def _is_leader_error(error, leader_errors):
+    # Interruptions such as KeyboardInterrupt or cancellation only concern the leader
+    return not isinstance(error, Exception) or isinstance(error, leader_errors)
+
+
+def _remaining(expires_at):
+    return None if expires_at is None else max(expires_at - time.monotonic(), 0)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single execution.
+
+    The first caller of a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result, or a copy of its exception. When the
+    call fails with one of `leader_errors`, a failure of the leader's own deadline or
+    limits, waiting callers run the call again instead. The key is forgotten as soon as
+    the call finishes, so nothing is cached.
+    """
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key, function, timeout: float=None, leader_errors: tuple=()):
+        """
+        Run `function` for `key`, or wait up to `timeout` seconds for the call already in flight.
+
+        Raises:
+            TimeoutError: If a waiting caller's timeout elapses first.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = self._flights[key] = _Flight()
+                    self.calls += 1
+                else:
+                    self.collapsed += 1
+
+            if is_leader:
+                break
+            if not flight.done.wait(_remaining(expires_at)):
+                raise TimeoutError(f"Timed out waiting for the in-flight call {key}")
+            if flight.error is None:
+                return flight.result
+            if not _is_leader_error(flight.error, leader_errors):
+                raise _copy_error(flight.error)
+
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "collapsed": self.collapsed, "in_flight": len(self._flights)}
+
+
+class AsyncSingleFlight(SingleFlight):
+    """asyncio counterpart of `SingleFlight`; calls are only collapsed within one event loop."""
+
+    async def do(self, key, coroutine_function, timeout: float=None, leader_errors: tuple=()):
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                flight = self._flights.get(flight_key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = self._flights[flight_key] = loop.create_future()
+                    self.calls += 1
+                else:
+                    self.collapsed += 1
+
+            if is_leader:
+                break
+            # Shielded so a cancelled waiter does not cancel the shared call
+            await asyncio.wait([asyncio.shield(flight)], timeout=_remaining(expires_at))
+            if not flight.done():
+                raise asyncio.TimeoutError(f"Timed out waiting for the in-flight call {key}")
+            if flight.cancelled():
+                continue
+            if flight.exception() is None:
+                return flight.result()
+            if not _is_leader_error(flight.exception(), leader_errors):
+                raise _copy_error(flight.exception())
+
+        try:
+            result = await coroutine_function()
+            flight.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as error:
+            flight.set_exception(error)
+            # Mark the exception retrieved when nobody else is waiting for it
+            flight.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._flights[flight_key]
+
+
+# Process-wide groups shared by every REST client
+request_group = SingleFlight()
+async_request_group = AsyncSingleFlight()
+
+
+def coalescing_stats():
+    """Return how many GET requests were sent (`calls`) and how many joined an identical one in flight (`collapsed`)."""
+    sync_stats, async_stats = request_group.stats(), async_request_group.stats()
+    return {key: sync_stats[key] + async_stats[key] for key in sync_stats}
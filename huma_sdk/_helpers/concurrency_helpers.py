@@ -0,0 +1,172 @@
+import time, asyncio, threading, contextvars
+from contextlib import contextmanager
+
+_current_limiter = contextvars.ContextVar("huma_sdk_concurrency_limiter", default=None)
+
+
+class _LatencyBaseline:
+    """
+    Lowest latency of one endpoint over the current and the previous window.
+
+    Old minimums expire after two windows, so the baseline follows an endpoint that got
+    slower for good instead of flagging all of its later requests as overloaded.
+    """
+    __slots__ = ("window", "_window_started_at", "_current", "_previous")
+
+    def __init__(self, window, now):
+        self.window = window
+        self._window_started_at = now
+        self._current = None
+        self._previous = None
+
+    def record(self, latency, now):
+        elapsed = now - self._window_started_at
+        if elapsed >= self.window:
+            self._previous = self._current if elapsed < 2 * self.window else None
+            self._current, self._window_started_at = None, now
+        self._current = latency if self._current is None else min(self._current, latency)
+
+    @property
+    def value(self):
+        return min(latency for latency in (self._current, self._previous) if latency is not None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the number of requests in flight, driven by latency and overload signals.
+
+    The limit grows by one for every `limit` successful requests whose latency stays within
+    `latency_tolerance` times the baseline latency of their endpoint, and is multiplied by
+    `backoff_ratio` on 429, 5xx responses, timeouts or inflated latency, at most once per
+    round trip. Baselines are kept per endpoint template, since a status poll and a full
+    result page have very different normal latencies, and follow the lowest latency of the
+    last one to two `baseline_window` periods.
+    Sync callers block on a condition; asyncio callers wait on futures of their own loop.
+
+    Args:
+        initial_limit (int): Limit before any feedback was received.
+        min_limit (int): Lowest limit the controller backs off to.
+        max_limit (int): Highest limit the controller grows to.
+        backoff_ratio (float): Factor applied to the limit on overload.
+        latency_tolerance (float): Latency over the baseline latency that counts as overload.
+        baseline_window (float): Seconds after which the lowest latency of an endpoint starts to expire.
+    """
+    def __init__(self, initial_limit: int=4, min_limit: int=1, max_limit: int=64, backoff_ratio: float=0.5, latency_tolerance: float=2.0,
+                 baseline_window: float=60):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.baseline_window = baseline_window
+        self._baselines = {}
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease_at = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters = []
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def _try_acquire(self):
+        if self.in_flight < self.limit:
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self, timeout: float=None) -> bool:
+        """Wait for a free slot; returns False when `timeout` seconds pass first."""
+        with self._condition:
+            return self._condition.wait_for(self._try_acquire, timeout)
+
+    async def acquire_async(self, timeout: float=None) -> bool:
+        loop = asyncio.get_running_loop()
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return True
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            remaining = None if expires_at is None else expires_at - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return False
+
+    def _wake_waiters(self):
+        self._condition.notify_all()
+        async_waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in async_waiters:
+            loop.call_soon_threadsafe(lambda waiter=waiter: waiter.done() or waiter.set_result(None))
+
+    def release(self, latency: float=None, overloaded: bool=False, endpoint: str="*"):
+        """
+        Free a slot and adjust the limit from the outcome of the request that held it.
+
+        `endpoint` is the endpoint template of the request, e.g. `GET /v1/questions/{id}/status`,
+        whose baseline latency the request is compared with.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            baseline = self._baselines.get(endpoint)
+            if latency is not None and not overloaded:
+                if baseline is None:
+                    baseline = self._baselines[endpoint] = _LatencyBaseline(self.baseline_window, now)
+                baseline.record(latency, now)
+                overloaded = latency > baseline.value * self.latency_tolerance
+
+            if overloaded:
+                # Back off once per round trip so a burst of failures does not collapse the limit
+                if now - self._last_decrease_at > (baseline.value if baseline is not None else 0):
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_decrease_at = now
+                    self.decreases += 1
+            elif latency is not None and self._limit < self.max_limit:
+                previous_limit = self.limit
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self.increases += self.limit > previous_limit
+
+            self._wake_waiters()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "limit": self.limit, "in_flight": self.in_flight,
+                "min_latency": {endpoint: baseline.value for endpoint, baseline in self._baselines.items()},
+                "increases": self.increases, "decreases": self.decreases
+            }
+
+
+def current_limiter():
+    """Return the limiter of the enclosing `concurrency_scope`, if any."""
+    return _current_limiter.get()
+
+
+@contextmanager
+def concurrency_scope(limiter: AdaptiveConcurrencyLimiter):
+    """Route every REST request made inside the block, including worker threads started with a copy of the context, through `limiter`."""
+    token = _current_limiter.set(limiter)
+    try:
+        yield limiter
+    finally:
+        _current_limiter.reset(token)
+
+
+_shared_limiter = AdaptiveConcurrencyLimiter()
+
+
+def get_concurrency_limiter():
+    return _shared_limiter
+
+
+def concurrency_stats():
+    """Return the current in-flight limit of the shared adaptive concurrency limiter."""
+    return _shared_limiter.stats()
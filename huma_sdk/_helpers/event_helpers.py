@@ -1,7 +1,12 @@
+import time, asyncio, threading, warnings
+from collections import deque
 from types import TracebackType
 from huma_sdk._utils import parse_json_response
 from typing import Callable, Any, Dict, Optional
 from huma_sdk._helpers.questions_helper import QuestionQueue
+from huma_sdk._helpers.tracing_helpers import _NOOP_SPAN
+from huma_sdk._schema.events import QuestionAskedEvent, StreamEvent, ProgressEvent, DebugEvent, VisualEvent, \
+    FollowUpEvent, ErrorEvent, MessageCompletedEvent
 
 
 class EventHandler:
@@ -15,8 +20,18 @@ class EventHandler:
         self._total_questions: int = 0
         self._executed_questions: int = 0
         self._executed_messages: list = []
-
-    def _init(self, stream, result, thread_id, questions_queue, send_message_function):
+        self._span = _NOOP_SPAN
+        self._span_started_at: float = 0.0
+        self._first_delta_received: bool = False
+        self._max_in_flight: int = 1
+        self._in_flight: int = 0
+        # Submitted message ids awaiting completion, and completions held back to keep them in order
+        self._completion_order: deque = deque()
+        self._held_completions: Dict[str, Any] = {}
+        # Signalled whenever a subscription event is handled or the stream stops
+        self._condition = threading.Condition()
+
+    def _init(self, stream, result, thread_id, questions_queue, send_message_function, span=_NOOP_SPAN, max_in_flight=1):
         self._stream = stream
         self._result = result
         self._thread_id = thread_id
@@ -25,6 +40,26 @@ class EventHandler:
         self._executed_questions = 0
         self._executed_messages = []
         self._send_message_function = send_message_function
+        self._span = span
+        self._span_started_at = time.monotonic()
+        self._first_delta_received = False
+        self._max_in_flight = max(max_in_flight or 1, 1)
+        self._in_flight = 0
+        self._completion_order = deque()
+        self._held_completions = {}
+
+    def _record_stream_delta(self):
+        if not self._first_delta_received:
+            self._first_delta_received = True
+            self._span.set_attribute("huma.time_to_first_delta", time.monotonic() - self._span_started_at)
+            self._span.add_event("first_stream_delta")
+
+    def _end_span(self, completed=True):
+        span, self._span = self._span, _NOOP_SPAN
+        span.set_attribute("huma.completed", completed)
+        if completed:
+            span.set_attribute("huma.time_to_completion", time.monotonic() - self._span_started_at)
+        span.end()
 
     @property
     def remaining_questions(self):
@@ -36,7 +71,7 @@ class EventHandler:
 
     @property
     def should_submit_question(self):
-        return self.queue_size == self._total_questions or self.check_final_processing()
+        return self._in_flight < self._max_in_flight
 
     def update_result(self, key: str, value: Any) -> None:
         if key in self._result and self._result.get(key):
@@ -47,11 +82,19 @@ class EventHandler:
     def update_final_result(self, message_id):
         value = { "final_status": True, "submission_status": True }
         self.update_result(key=message_id, value=value)
+        self._span.add_event("message_completed", {"huma.message_id": message_id})
 
     def check_final_processing(self):
-        return all([value.get('final_status') for value in list(self._result.values())])
+        """
+        Return whether every submitted question is answered.
 
-    def submit_question(self, question, **kwargs):
+        Deprecated: `until_done` waits for the answers without polling.
+        """
+        warnings.warn("EventHandler.check_final_processing is deprecated, use until_done instead", DeprecationWarning, stacklevel=2)
+        with self._condition:
+            return all(value.get('final_status') for value in self._result.values())
+
+    def _question_arguments(self, question, kwargs):
         if isinstance(question, dict):
             kwargs = dict(
                 focus=question.get('focus'),
@@ -59,10 +102,20 @@ class EventHandler:
             )
             question = question.get('question')
 
-        message_id = self._send_message_function(question, **kwargs)
+        return question, kwargs
+
+    def _record_submission(self, question, message_id):
         result = { "question": question, "final_status": False, "submission_status": True }
-        self.on_new_question_asked(question)
-        self.update_result(message_id, value=result)
+        with self._condition:
+            self._in_flight += 1
+            self._completion_order.append(message_id)
+            self.on_new_question_asked(question)
+            self.update_result(message_id, value=result)
+
+    def submit_question(self, question, **kwargs):
+        question, kwargs = self._question_arguments(question, kwargs)
+        message_id = self._send_message_function(question, **kwargs)
+        self._record_submission(question, message_id)
 
     def submit_question_from_queue(self):
         if self.should_submit_question:
@@ -106,21 +159,37 @@ class EventHandler:
 
         return is_message_completed
 
+    def _complete_message(self, message_id, message):
+        if message_id in self._completion_order and message_id not in self._held_completions:
+            self._in_flight -= 1
+        self.update_final_result(message_id=message_id)
+
+        if message_id not in self._completion_order:
+            self._deliver_completion(message_id, message)
+            return
+
+        # Completion callbacks run in submission order, even when later questions finish first
+        self._held_completions[message_id] = message
+        while self._completion_order and self._completion_order[0] in self._held_completions:
+            completed_message_id = self._completion_order.popleft()
+            self._deliver_completion(completed_message_id, self._held_completions.pop(completed_message_id))
+
+    def _deliver_completion(self, message_id, message):
+        self.on_message_completion(message, self._result.get(message_id))
+
     def handle_final_operations_v1(self, message):
         is_message_completed = self.check_closing_condition_v1(message)
         if is_message_completed:
-            self.update_final_result(message_id=message['messageId'])
-            self.on_message_completion(message, self._result.get(message['messageId']))
+            self._complete_message(message['messageId'], message)
 
     def handle_final_operations_v2(self, message):
         if message["event_type"] in ["thread_message_done", "thread_message_failure"]:
             self._executed_questions += 1
-            message_id = message['event_metadata']['event_data']['id']
-            self.update_final_result(message_id=message_id)
-            self.on_message_completion(message, self._result.get(message_id))
+            self._complete_message(message['event_metadata']['event_data']['id'], message)
 
     def handle_v1_event(self, message):
         if message['contentType'] == "stream":
+            self._record_stream_delta()
             self.on_stream_update(message)
 
         elif message['contentsubType'] == "status":
@@ -145,6 +214,7 @@ class EventHandler:
             if delta['delta_type'] == "replace":
                 self.on_follow_up_update(delta)
             elif delta['delta_type'] == "add":
+                self._record_stream_delta()
                 self.on_stream_update(delta)
 
         elif message['author']['role'] == "progress_assistant":
@@ -167,35 +237,69 @@ class EventHandler:
             self.on_error_update(delta)
 
     def _emit_subscription_event(self, message, api_version):
-        if api_version == "v1":
-            self.handle_v1_event(message)
-            self.handle_final_operations_v1(message)
+        with self._condition:
+            if api_version == "v1":
+                self.handle_v1_event(message)
+                self.handle_final_operations_v1(message)
+
+            elif api_version == "v2":
+                message_id = message['event_metadata']['event_data']['id']
+                if message_id in self._result.keys():
+                    self.handle_v2_event(message)
+                    self.handle_final_operations_v2(message)
+
+            if not self.remaining_questions:
+                self._stop()
+                self._end_span()
+
+            self._condition.notify_all()
+            return not self.remaining_questions
+
+    def _stop(self):
+        with self._condition:
+            self._stream = False
+            self._condition.notify_all()
 
-        elif api_version == "v2":
-            message_id = message['event_metadata']['event_data']['id']
-            if message_id in self._result.keys():
-                self.handle_v2_event(message)
-                self.handle_final_operations_v2(message)
+    def until_done(self, timeout: Optional[float]=None) -> bool:
+        """
+        Submit the queued questions, keeping up to `max_in_flight` of them awaiting an answer,
+        and wait until every question is answered.
 
-        if not self.remaining_questions:
-            self._stream = False
+        The caller sleeps until a subscription event completes an answer, so waiting costs no CPU.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait. Defaults to `None`, which waits until done.
 
-        return not self.remaining_questions
+        Returns:
+            bool: `True` once every question is answered or the event manager was left, `False` on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while self._stream and not (self.queue_size and self.should_submit_question):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
 
-    def until_done(self):
-        while self._stream:
-            if self.queue_size:
-                self.submit_question_from_queue()
+                if not self._stream:
+                    return True
+
+            # Sent outside the lock so subscription events are handled meanwhile
+            self.submit_question_from_queue()
 
 
 class ThreadEventManager:
-    def __init__(self, event_handler, result, thread_id, questions_queue, send_message_function) -> None:
+    def __init__(self, event_handler, result, thread_id, questions_queue, send_message_function, span=_NOOP_SPAN, stop_subscription=None, max_in_flight=1) -> None:
         self.__stream:bool = True
         self.__result = result
         self.__thread_id = thread_id
         self.__questions_queue=questions_queue
         self.__send_message_function=send_message_function
         self.__event_handler = event_handler or EventHandler()
+        self.__span = span
+        self.__stop_subscription = stop_subscription
+        self.__max_in_flight = max_in_flight
 
     def __enter__(self):
         self.__event_handler._init(
@@ -203,7 +307,9 @@ class ThreadEventManager:
             self.__result,
             self.__thread_id,
             self.__questions_queue,
-            self.__send_message_function
+            self.__send_message_function,
+            self.__span,
+            self.__max_in_flight
         )
         return self.__event_handler
 
@@ -213,4 +319,106 @@ class ThreadEventManager:
         exc: BaseException | None,
         exc_tb: TracebackType | None
     ) -> None:
-        self.__event_handler._stream = False
\ No newline at end of file
+        self.__event_handler._stop()
+        # Leaving before every question was answered ends the span as incomplete
+        self.__event_handler._end_span(completed=False)
+        if self.__stop_subscription:
+            # Frees the subscription on the shared realtime connection; a no-op once it completed
+            self.__stop_subscription()
+
+
+class _EventCollector(EventHandler):
+    """EventHandler whose callbacks queue typed events instead of handling them."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.events = deque()
+
+    def _add(self, event_class, data, **fields):
+        self.events.append(event_class(thread_id=self._thread_id, data=data, **fields))
+
+    def _record_submission(self, question, message_id):
+        super()._record_submission(question, message_id)
+        self._add(QuestionAskedEvent, question, message_id=message_id)
+
+    def _deliver_completion(self, message_id, message):
+        self._add(MessageCompletedEvent, message, message_id=message_id, result=self._result.get(message_id))
+
+    def on_visual_update(self, message):
+        self._add(VisualEvent, message)
+
+    def on_stream_update(self, message):
+        self._add(StreamEvent, message)
+
+    def on_debug_update(self, message):
+        self._add(DebugEvent, message)
+
+    def on_progress_update(self, message):
+        self._add(ProgressEvent, message)
+
+    def on_follow_up_update(self, message):
+        self._add(FollowUpEvent, message)
+
+    def on_error_update(self, message):
+        self._add(ErrorEvent, message)
+
+
+class ChatEventStream:
+    """
+    Async iterator of the typed events of an asyncio chat `ask_question` call.
+
+    Subscription events are handed from the realtime connection to the event loop, prepared
+    by the chat service (e.g. visual answer data fetched) and classified by the `EventHandler`
+    rules. Up to `max_in_flight` questions are awaiting an answer at a time, and completion
+    events follow the order the questions were sent in.
+    The iteration ends when every question is answered; leaving it early with `aclose()` or an
+    `async with` block stops the subscription.
+    """
+    def __init__(self, chat_service, questions_queue, span=_NOOP_SPAN, max_in_flight=1) -> None:
+        self._chat_service = chat_service
+        self._loop = asyncio.get_running_loop()
+        self._messages = asyncio.Queue()
+        self._handler = _EventCollector()
+        self._handler._init(True, {}, chat_service.chat_id, questions_queue, None, span, max_in_flight)
+        self.subscription_id = None
+
+    def receive(self, message):
+        """Subscription callback, called on a realtime dispatcher thread."""
+        self._loop.call_soon_threadsafe(self._messages.put_nowait, message)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        handler = self._handler
+        while not handler.events:
+            if not handler._stream or not handler.remaining_questions:
+                await self.aclose()
+                raise StopAsyncIteration
+
+            if handler.queue_size and handler.should_submit_question:
+                await self._submit_next_question()
+                continue
+
+            message = await self._chat_service.prepare_message(await self._messages.get())
+            handler._emit_subscription_event(message, self._chat_service.api_version)
+
+        return handler.events.popleft()
+
+    async def _submit_next_question(self):
+        question, kwargs = self._handler._question_arguments(self._handler._questions_queue.pop(), {})
+        message_id = await self._chat_service.send_message(question, **kwargs)
+        self._handler._record_submission(question, message_id)
+
+    async def aclose(self):
+        self._handler._stop()
+        # Leaving before every question was answered ends the span as incomplete
+        self._handler._end_span(completed=False)
+        if self.subscription_id is not None:
+            subscription_id, self.subscription_id = self.subscription_id, None
+            self._chat_service.unsubscribe(subscription_id)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb):
+        await self.aclose()
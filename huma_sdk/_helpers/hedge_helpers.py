@@ -0,0 +1,99 @@
+import time, threading
+from collections import deque
+from huma_sdk._helpers.rate_limit_helpers import endpoint_group
+from huma_sdk._helpers.stats_helpers import endpoint_template
+
+
+class HedgePolicy:
+    """
+    Decide when an idempotent GET is sent a second time to cut tail latency.
+
+    The latencies of recent GETs are kept per endpoint template, so a fast status poll and a
+    slow result page of the same group each get their own delay. Once `min_samples` are known,
+    a GET still unanswered after the `percentile` latency of its template is duplicated and the
+    first response wins. Hedges are capped at `max_extra_load` times the GETs sent within a
+    sliding `window` of seconds, so a slow backend never sees more than that extra load.
+
+    Args:
+        percentile (float): Latency percentile, between 0 and 100, after which a GET is hedged.
+        min_delay (float): Lower bound of the hedge delay in seconds.
+        max_delay (float): Upper bound of the hedge delay in seconds. `None` leaves it unbounded.
+        min_samples (int): Latencies an endpoint template needs before its GETs are hedged.
+        sample_size (int): Number of recent latencies kept per endpoint template.
+        max_extra_load (float): Maximum ratio of hedges to GETs sent within the window.
+        window (float): Length in seconds of the window the extra load is measured over.
+        endpoint_groups (set): Endpoint groups whose GETs are hedged, e.g. `{"questions", "answers"}`. `None` hedges every GET.
+    """
+    def __init__(self, percentile: float=95, min_delay: float=0.01, max_delay: float=None, min_samples: int=20, sample_size: int=200,
+                 max_extra_load: float=0.05, window: float=10, endpoint_groups=None):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.sample_size = sample_size
+        self.max_extra_load = max_extra_load
+        self.window = window
+        self.endpoint_groups = None if endpoint_groups is None else frozenset(endpoint_groups)
+        self._latencies = {}
+        self._requests = deque()
+        self._hedges = deque()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self, url):
+        """Return the seconds after which a GET to `url` is hedged, or None when it must not be."""
+        if self.endpoint_groups is not None and endpoint_group(url) not in self.endpoint_groups:
+            return None
+
+        with self._lock:
+            latencies = self._latencies.get(endpoint_template(url))
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered_latencies = sorted(latencies)
+
+        index = min(len(ordered_latencies) - 1, int(len(ordered_latencies) * self.percentile / 100))
+        delay = max(self.min_delay, ordered_latencies[index])
+        return delay if self.max_delay is None else min(delay, self.max_delay)
+
+    def record_latency(self, url, latency):
+        template = endpoint_template(url)
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None:
+                latencies = self._latencies[template] = deque(maxlen=self.sample_size)
+            latencies.append(latency)
+
+    def _evict(self, timestamps, now):
+        while timestamps and timestamps[0] <= now - self.window:
+            timestamps.popleft()
+
+    def record_request(self):
+        now = time.monotonic()
+        with self._lock:
+            self._evict(self._requests, now)
+            self._requests.append(now)
+            self.requests += 1
+
+    def try_acquire_hedge(self) -> bool:
+        """Reserve a hedge, returning False when it would exceed `max_extra_load`."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(self._requests, now)
+            self._evict(self._hedges, now)
+            if len(self._hedges) + 1 > self.max_extra_load * len(self._requests):
+                return False
+
+            self._hedges.append(now)
+            self.hedged += 1
+            return True
+
+    def record_winner(self, hedge_won: bool):
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "hedged": self.hedged, "hedge_wins": self.hedge_wins}
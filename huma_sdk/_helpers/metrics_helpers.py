@@ -0,0 +1,181 @@
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """A metric family in the Prometheus text exposition format, with one sample per label combination."""
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _render_samples(self, key, value):
+        yield self.name, tuple(zip(self.labelnames, key)), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            samples = [(key, self._copy(value)) for key, value in self._samples.items()]
+        for key, value in samples:
+            for name, labels, sample in self._render_samples(key, value):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(sample)}")
+        return "\n".join(lines) + "\n"
+
+    def _copy(self, value):
+        return value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._samples[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative `le` buckets, `_sum` and `_count` per label combination."""
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[0][index] += 1
+                    break
+            sample[1] += value
+            sample[2] += 1
+
+    def _copy(self, value):
+        return [list(value[0]), value[1], value[2]]
+
+    def _render_samples(self, key, value):
+        labels, (bucket_counts, total, count) = tuple(zip(self.labelnames, key)), value
+        cumulative_count = 0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative_count += bucket_count
+            yield f"{self.name}_bucket", labels + (("le", _format_value(bound)),), cumulative_count
+        yield f"{self.name}_sum", labels, total
+        yield f"{self.name}_count", labels, count
+
+
+class Summary(_Metric):
+    """Precomputed quantiles, `_sum` and `_count` per label combination, e.g. from an SDK client's `stats()`."""
+    type = "summary"
+
+    def set(self, quantiles, total, count, **labels):
+        with self._lock:
+            self._samples[self._key(labels)] = (dict(quantiles), total, count)
+
+    def _render_samples(self, key, value):
+        labels, (quantiles, total, count) = tuple(zip(self.labelnames, key)), value
+        for quantile, quantile_value in quantiles.items():
+            yield self.name, labels + (("quantile", quantile),), quantile_value
+        yield f"{self.name}_sum", labels, total
+        yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    """Thread-safe collection of metrics rendered together in the Prometheus text format."""
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def summary(self, name, documentation, labelnames=()):
+        return self._register(Summary(name, documentation, labelnames))
+
+    def render(self):
+        return "".join(metric.render() for metric in self._metrics)
+
+
+def render_client_stats(client_stats: dict):
+    """
+    Render the `stats()` snapshots of SDK clients in the Prometheus text format.
+
+    Args:
+        client_stats (dict): Maps a service label to the `stats()` snapshot of its client.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("huma_sdk_requests_total", "Requests sent by the SDK client, retries included.", ("service",))
+    retries = registry.counter("huma_sdk_retries_total", "Retried requests sent by the SDK client.", ("service",))
+    transferred_bytes = registry.counter("huma_sdk_body_bytes_total", "Request and response body bytes of the SDK client.", ("service", "direction"))
+    errors = registry.counter("huma_sdk_errors_total", "Error responses by status code and transport failures by exception name.", ("service", "error"))
+    latency = registry.summary("huma_sdk_request_duration_seconds", "Latency of the SDK client requests per endpoint template.", ("service", "endpoint"))
+
+    for service, stats in client_stats.items():
+        requests.inc(stats["requests"], service=service)
+        retries.inc(stats["retries"], service=service)
+        transferred_bytes.inc(stats["bytes_out"], service=service, direction="out")
+        transferred_bytes.inc(stats["bytes_in"], service=service, direction="in")
+        for error, count in stats["errors"].items():
+            errors.inc(count, service=service, error=error)
+        for endpoint, endpoint_stats in stats["endpoints"].items():
+            endpoint_latency = endpoint_stats["latency"]
+            if endpoint_latency["count"]:
+                quantiles = {"0.5": endpoint_latency["p50"], "0.9": endpoint_latency["p90"], "0.99": endpoint_latency["p99"]}
+                latency.set(quantiles, endpoint_latency["mean"] * endpoint_latency["count"], endpoint_latency["count"], service=service, endpoint=endpoint)
+
+    return registry.render()
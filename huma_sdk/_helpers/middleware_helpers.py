@@ -0,0 +1,151 @@
+import time, contextvars
+
+# Phase timings of the request being sent, filled in by the timed connections of the transports
+_current_timings = contextvars.ContextVar("huma_sdk_request_timings", default=None)
+
+
+def current_timings():
+    """Return the timings dict of the request sent by the running middleware chain, if any."""
+    return _current_timings.get()
+
+
+def record_timing(phase, seconds):
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class RequestContext:
+    """
+    A REST or GraphQL request travelling through the middleware chain.
+
+    Attributes:
+        payload (dict): Keyword arguments handed to the transport (`method`, `url`, `params`, `headers`, ...).
+            Middleware may change them in `before_request`.
+        service (str): Name of the service sending the request, e.g. `Questions` or `Chat`.
+        attempt (int): Attempt number, starting at 1 and increased by every retry.
+        timings (dict): Seconds spent in each phase of the request: `dns`, `connect` and `tls`
+            when a new connection was opened, `ttfb` until the response headers arrived, `body`
+            to read the response body, and `total`.
+        data (dict): Scratch space for middleware to share state between its hooks.
+    """
+    __slots__ = ("payload", "service", "attempt", "timings", "data")
+
+    def __init__(self, payload, service=None, attempt=1):
+        self.payload = payload
+        self.service = service
+        self.attempt = attempt
+        self.timings = {}
+        self.data = {}
+
+    @property
+    def method(self):
+        return self.payload.get('method', "GET").upper()
+
+    @property
+    def url(self):
+        return self.payload.get('url')
+
+
+class Middleware:
+    """
+    Base class of request middleware; subclasses override the hooks they need.
+
+    Hooks are plain functions, called from the sync and the asyncio clients alike, so they
+    must not block for long.
+    """
+    def before_request(self, request: RequestContext):
+        """Called before each attempt is sent. Returning a response skips the transport and the later middleware."""
+        return None
+
+    def after_response(self, request: RequestContext, response):
+        """Called with each response, in reverse order. Returning a response replaces it."""
+        return None
+
+    def on_error(self, request: RequestContext, error: Exception):
+        """Called, in reverse order, when the transport raised; the error is raised again afterwards."""
+
+
+class MiddlewareChain:
+    """Run a sequence of `Middleware` around each request sent by a transport."""
+    def __init__(self, middlewares=()):
+        self.middlewares = tuple(middlewares)
+
+    def _before_request(self, request):
+        for middleware in self.middlewares:
+            response = middleware.before_request(request)
+            if response is not None:
+                return response
+        return None
+
+    def _after_response(self, request, response):
+        for middleware in reversed(self.middlewares):
+            replacement = middleware.after_response(request, response)
+            if replacement is not None:
+                response = replacement
+        return response
+
+    def _on_error(self, request, error):
+        for middleware in reversed(self.middlewares):
+            middleware.on_error(request, error)
+
+    def send(self, request: RequestContext, send):
+        """Send `request` with `send(**request.payload)` through the middleware."""
+        if not self.middlewares:
+            return send(**request.payload)
+
+        response = self._before_request(request)
+        if response is None:
+            token, started_at = _current_timings.set(request.timings), time.perf_counter()
+            try:
+                response = send(**request.payload)
+            except Exception as error:
+                request.timings['total'] = time.perf_counter() - started_at
+                self._on_error(request, error)
+                raise
+            finally:
+                _current_timings.reset(token)
+            request.timings['total'] = time.perf_counter() - started_at
+        return self._after_response(request, response)
+
+    async def send_async(self, request: RequestContext, send):
+        """asyncio counterpart of `send`, for a coroutine function `send`."""
+        if not self.middlewares:
+            return await send(**request.payload)
+
+        response = self._before_request(request)
+        if response is None:
+            token, started_at = _current_timings.set(request.timings), time.perf_counter()
+            try:
+                response = await send(**request.payload)
+            except Exception as error:
+                request.timings['total'] = time.perf_counter() - started_at
+                self._on_error(request, error)
+                raise
+            finally:
+                _current_timings.reset(token)
+            request.timings['total'] = time.perf_counter() - started_at
+        return self._after_response(request, response)
+
+
+_shared_middleware = MiddlewareChain()
+
+
+def get_middleware():
+    return _shared_middleware
+
+
+def configure_middleware(middlewares: list=None):
+    """
+    Replace the process-wide middleware run around every REST and GraphQL request.
+
+    Args:
+        middlewares (list): `Middleware` instances. `before_request` hooks run in list order,
+            `after_response` and `on_error` hooks in reverse order. `None` removes every middleware.
+
+    Returns:
+        MiddlewareChain: The new shared middleware chain.
+    """
+    global _shared_middleware
+    _shared_middleware = MiddlewareChain(middlewares or ())
+    return _shared_middleware
@@ -0,0 +1,104 @@
+import time, threading
+from urllib.parse import urlparse
+
+
+def endpoint_group(url):
+    """Return the endpoint family of an API url, the first path segment after the version (`questions`, `subscription`, ...)."""
+    segments = [segment for segment in urlparse(url or "").path.split("/") if segment]
+    for index, segment in enumerate(segments[:-1]):
+        if segment.startswith("v") and segment[1:].isdigit():
+            return segments[index+1]
+    return segments[0] if segments else ""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    Tokens are reserved rather than polled: a caller takes its token immediately and is told
+    how long to wait for it, so sync and asyncio callers can sleep in their own way and are
+    served in arrival order.
+    """
+    def __init__(self, rate: float, burst: int=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float=None):
+        """Reserve a token and return the seconds to wait for it, or None without reserving when that exceeds `max_wait`."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self._tokens -= 1
+            return wait
+
+    def refund(self):
+        """Give back a reserved token whose request was never sent."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class RateLimiter:
+    """
+    Client-side rate limits per endpoint group, shared by every client in the process.
+
+    Args:
+        limits (dict): Maps an endpoint group (`questions`, `histories`, `favorites`, `subscription`, ...)
+            to a `(requests_per_second, burst)` tuple.
+        default (tuple): `(requests_per_second, burst)` of the groups missing from `limits`. `None` leaves them unlimited.
+    """
+    def __init__(self, limits: dict=None, default: tuple=None):
+        self.limits = dict(limits or {})
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, group):
+        with self._lock:
+            if group not in self._buckets:
+                limit = self.limits.get(group, self.default)
+                self._buckets[group] = TokenBucket(*limit) if limit else None
+            return self._buckets[group]
+
+    def reserve(self, url, max_wait: float=None):
+        """Reserve a request slot for `url` and return the seconds to wait, or None when that exceeds `max_wait`."""
+        bucket = self._get_bucket(endpoint_group(url))
+        return 0.0 if bucket is None else bucket.reserve(max_wait)
+
+    def refund(self, url):
+        """Give back the slot reserved for `url` when its request is not sent after all."""
+        bucket = self._get_bucket(endpoint_group(url))
+        if bucket is not None:
+            bucket.refund()
+
+
+_shared_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    return _shared_rate_limiter
+
+
+def configure_rate_limits(limits: dict=None, default: tuple=None):
+    """
+    Replace the process-wide rate limits applied to every REST request.
+
+    Args:
+        limits (dict): Maps an endpoint group to a `(requests_per_second, burst)` tuple,
+            e.g. `{"questions": (5, 10)}`.
+        default (tuple): `(requests_per_second, burst)` of every other group. `None` leaves them unlimited.
+
+    Returns:
+        RateLimiter: The new shared rate limiter.
+    """
+    global _shared_rate_limiter
+    _shared_rate_limiter = RateLimiter(limits, default)
+    return _shared_rate_limiter
@@ -0,0 +1,285 @@
+import time, uuid, threading, websocket
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from huma_sdk._utils import parse_json_response, json_dumps
+from huma_sdk.utils._log_utils import get_logger
+
+# Constants
+RED = "\033[91m"
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+CONNECTION_INIT = {'type': 'connection_init', "payload": {"connectionTimeoutMs": 300000000}}
+
+
+class SerialDispatcher:
+    """
+    Run callbacks on a shared thread pool, in submission order per key.
+
+    Callbacks of one key never run concurrently, so a subscription sees its events in
+    order. When every pool worker is busy with other keys, a key gets a thread of its
+    own, so a slow callback only delays its own key.
+    """
+    def __init__(self, max_workers: int=16):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="huma-sdk-realtime")
+        self._max_workers = max_workers
+        self._pooled = 0
+        self._queues = {}
+        self._lock = threading.Lock()
+        self.logger = get_logger(__name__)
+
+    def submit(self, key, function, *args):
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None:
+                # A drain of this key is already scheduled and will pick the callback up
+                queue.append((function, args))
+                return
+            self._queues[key] = deque([(function, args)])
+            pooled = self._pooled < self._max_workers
+            if pooled:
+                self._pooled += 1
+
+        if pooled:
+            self._executor.submit(self._drain, key, pooled)
+        else:
+            threading.Thread(target=self._drain, args=(key, pooled), daemon=True, name="huma-sdk-realtime-overflow").start()
+
+    def _drain(self, key, pooled):
+        while True:
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    if pooled:
+                        self._pooled -= 1
+                    return
+                function, args = queue[0]
+
+            try:
+                function(*args)
+            except Exception:
+                self.logger.exception(f"Realtime callback of {key} failed")
+            finally:
+                with self._lock:
+                    queue.popleft()
+
+
+class _Subscription:
+    __slots__ = ("id", "data", "callback", "connection_name")
+
+    def __init__(self, subscription_id, data, callback, connection_name):
+        self.id = subscription_id
+        self.data = data
+        self.callback = callback
+        self.connection_name = connection_name
+
+
+class RealtimeConnection:
+    """
+    One AppSync realtime (`graphql-ws`) websocket multiplexing many subscriptions.
+
+    The socket is opened by the first subscription and read by a single thread, and closed
+    again once the last subscription stops. Every
+    subscription gets a unique id, is registered with a `start` message and removed with a
+    `stop` message; after a dropped connection the active subscriptions are started again
+    on a new socket. Events are handed to the subscription callbacks through a
+    `SerialDispatcher`, so a callback that fetches data does not hold up other subscriptions.
+
+    Args:
+        url (str): Realtime endpoint, including the encoded `header` and `payload` query parameters.
+        authorization (dict): `host` and `authorization` sent with each `start` message.
+        reconnect_delay (float): Seconds before the first reconnection attempt, doubled after each failure.
+        max_reconnect_delay (float): Upper bound of the reconnection delay in seconds.
+    """
+    def __init__(self, url, authorization, dispatcher: SerialDispatcher=None, reconnect_delay: float=1, max_reconnect_delay: float=30):
+        self.url = url
+        self.authorization = authorization
+        self.dispatcher = dispatcher or SerialDispatcher()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._ws = None
+        self._thread = None
+        self._acknowledged = False
+        self._closed = False
+        self._idle = False
+        self.logger = get_logger(__name__)
+
+    @property
+    def subscription_count(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def subscribe(self, subscription_data, callback, connection_name):
+        """
+        Start a subscription and return its id.
+
+        Args:
+            subscription_data (str): JSON-encoded subscription query and variables.
+            callback (function): Called with the `connection_name` field of each event; returning True stops the subscription.
+            connection_name (str): Field of the event data handed to the callback.
+        """
+        subscription = _Subscription(uuid.uuid4().hex, subscription_data, callback, connection_name)
+        with self._lock:
+            self._subscriptions[subscription.id] = subscription
+            # Subscriptions registered before the acknowledgement are started by it
+            ws = self._ws if self._acknowledged else None
+            self._closed = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="huma-sdk-realtime-reader")
+                self._thread.start()
+
+        if ws is not None:
+            self._send_start(ws, subscription)
+        return subscription.id
+
+    def unsubscribe(self, subscription_id):
+        """Stop a subscription; events already received for it are dropped."""
+        with self._lock:
+            subscription = self._subscriptions.pop(subscription_id, None)
+            ws = self._ws if self._acknowledged else None
+
+        if subscription is not None and ws is not None:
+            self._send(ws, {"id": subscription_id, "type": "stop"})
+        if subscription is not None:
+            self._close_if_idle()
+
+    def _close_if_idle(self):
+        """Close the socket once no subscription is left and forget the connection in the shared registry."""
+        with self._lock:
+            if self._subscriptions or self._ws is None:
+                return
+            # The reader thread exits, or reconnects at once for a subscription started meanwhile
+            self._idle, ws = True, self._ws
+        ws.close()
+        _forget_realtime_connection(self)
+
+    def close(self):
+        """Stop every subscription and close the socket."""
+        with self._lock:
+            self._closed = True
+            self._subscriptions.clear()
+            ws = self._ws
+        if ws is not None:
+            ws.close()
+        _forget_realtime_connection(self)
+
+    def _send(self, ws, message):
+        try:
+            ws.send(json_dumps(message))
+        except websocket.WebSocketException as error:
+            # The reader thread reconnects and starts the subscriptions again
+            self.logger.warning(f"{YELLOW}Failed to send a realtime message: {error}{RESET}")
+
+    def _send_start(self, ws, subscription):
+        self._send(ws, {
+            "id": subscription.id,
+            'type': 'start',
+            "payload": {
+                "data": subscription.data,
+                "extensions": {"authorization": self.authorization}
+            },
+        })
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            with self._lock:
+                if self._closed or not self._subscriptions:
+                    self._ws, self._thread = None, None
+                    return
+                self._acknowledged = False
+                ws = self._ws = websocket.WebSocketApp(
+                    self.url,
+                    subprotocols=["graphql-ws"],
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                    on_error=self._on_error,
+                    on_close=self._on_close
+                )
+
+            started_at = time.monotonic()
+            ws.run_forever()
+
+            with self._lock:
+                idle, self._idle = self._idle, False
+                if self._closed or idle or not self._subscriptions:
+                    continue
+            # A connection that stayed up for a while resets the backoff
+            delay = self.reconnect_delay if time.monotonic() - started_at > self.max_reconnect_delay else delay
+            self.logger.warning(f"{YELLOW}Realtime connection lost, reconnecting in {delay:.0f}s{RESET}")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _on_open(self, ws):
+        with self._lock:
+            idle = not self._subscriptions
+        if idle:
+            # Every subscription stopped while the socket was connecting
+            ws.close()
+            return
+        self._send(ws, CONNECTION_INIT)
+        self.logger.info(f"{GREEN}Connection built{RESET}")
+
+    def _on_message(self, ws, message):
+        message_object = parse_json_response(message)
+        message_type = message_object.get('type')
+
+        if message_type == 'connection_ack':
+            with self._lock:
+                self._acknowledged = True
+                subscriptions = list(self._subscriptions.values())
+            for subscription in subscriptions:
+                self._send_start(ws, subscription)
+
+        elif message_type == 'data':
+            with self._lock:
+                subscription = self._subscriptions.get(message_object.get('id'))
+            if subscription is not None:
+                self.dispatcher.submit(subscription.id, self._deliver, subscription, message_object.get('payload') or {})
+
+        elif message_type == 'complete':
+            with self._lock:
+                subscription = self._subscriptions.pop(message_object.get('id'), None)
+            if subscription is not None:
+                self._close_if_idle()
+
+        elif message_type in ('error', 'connection_error'):
+            self.logger.error(f"{RED}Realtime error for subscription {message_object.get('id')}: {message_object.get('payload')}{RESET}")
+
+    def _deliver(self, subscription, payload):
+        with self._lock:
+            if subscription.id not in self._subscriptions:
+                return
+        message_payload = (payload.get('data') or {}).get(subscription.connection_name)
+        if subscription.callback(message_payload):
+            self.unsubscribe(subscription.id)
+
+    def _on_error(self, ws, error):
+        self.logger.error(f"{RED}Error{RESET}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.logger.info(f"{YELLOW}Connection closed! {RESET}")
+
+
+_realtime_connections = {}
+_realtime_connections_lock = threading.Lock()
+
+
+def get_realtime_connection(url, authorization):
+    """Return the process-wide realtime connection of an endpoint and its credentials, creating it on first use."""
+    with _realtime_connections_lock:
+        connection = _realtime_connections.get(url)
+        if connection is None:
+            connection = _realtime_connections[url] = RealtimeConnection(url, authorization)
+        return connection
+
+
+def _forget_realtime_connection(connection):
+    """Drop an idle connection from the registry; the next subscription of its endpoint opens a new one."""
+    with _realtime_connections_lock:
+        if _realtime_connections.get(connection.url) is connection and connection.subscription_count == 0:
+            del _realtime_connections[connection.url]
@@ -0,0 +1,135 @@
+import time, random, threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Errors raised before the request reached the server are safe to retry for any method
+CONNECT_ERROR = "connect"
+# Errors that may happen after the server received the request
+CONNECTION_ERROR = "connection"
+TIMEOUT_ERROR = "timeout"
+
+
+class RetryBudget:
+    """
+    Process-wide cap on retries that keeps retry storms from amplifying an outage.
+
+    Within a sliding `window` of seconds, retries are allowed while they stay below
+    `min_retries_per_second * window` plus `ratio` times the requests sent in that window.
+    """
+    def __init__(self, ratio: float=0.2, min_retries_per_second: float=1, window: float=10):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def _evict(self, timestamps, now):
+        while timestamps and timestamps[0] <= now - self.window:
+            timestamps.popleft()
+
+    def record_request(self):
+        now = time.monotonic()
+        with self._lock:
+            self._evict(self._requests, now)
+            self._requests.append(now)
+
+    def try_acquire_retry(self) -> bool:
+        """Reserve a retry, returning False when the budget is exhausted."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(self._requests, now)
+            self._evict(self._retries, now)
+            allowed_retries = self.min_retries_per_second * self.window + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed_retries:
+                return False
+
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed REST request is sent again.
+
+    Non-idempotent requests (POST) are only retried when the server cannot have acted
+    on them: connection failures before the request was sent and 429 responses.
+    Backoff is exponential with full jitter, and a `Retry-After` header overrides it.
+
+    Args:
+        max_attempts (int): Total number of attempts, including the first one. `1` disables retries.
+        backoff_factor (float): Base delay in seconds; attempt n waits up to `backoff_factor * 2 ** (n - 1)`.
+        max_backoff (float): Upper bound of a single computed delay in seconds.
+        max_retry_after (float): Give up instead of waiting when `Retry-After` asks for longer than this.
+        jitter (bool): Randomise delays between zero and the computed backoff.
+        retry_statuses (set): Response status codes that are retried.
+        budget (RetryBudget): Budget shared with other clients. Defaults to the process-wide budget.
+    """
+    def __init__(self, max_attempts: int=3, backoff_factor: float=0.5, max_backoff: float=30, max_retry_after: float=60,
+                 jitter: bool=True, retry_statuses=RETRY_STATUSES, idempotent_methods=IDEMPOTENT_METHODS, budget: RetryBudget=None):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(method.upper() for method in idempotent_methods)
+        self.budget = budget or DEFAULT_RETRY_BUDGET
+
+    def record_request(self):
+        self.budget.record_request()
+
+    def is_retryable(self, method, status_code=None, error_kind=None):
+        is_idempotent = (method or "GET").upper() in self.idempotent_methods
+        if error_kind is not None:
+            return error_kind == CONNECT_ERROR or is_idempotent
+        if status_code == 429:
+            return status_code in self.retry_statuses
+        return is_idempotent and status_code in self.retry_statuses
+
+    def parse_retry_after(self, retry_after):
+        """Convert a `Retry-After` header (delay seconds or HTTP date) into seconds."""
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_backoff(self, attempt):
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def next_delay(self, method, attempt, status_code=None, error_kind=None, retry_after=None):
+        """
+        Return the seconds to wait before the next attempt, or None when the request should not be retried.
+
+        Args:
+            method (str): HTTP method of the request.
+            attempt (int): Number of the attempt that just failed, starting at 1.
+            status_code (int): Status code of the failed response, if one was received.
+            error_kind (str): `connect`, `connection` or `timeout` when no response was received.
+            retry_after (str): Value of the `Retry-After` response header.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, status_code, error_kind):
+            return None
+
+        delay = self.parse_retry_after(retry_after)
+        if delay is not None and delay > self.max_retry_after:
+            return None
+
+        if not self.budget.try_acquire_retry():
+            return None
+
+        return delay if delay is not None else self.get_backoff(attempt)
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -0,0 +1,165 @@
+import re, threading
+from urllib.parse import urlparse
+
+# Path segments the REST API uses as literals; any other segment after the endpoint group is an id
+_STATIC_SEGMENTS = frozenset({"status", "result", "data", "delete", "visual", "create", "sdk", "access-permissions"})
+
+_GRAPHQL_OPERATION = re.compile(r"^\s*(?:(?:query|mutation|subscription)\b\s*(\w+)?[^{]*)?\{\s*(\w+)")
+
+
+def endpoint_template(url):
+    """Return the path of an API url with its ids replaced by `{id}`, e.g. `/v1/questions/{id}/result`."""
+    segments = [segment for segment in urlparse(url or "").path.split("/") if segment]
+    template, seen_group = [], False
+    for segment in segments:
+        is_version = segment.startswith("v") and segment[1:].isdigit()
+        if is_version or not seen_group or segment in _STATIC_SEGMENTS:
+            template.append(segment)
+            seen_group = seen_group or not is_version
+        else:
+            template.append("{id}")
+    return "/" + "/".join(template)
+
+
+def graphql_operation(query):
+    """Return the operation name of a GraphQL document, or its first field for anonymous operations."""
+    match = _GRAPHQL_OPERATION.match(query or "")
+    return (match.group(1) or match.group(2)) if match else "anonymous"
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies with a fixed relative error.
+
+    Latencies are counted in microsecond buckets; every power of two is split into
+    `2 ** (precision_bits - 1)` linear sub-buckets, so a percentile is off by at most
+    `1 / 2 ** (precision_bits - 1)` of its value (about 3% by default) while the memory
+    stays proportional to the number of distinct buckets hit.
+    """
+    def __init__(self, precision_bits: int=6):
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << (precision_bits - 1)
+        self._counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, microseconds):
+        if microseconds < (1 << self.precision_bits):
+            return microseconds
+        shift = microseconds.bit_length() - self.precision_bits
+        return shift * self._sub_buckets + (microseconds >> shift)
+
+    def _bucket_value(self, bucket):
+        if bucket < (1 << self.precision_bits):
+            return bucket
+        shift = bucket // self._sub_buckets - 1
+        mantissa = bucket - shift * self._sub_buckets
+        # Midpoint of the range of microseconds counted in the bucket
+        return ((mantissa << shift) + ((mantissa + 1) << shift) - 1) // 2
+
+    def record(self, seconds):
+        microseconds = max(0, int(seconds * 1_000_000))
+        bucket = self._bucket(microseconds)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percentile):
+        """Return the latency in seconds below which `percentile` percent of the recorded latencies fall."""
+        if not self.count:
+            return None
+        rank, seen = max(1, round(self.count * percentile / 100)), 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return min(self._bucket_value(bucket) / 1_000_000, self.max)
+        return self.max
+
+    def snapshot(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count, "mean": self.total / self.count, "max": self.max,
+            "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99)
+        }
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = {}
+        self.latency = LatencyHistogram()
+
+
+class ClientStats:
+    """
+    Thread-safe counters of the requests sent by one SDK client.
+
+    Every attempt is counted, retries included, with its request and response body sizes,
+    and its latency is recorded in the histogram of its endpoint template. Error statuses
+    (400 and above) are counted by status code, and transport failures by exception name.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.bytes_out = 0
+            self.bytes_in = 0
+            self.errors = {}
+            self._endpoints = {}
+
+    def record(self, endpoint, latency, status_code=None, error=None, retry=False, bytes_out=0, bytes_in=0):
+        """
+        Record one attempt.
+
+        Args:
+            endpoint (str): Endpoint template, e.g. `GET /v1/questions/{id}/status`.
+            latency (float): Seconds the attempt took.
+            status_code (int): Response status code, None when the attempt raised.
+            error (str): Name of the exception raised by the transport.
+            retry (bool): Whether the attempt retried an earlier one.
+        """
+        error_key = error if error is not None else (str(status_code) if status_code is not None and status_code >= 400 else None)
+        with self._lock:
+            endpoint_stats = self._endpoints.get(endpoint)
+            if endpoint_stats is None:
+                endpoint_stats = self._endpoints[endpoint] = _EndpointStats()
+
+            self.requests += 1
+            self.retries += retry
+            self.bytes_out += bytes_out
+            self.bytes_in += bytes_in
+            endpoint_stats.requests += 1
+            endpoint_stats.latency.record(latency)
+            if error_key is not None:
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+                endpoint_stats.errors[error_key] = endpoint_stats.errors.get(error_key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests, "retries": self.retries,
+                "bytes_out": self.bytes_out, "bytes_in": self.bytes_in,
+                "errors": dict(self.errors),
+                "endpoints": {
+                    endpoint: {"requests": endpoint_stats.requests, "errors": dict(endpoint_stats.errors), "latency": endpoint_stats.latency.snapshot()}
+                    for endpoint, endpoint_stats in self._endpoints.items()
+                }
+            }
+
+
+def request_body_size(response):
+    """Return the size of the body sent for `response`, as prepared by requests (`body`) or httpx (`content`)."""
+    try:
+        request = response.request
+        body = request.body if hasattr(request, 'body') else request.content
+    except Exception:
+        # httpx responses built without a request, or with a streamed body
+        return 0
+    return len(body) if isinstance(body, (bytes, bytearray, str)) else 0
@@ -0,0 +1,61 @@
+import time, contextvars
+from contextlib import contextmanager
+
+# (connect, read) timeouts in seconds applied to every REST request
+DEFAULT_TIMEOUT = (10, 60)
+
+_current_deadline = contextvars.ContextVar("huma_sdk_deadline", default=None)
+
+
+class Deadline:
+    """Absolute point in time by which an operation and all of its requests must finish."""
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+def current_deadline():
+    """Return the deadline of the enclosing `deadline_scope`, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float=None):
+    """
+    Bound every REST request made inside the block by an overall deadline.
+
+    Request timeouts are shortened to the time left, and once the deadline has passed
+    requests, retries and pages raise `DeadlineExceededError` instead of being sent. The
+    read timeout bounds each read of the socket, so a response whose body keeps trickling
+    in can still finish after the deadline. Nested scopes keep the
+    tighter deadline. The deadline follows the context into the paginator's worker
+    threads and asyncio tasks. With `seconds=None` the enclosing deadline is kept.
+
+    Args:
+        seconds (float): Time budget of the block in seconds.
+    """
+    deadline, parent_deadline = None, _current_deadline.get()
+    if seconds is not None:
+        deadline = Deadline(seconds)
+    if deadline is None or (parent_deadline is not None and parent_deadline.expires_at <= deadline.expires_at):
+        deadline = parent_deadline
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def clamp_timeout(timeout, remaining: float):
+    """Shorten a timeout (a number or a (connect, read) tuple) so it ends within `remaining` seconds."""
+    if isinstance(timeout, tuple):
+        return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
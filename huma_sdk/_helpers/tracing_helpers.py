@@ -0,0 +1,84 @@
+import contextvars
+from contextlib import contextmanager
+
+
+class _NoopSpan:
+    """Span used while no tracer is configured; every method does nothing."""
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, attributes=None):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span = contextvars.ContextVar("huma_sdk_span", default=_NOOP_SPAN)
+_tracer = None
+
+
+def configure_tracer(tracer=None):
+    """
+    Trace REST calls, pagination, GraphQL calls and chat questions.
+
+    Args:
+        tracer: An OpenTelemetry tracer, e.g. `opentelemetry.trace.get_tracer("huma_sdk")`, or any
+            object with the same `start_as_current_span(name, attributes=...)` and
+            `start_span(name, attributes=...)` methods. `None` turns tracing off.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def tracing_enabled():
+    return _tracer is not None
+
+
+@contextmanager
+def _traced_span(name, attributes):
+    with _tracer.start_as_current_span(name, attributes=attributes) as span:
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+
+def _drop_empty(attributes):
+    return {key: value for key, value in (attributes or {}).items() if value is not None}
+
+
+def start_span(name, attributes: dict=None):
+    """
+    Return a context manager of a span that is current inside the block.
+
+    Spans opened inside the block, including in worker threads started with a copy of the
+    context and in asyncio tasks, become its children. Without a tracer this returns a shared
+    no-op span, so the call costs next to nothing.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _traced_span(name, _drop_empty(attributes))
+
+
+def start_detached_span(name, attributes: dict=None):
+    """Start a span that is not made current and is ended explicitly, for operations completed by callbacks."""
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_span(name, attributes=_drop_empty(attributes))
+
+
+def current_span():
+    """Return the innermost span opened by `start_span`, or the no-op span."""
+    return _current_span.get()
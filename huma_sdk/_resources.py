@@ -1,20 +1,137 @@
-import requests, os
+import requests, os, threading, time
+from urllib3.exceptions import NewConnectionError
 from huma_sdk.utils._log_utils import get_logger
-from huma_sdk.exceptions import UnauthorizedException
+from huma_sdk.exceptions import UnauthorizedException, DeadlineExceededError
 from huma_sdk._utils import parse_json_response
+from huma_sdk._transport import get_transport
+from huma_sdk._helpers.cache_helpers import TTLCache, HTTPCache, StaleWhileRevalidateCache
+from huma_sdk._helpers.coalesce_helpers import request_group
+from huma_sdk._services._paginator import _Paginator
+from huma_sdk._helpers.retry_helpers import DEFAULT_RETRY_POLICY, RETRY_STATUSES, CONNECT_ERROR, CONNECTION_ERROR, TIMEOUT_ERROR
+from huma_sdk._helpers.timeout_helpers import DEFAULT_TIMEOUT, current_deadline, clamp_timeout
+from huma_sdk._helpers.rate_limit_helpers import get_rate_limiter
+from huma_sdk._helpers.concurrency_helpers import current_limiter, get_concurrency_limiter
+from huma_sdk._helpers.circuit_breaker_helpers import FAILURE_STATUSES, get_circuit_breakers
+from huma_sdk._helpers.middleware_helpers import RequestContext, MiddlewareChain, get_middleware
+from huma_sdk._helpers.stats_helpers import ClientStats, endpoint_template, request_body_size
+from huma_sdk._helpers.tracing_helpers import start_span, current_span, tracing_enabled
 
+DEFAULT_PROBE_TTL = 300
+
+# Successful access-permission probes keyed by (api_url, api_secret_key, service_name)
+_access_probe_cache = TTLCache()
+
+# Validated list responses revalidated with If-None-Match / If-Modified-Since
+_http_cache = HTTPCache()
+
+
+# Stale-while-revalidate responses of the use_cache functions
+_response_cache = StaleWhileRevalidateCache()
+
+
+def http_cache_stats():
+    """Return the hit and miss counters and the footprint of the conditional-request cache."""
+    return _http_cache.stats()
 
 class _Services():
-    def __init__(self, service_name=None, api_url=None, api_secret_key=None):
+    paginator_class = _Paginator
+
+    def __init__(self, service_name=None, api_url=None, api_secret_key=None, transport=None, probe_ttl=DEFAULT_PROBE_TTL, lazy_probe=False, retry_policy=None, timeout=DEFAULT_TIMEOUT, coalesce_requests=True, http_cache=True, response_cache=None, rate_limiter=None, concurrency_limiter=None, circuit_breakers=None, middleware=None):
         self.api_url = api_url or os.environ.get('API_URL')
         self.api_secret_key = api_secret_key or os.environ.get('API_SECRET_KEY')
         self.service_name = service_name
+        self.transport = transport or get_transport()
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.timeout = timeout
+        self.coalesce_requests = coalesce_requests
+        # True shares the process-wide cache, False disables revalidation
+        self.http_cache = _http_cache if http_cache is True else (http_cache or None)
+        self.response_cache = response_cache or _response_cache
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._circuit_breakers = circuit_breakers
+        self._middleware = MiddlewareChain(middleware) if isinstance(middleware, (list, tuple)) else middleware
+        self._stats = ClientStats()
         self.test_url = f"{self.api_url}/v1/sdk/access-permissions"
         self.logger = get_logger(__name__)
-        self.test_connection()
+        self.probe_ttl = probe_ttl
+        self._access_verified = False
+        self._access_lock = threading.Lock()
+        if not lazy_probe:
+            self.verify_access()
+
+    @property
+    def rate_limiter(self):
+        # Resolved per request so configure_rate_limits also applies to existing clients
+        return self._rate_limiter or get_rate_limiter()
+
+    @property
+    def concurrency_limiter(self):
+        """Adaptive limiter of the concurrent batch pages and bulk helpers; shared by every client unless one was given."""
+        return self._concurrency_limiter or get_concurrency_limiter()
+
+    @property
+    def circuit_breakers(self):
+        return self._circuit_breakers or get_circuit_breakers()
+
+    @property
+    def middleware(self):
+        return self._middleware or get_middleware()
+
+    def stats(self):
+        """
+        Return the requests sent by this client so far.
+
+        Returns:
+            dict: Attempt, retry and byte counts, errors by status code or exception name, and per
+                endpoint template (e.g. `GET /v1/questions/{id}/result`) the request count, errors and
+                latency percentiles in seconds.
+        """
+        return self._stats.snapshot()
 
-    def _handle_api_response(self, response):
-        response_data = parse_json_response(response.text)
+    def _probe_cache_key(self):
+        return (self.api_url, self.api_secret_key, self.service_name)
+
+    def verify_access(self):
+        """
+        Probe the access permissions of this service once per client.
+
+        A successful probe is cached for `probe_ttl` seconds and shared by every client
+        created with the same API url, secret key and service name.
+
+        Returns:
+            dict: The (possibly cached) access-permissions response.
+        """
+        with self._access_lock:
+            cache_key = self._probe_cache_key()
+            probe_response = _access_probe_cache.get(cache_key)
+            if probe_response is not None:
+                self._access_verified = True
+                return probe_response
+
+            # Mark first so the probe's own _make_request call does not probe again
+            self._access_verified = True
+            try:
+                probe_response = self.test_connection()
+            except Exception:
+                self._access_verified = False
+                raise
+
+            if isinstance(probe_response, dict) and "error_message" not in probe_response:
+                _access_probe_cache.set(cache_key, probe_response, self.probe_ttl)
+
+            return probe_response
+
+    def _handle_api_response(self, response, http_cache_key=None, cached_entry=None):
+        if response.status_code == 304 and cached_entry is not None:
+            self.http_cache.record(hit=True)
+            return cached_entry.data
+
+        response_data = parse_json_response(response.content)
+        if http_cache_key is not None:
+            self.http_cache.record(hit=False)
+            if response.status_code == 200 and isinstance(response_data, dict) and "error_message" not in response_data:
+                self.http_cache.set(http_cache_key, response.headers, response_data, len(response.content))
 
         if response.status_code == 401:
             error_message = response_data.get('error_message')
@@ -27,18 +144,228 @@ class _Services():
 
         return response_data
 
-    def _make_request(self, **request_payload):
+    def _classify_request_error(self, request_error):
+        if isinstance(request_error, requests.ConnectTimeout):
+            return CONNECT_ERROR
+        if isinstance(request_error, requests.ConnectionError):
+            reason = getattr(request_error.args[0], 'reason', None) if request_error.args else None
+            return CONNECT_ERROR if isinstance(reason, NewConnectionError) else CONNECTION_ERROR
+        return TIMEOUT_ERROR
+
+    def _handle_request_error(self, request_error):
+        if isinstance(request_error, requests.ConnectionError):
+            self.logger.error(f"ConnectionError: {request_error}")
+            return {"error_message": f"ConnectionError: {request_error}"}
+
+        self.logger.error(f"TimeoutError: {request_error}")
+        return {"error_message": "Request timed out"}
+
+    def _log_retry_info(self, request_payload, attempt, delay, reason):
+        self.logger.warning(f"Retrying {request_payload.get('method')} {request_payload.get('url')} in {delay:.2f} seconds after attempt {attempt} failed with {reason}")
+
+    def _check_deadline(self, request_payload, delay=0):
+        """Raise when the enclosing deadline leaves no time to wait `delay` seconds and send the request."""
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() <= delay:
+            self.logger.error(f"Deadline of {deadline.seconds} seconds exceeded for {request_payload.get('method')} {request_payload.get('url')}")
+            raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+
+    def _reserve_rate_limit(self, request_payload):
+        """Reserve a slot of the endpoint group's rate limit and return the seconds to wait for it."""
+        deadline = current_deadline()
+        delay = self.rate_limiter.reserve(request_payload.get('url'), max_wait=deadline.remaining() if deadline else None)
+        if delay is None:
+            self.logger.error(f"Rate limit of {request_payload.get('url')} would outlast the deadline")
+            raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+        if delay > 0:
+            self.logger.debug(f"Rate limited {request_payload.get('method')} {request_payload.get('url')} for {delay:.2f} seconds")
+        return delay
+
+    def _acquire_concurrency_slot(self, request_payload):
+        """Wait for a slot of the adaptive concurrency limiter of the enclosing `concurrency_scope`, if any."""
+        limiter, deadline = current_limiter(), current_deadline()
+        if limiter is None:
+            return None
+        if not limiter.acquire(timeout=deadline.remaining() if deadline else None):
+            raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+        return limiter
+
+    def _apply_timeout(self, request_payload):
+        """Add the client timeout to the request, shortened to the time left before the enclosing deadline."""
+        self._check_deadline(request_payload)
+        timeout, deadline = request_payload.get('timeout', self.timeout), current_deadline()
+        if deadline is not None:
+            timeout = clamp_timeout(timeout, deadline.remaining())
+        return {**request_payload, 'timeout': timeout}
+
+    def _request_key(self, request_payload):
+        """Identify a request by url, query parameters and headers, which carry the credentials."""
+        params = request_payload.get('params') or {}
+        headers = request_payload.get('headers') or {}
+        return (
+            request_payload.get('url'),
+            tuple(sorted((key, str(value)) for key, value in params.items() if value is not None)),
+            tuple(sorted(headers.items()))
+        )
+
+    def _coalescing_key(self, request_payload):
+        """Return the key GETs are shared under, or None when the request must not be shared."""
+        if not self.coalesce_requests or request_payload.get('method', "GET").upper() != "GET":
+            return None
+        return self._request_key(request_payload)
+
+    def _prepare_revalidation(self, request_payload):
+        """Return the cache key, the cached entry and the payload with the validators of the cached entry added."""
+        if self.http_cache is None:
+            return None, None, request_payload
+
+        http_cache_key = self._request_key(request_payload)
+        cached_entry = self.http_cache.get(http_cache_key)
+        if cached_entry is not None:
+            headers = {**(request_payload.get('headers') or {}), **cached_entry.conditional_headers()}
+            request_payload = {**request_payload, 'headers': headers}
+        return http_cache_key, cached_entry, request_payload
+
+    def _coalescing_timeout(self):
+        deadline = current_deadline()
+        return None if deadline is None else max(deadline.remaining(), 0)
+
+    def _response_cache_key(self, name, **params):
+        return (self.api_url, self.api_secret_key, name, tuple(sorted((key, str(value)) for key, value in params.items())))
+
+    def _is_cacheable(self, response_data):
+        # Errors and batch results missing some pages are not served again
+        return isinstance(response_data, dict) and "error_message" not in response_data and not response_data.get("failed_pages")
+
+    def _refresh_cached(self, cache_key, loader):
         try:
-            response = requests.request(**request_payload)
-            return self._handle_api_response(response)
+            generation = self.response_cache.generation
+            response_data = loader()
+            if self._is_cacheable(response_data):
+                self.response_cache.set(cache_key, response_data, generation)
+        except Exception:
+            self.logger.exception(f"Background refresh of {cache_key[2]} failed, serving the stale response")
+        finally:
+            self.response_cache.end_refresh(cache_key)
+
+    def _cached_call(self, cache_key, loader):
+        """
+        Serve `loader()` from the stale-while-revalidate cache.
+
+        Fresh and stale entries are returned immediately; a stale entry is refreshed by a
+        single background thread. Only missing entries make the caller wait for the API.
+        """
+        found, response_data, needs_refresh = self.response_cache.lookup(cache_key)
+        if found:
+            if needs_refresh:
+                threading.Thread(target=self._refresh_cached, args=(cache_key, loader), daemon=True).start()
+            return response_data
+
+        generation = self.response_cache.generation
+        response_data = loader()
+        if self._is_cacheable(response_data):
+            # An invalidation while the call was in flight wins over its result
+            self.response_cache.set(cache_key, response_data, generation)
+        return response_data
+
+    def _make_request(self, revalidate=False, **request_payload):
+        """
+        Send a request, sharing the call and its decoded result with identical GETs already in flight.
+
+        With `revalidate`, a cached response is revalidated with `If-None-Match` /
+        `If-Modified-Since` and its decoded body is returned on `304 Not Modified`.
+        Shared and cached results are the same object for every caller and must not be mutated.
+        """
+        with start_span("huma_sdk.request", self._span_attributes(request_payload)):
+            if not self._access_verified:
+                self.verify_access()
+
+            http_cache_key, cached_entry = None, None
+            if revalidate:
+                http_cache_key, cached_entry, request_payload = self._prepare_revalidation(request_payload)
+
+            send_request = lambda: self._send_request(http_cache_key, cached_entry, **request_payload)
+            coalescing_key = self._coalescing_key(request_payload)
+            if coalescing_key is None:
+                return send_request()
+
+            try:
+                return request_group.do(coalescing_key, send_request, timeout=self._coalescing_timeout(), leader_errors=(DeadlineExceededError,))
+            except TimeoutError:
+                raise DeadlineExceededError(request_payload.get('method'), request_payload.get('url'))
+
+    def _send_request(self, http_cache_key=None, cached_entry=None, **request_payload):
+        method, attempt = request_payload.get('method', "GET"), 1
+        self.retry_policy.record_request()
+        while True:
+            # Retries start only while the deadline has time left, whatever their backoff
+            self._check_deadline(request_payload)
+            circuit_breaker = self.circuit_breakers.get(request_payload.get('url'))
+            circuit_breaker.before_request()
+            rate_limit_delay = None
+            try:
+                rate_limit_delay = self._reserve_rate_limit(request_payload)
+                if rate_limit_delay:
+                    time.sleep(rate_limit_delay)
+                limiter = self._acquire_concurrency_slot(request_payload)
+            except BaseException:
+                # Hand back a half-open probe slot when the request is never sent (deadline, cancellation)
+                circuit_breaker.record(None)
+                if rate_limit_delay is not None:
+                    # Nor does it keep the rate-limit token other clients could use
+                    self.rate_limiter.refund(request_payload.get('url'))
+                raise
+            started_at, latency, overloaded, healthy = time.monotonic(), None, False, None
+            response, error_name = None, None
+            try:
+                request = RequestContext(self._apply_timeout(request_payload), self.service_name, attempt)
+                response = self.middleware.send(request, self.transport.request)
+            except (requests.ConnectionError, requests.Timeout) as request_error:
+                overloaded, healthy, error_name = True, False, type(request_error).__name__
+                self._check_deadline(request_payload)
+                delay = self.retry_policy.next_delay(method, attempt, error_kind=self._classify_request_error(request_error))
+                if delay is None:
+                    return self._handle_request_error(request_error)
+                reason = error_name
+            else:
+                latency, overloaded = time.monotonic() - started_at, response.status_code in RETRY_STATUSES
+                healthy = response.status_code not in FAILURE_STATUSES
+                delay = self.retry_policy.next_delay(method, attempt, status_code=response.status_code, retry_after=response.headers.get('Retry-After'))
+                if delay is None:
+                    return self._handle_api_response(response, http_cache_key, cached_entry)
+                reason = f"status code {response.status_code}"
+            finally:
+                circuit_breaker.record(healthy)
+                if limiter is not None:
+                    limiter.release(latency, overloaded, self._endpoint(request_payload))
+                self._record_attempt(request_payload, attempt, time.monotonic() - started_at, response, error_name)
+
+            self._check_deadline(request_payload, delay)
+            self._log_retry_info(request_payload, attempt, delay, reason)
+            time.sleep(delay)
+            attempt += 1
+
+    def _span_attributes(self, request_payload):
+        # Skip building the attributes when nothing records them
+        if not tracing_enabled():
+            return None
+        return {"http.request.method": request_payload.get('method', "GET").upper(), "url.full": request_payload.get('url'), "huma.service": self.service_name}
+
+    def _endpoint(self, request_payload):
+        return f"{request_payload.get('method', 'GET').upper()} {endpoint_template(request_payload.get('url'))}"
 
-        except requests.ConnectionError as connection_error:
-            self.logger.error(f"ConnectionError: {connection_error}")
-            return {"error_message": f"ConnectionError: {connection_error}"}
+    def _record_attempt(self, request_payload, attempt, latency, response=None, error_name=None):
+        endpoint = self._endpoint(request_payload)
+        if response is None:
+            self._stats.record(endpoint, latency, error=error_name or "Exception", retry=attempt > 1)
+        else:
+            self._stats.record(endpoint, latency, status_code=response.status_code, retry=attempt > 1,
+                               bytes_out=request_body_size(response), bytes_in=len(response.content))
 
-        except requests.Timeout as timeout_error:
-            self.logger.error(f"TimeoutError: {timeout_error}")
-            return {"error_message": "Request timed out"}
+        span = current_span()
+        span.set_attribute("huma.attempts", attempt)
+        if response is not None:
+            span.set_attribute("http.response.status_code", response.status_code)
 
     def test_connection(self):
         headers = {
@@ -0,0 +1,46 @@
+from enum import Enum
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class EventType(str, Enum):
+    question_asked = "question_asked"
+    stream = "stream"
+    progress = "progress"
+    debug = "debug"
+    visual = "visual"
+    follow_up = "follow_up"
+    error = "error"
+    message_completed = "message_completed"
+
+class ChatEvent(BaseModel):
+    type: EventType
+    thread_id: Optional[str] = Field(default=None)
+    data: Any = Field(default=None)
+
+class QuestionAskedEvent(ChatEvent):
+    type: Literal[EventType.question_asked] = EventType.question_asked
+    message_id: Optional[str] = Field(default=None)
+
+class StreamEvent(ChatEvent):
+    type: Literal[EventType.stream] = EventType.stream
+
+class ProgressEvent(ChatEvent):
+    type: Literal[EventType.progress] = EventType.progress
+
+class DebugEvent(ChatEvent):
+    type: Literal[EventType.debug] = EventType.debug
+
+class VisualEvent(ChatEvent):
+    type: Literal[EventType.visual] = EventType.visual
+
+class FollowUpEvent(ChatEvent):
+    type: Literal[EventType.follow_up] = EventType.follow_up
+
+class ErrorEvent(ChatEvent):
+    type: Literal[EventType.error] = EventType.error
+
+class MessageCompletedEvent(ChatEvent):
+    type: Literal[EventType.message_completed] = EventType.message_completed
+    message_id: Optional[str] = Field(default=None)
+    result: Optional[dict] = Field(default=None)
@@ -1,7 +1,9 @@
 from huma_sdk._services import _aliases, _quicklinks, _questions, _histories, _favorites, _subscriptions, _webhooks
 from huma_sdk._async_services import _questions as _questions_async, _threads
+from huma_sdk._asyncio_services import _aliases as _aliases_asyncio, _quicklinks as _quicklinks_asyncio, _questions as _questions_asyncio, \
+    _histories as _histories_asyncio, _favorites as _favorites_asyncio, _subscriptions as _subscriptions_asyncio, _threads as _threads_asyncio
 
-AVAILABLE_SERVICES = ("Quicklinks", "Aliases", "Audits", "Questions", "Histories", "Favorites", "Subscriptions", "Webhooks")
+AVAILABLE_SERVICES = ("Quicklinks", "Aliases", "Audits", "Questions", "Histories", "Favorites", "Subscriptions", "Webhooks", "Threads")
 
 SERVICE_MAPPINGS = {
     "QuicklinksSync": _quicklinks._Quicklinks,
@@ -12,5 +14,12 @@ SERVICE_MAPPINGS = {
     "SubscriptionsSync": _subscriptions._Subscriptions,
     "WebhooksSync": _webhooks._Webhooks,
     "QuestionsAsync": _questions_async._AsyncQuestions,
-    "ThreadsAsync": _threads._Threads
+    "ThreadsAsync": _threads._Threads,
+    "QuicklinksAsyncio": _quicklinks_asyncio._AsyncioQuicklinks,
+    "AliasesAsyncio": _aliases_asyncio._AsyncioAliases,
+    "QuestionsAsyncio": _questions_asyncio._AsyncioQuestions,
+    "HistoriesAsyncio": _histories_asyncio._AsyncioHistories,
+    "FavoritesAsyncio": _favorites_asyncio._AsyncioFavorites,
+    "SubscriptionsAsyncio": _subscriptions_asyncio._AsyncioSubscriptions,
+    "ThreadsAsyncio": _threads_asyncio._AsyncioThreads
 }
\ No newline at end of file
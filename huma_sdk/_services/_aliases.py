@@ -1,5 +1,4 @@
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
 
 
 class _Aliases(_Services):
@@ -9,21 +8,41 @@ class _Aliases(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="aliases", is_answer_data=False)
+        paginator = self.paginator_class(self, module="aliases", is_answer_data=False, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="aliases", is_answer_data=False)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _fetch_aliases(self, **params):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
         url = f"{self.api_url}/v1/aliases"
-        return self._make_request(method="GET", url=url, headers=headers, params=params)
+        return self._make_request(method="GET", url=url, headers=headers, params=params, revalidate=True)
+
+    def fetch_aliases(self, page: int=None, limit: int=None, sort_by: int=-1, order_by: str="", search_by: str="", search_for: str="", is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None, use_cache: bool=False):
+        params = {"sort_by": sort_by, "order_by": order_by, "search_by": search_by, "search_for": search_for}
+        fetch_aliases = lambda: self._handle_pagination(self._fetch_aliases, page, limit, is_batch_pages, max_page_count, max_workers=max_workers, deadline=deadline, **params)
+        if use_cache:
+            cache_key = self._response_cache_key("aliases", page=page, limit=limit, is_batch_pages=is_batch_pages, max_page_count=max_page_count, **params)
+            return self._cached_call(cache_key, fetch_aliases)
+        aliases = fetch_aliases()
+        return aliases
+
+    def invalidate_aliases_cache(self):
+        self.response_cache.invalidate((self.api_url, self.api_secret_key, "aliases"))
+
+    def iter_aliases_pages(self, page: int=None, limit: int=None, sort_by: int=-1, order_by: str="", search_by: str="", search_for: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "search_by": search_by, "search_for": search_for}
+        return self._handle_iteration(self._fetch_aliases, page, limit, max_page_count, **params)
 
-    def fetch_aliases(self, page: int=None, limit: int=None, sort_by: int=-1, order_by: str="", search_by: str="", search_for: str="", is_batch_pages: bool=False, max_page_count: int=10):
+    def iter_aliases_records(self, page: int=None, limit: int=None, sort_by: int=-1, order_by: str="", search_by: str="", search_for: str="", max_page_count: int=None):
         params = {"sort_by": sort_by, "order_by": order_by, "search_by": search_by, "search_for": search_for}
-        aliases = self._handle_pagination(self._fetch_aliases, page, limit, is_batch_pages, max_page_count, **params)
-        return aliases
\ No newline at end of file
+        return self._handle_iteration(self._fetch_aliases, page, limit, max_page_count, records=True, **params)
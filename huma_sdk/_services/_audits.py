@@ -1,5 +1,4 @@
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
 
 
 class _Audits(_Services):
@@ -9,21 +8,34 @@ class _Audits(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="audit_trail", is_answer_data=False)
+        paginator = self.paginator_class(self, module="audit_trail", is_answer_data=False, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="audit_trail", is_answer_data=False)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _fetch_audits(self, **params):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
         url = f"{self.api_url}/v1/audits"
         return self._make_request(method="GET", url=url, headers=headers, params=params)
 
-    def fetch_audits(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="created", endpoint: str="", content: str="", is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_audits(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="created", endpoint: str="", content: str="", is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "endpoint": endpoint, "content": content}
+        audits = self._handle_pagination(self._fetch_audits, page, limit, is_batch_pages, max_page_count, max_workers=max_workers, deadline=deadline, **params)
+        return audits
+
+    def iter_audits_pages(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="created", endpoint: str="", content: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "endpoint": endpoint, "content": content}
+        return self._handle_iteration(self._fetch_audits, page, limit, max_page_count, **params)
+
+    def iter_audits_records(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="created", endpoint: str="", content: str="", max_page_count: int=None):
         params = {"sort_by": sort_by, "order_by": order_by, "endpoint": endpoint, "content": content}
-        audits = self._handle_pagination(self._fetch_audits, page, limit, is_batch_pages, max_page_count, **params)
-        return audits
\ No newline at end of file
+        return self._handle_iteration(self._fetch_audits, page, limit, max_page_count, records=True, **params)
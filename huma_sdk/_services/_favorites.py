@@ -1,5 +1,4 @@
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
 
 
 class _Favorites(_Services):
@@ -9,19 +8,24 @@ class _Favorites(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="favorites", is_answer_data=is_answer_data)
+        paginator = self.paginator_class(self, module="favorites", is_answer_data=is_answer_data, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, is_answer_data:bool= True, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="favorites", is_answer_data=is_answer_data)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _fetch_favorites(self, **params):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
         url = f"{self.api_url}/v1/favorites"
-        return self._make_request(method="GET", url=url, headers=headers, params=params)
+        return self._make_request(method="GET", url=url, headers=headers, params=params, revalidate=True)
 
     def _create_favorite(self, **payload):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
@@ -38,20 +42,36 @@ class _Favorites(_Services):
         url = f"{self.api_url}/v1/favorites/{ticket_number}/delete"
         return self._make_request(method="DELETE", url=url, headers=headers)
 
-    def fetch_favorites(self, page: int=1, limit: int=50, sort_by: int=-1, order_by: str="created", question: str="", is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_favorites(self, page: int=1, limit: int=50, sort_by: int=-1, order_by: str="created", question: str="", is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
         params = {"sort_by": sort_by, "order_by": order_by, "question": question}
-        favorites = self._handle_pagination(self._fetch_favorites, page, limit, is_batch_pages, max_page_count, False, **params)
+        favorites = self._handle_pagination(self._fetch_favorites, page, limit, is_batch_pages, max_page_count, False, max_workers=max_workers, deadline=deadline, **params)
         return favorites
 
     def create_favorite(self, ticket_number: str=""):
         favorite = self._create_favorite(ticket_number=ticket_number)
         return favorite
 
-    def fetch_favorite_data(self, ticket_number: str="", page: int=1, limit: int=20, type: str="", is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_favorite_data(self, ticket_number: str="", page: int=1, limit: int=20, type: str="", is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
         args, params = (ticket_number, ), {"type": type}
-        favorite = self._handle_pagination(self._fetch_favorite_data, page, limit, is_batch_pages, max_page_count, True, *args, **params)
+        favorite = self._handle_pagination(self._fetch_favorite_data, page, limit, is_batch_pages, max_page_count, True, *args, max_workers=max_workers, deadline=deadline, **params)
         return favorite
 
     def delete_favorite(self, *args,**kwargs):
         favorite = self._delete_favorite(*args,**kwargs)
-        return favorite
\ No newline at end of file
+        return favorite
+
+    def iter_favorites_pages(self, page: int=1, limit: int=50, sort_by: int=-1, order_by: str="created", question: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_favorites, page, limit, max_page_count, False, **params)
+
+    def iter_favorites_records(self, page: int=1, limit: int=50, sort_by: int=-1, order_by: str="created", question: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_favorites, page, limit, max_page_count, False, records=True, **params)
+
+    def iter_favorite_data_pages(self, ticket_number: str="", page: int=1, limit: int=20, type: str="", max_page_count: int=None):
+        args, params = (ticket_number, ), {"type": type}
+        return self._handle_iteration(self._fetch_favorite_data, page, limit, max_page_count, True, *args, **params)
+
+    def iter_favorite_data_records(self, ticket_number: str="", page: int=1, limit: int=20, type: str="", max_page_count: int=None):
+        args, params = (ticket_number, ), {"type": type}
+        return self._handle_iteration(self._fetch_favorite_data, page, limit, max_page_count, True, *args, records=True, **params)
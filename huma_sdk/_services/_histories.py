@@ -1,5 +1,4 @@
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
 
 
 class _Histories(_Services):
@@ -9,14 +8,19 @@ class _Histories(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="histories", is_answer_data=is_answer_data)
+        paginator = self.paginator_class(self, module="histories", is_answer_data=is_answer_data, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, is_answer_data:bool= True, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="histories", is_answer_data=is_answer_data)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _fetch_history(self, *args, **params):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
@@ -43,14 +47,14 @@ class _Histories(_Services):
         url = f"{self.api_url}/v1/histories/{conversion_id}/visual/result"
         return self._make_request(method="GET", url=url, headers=headers)
 
-    def fetch_history(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="", question: str="", is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_history(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="", question: str="", is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
         params = {"sort_by": sort_by, "order_by": order_by, "question": question}
-        history = self._handle_pagination(self._fetch_history, page, limit, is_batch_pages, max_page_count, False, **params)
+        history = self._handle_pagination(self._fetch_history, page, limit, is_batch_pages, max_page_count, False, max_workers=max_workers, deadline=deadline, **params)
         return history
 
-    def fetch_history_data(self, ticket_number: str = None, page: int = 1, limit: int = 20, type: str = None, is_batch_pages: bool = False, max_page_count: int = 10):
+    def fetch_history_data(self, ticket_number: str = None, page: int = 1, limit: int = 20, type: str = None, is_batch_pages: bool = False, max_page_count: int = 10, max_workers: int = 1, deadline: float = None):
         args, params = (ticket_number, ), {"type": type}
-        history = self._handle_pagination(self._fetch_history_data, page, limit, is_batch_pages, max_page_count, True, *args, **params)
+        history = self._handle_pagination(self._fetch_history_data, page, limit, is_batch_pages, max_page_count, True, *args, max_workers=max_workers, deadline=deadline, **params)
         return history
 
     def submit_history_visual(self, ticket_number: str="", file_type: str="", visual_type: str=""):
@@ -64,4 +68,20 @@ class _Histories(_Services):
 
     def fetch_history_visual_result(self, *args):
         conversion_result = self._fetch_history_visual_result(*args)
-        return conversion_result
\ No newline at end of file
+        return conversion_result
+
+    def iter_history_pages(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="", question: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_history, page, limit, max_page_count, False, **params)
+
+    def iter_history_records(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str="", question: str="", max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_history, page, limit, max_page_count, False, records=True, **params)
+
+    def iter_history_data_pages(self, ticket_number: str = None, page: int = 1, limit: int = 20, type: str = None, max_page_count: int = None):
+        args, params = (ticket_number, ), {"type": type}
+        return self._handle_iteration(self._fetch_history_data, page, limit, max_page_count, True, *args, **params)
+
+    def iter_history_data_records(self, ticket_number: str = None, page: int = 1, limit: int = 20, type: str = None, max_page_count: int = None):
+        args, params = (ticket_number, ), {"type": type}
+        return self._handle_iteration(self._fetch_history_data, page, limit, max_page_count, True, *args, records=True, **params)
@@ -1,21 +1,46 @@
-import time
+import time, contextvars
+from concurrent.futures import ThreadPoolExecutor
+from huma_sdk.exceptions import UnauthorizedException, PageFetchError, DeadlineExceededError, CircuitOpenError
+from huma_sdk._helpers.timeout_helpers import deadline_scope, current_deadline
+from huma_sdk._helpers.concurrency_helpers import concurrency_scope
+from huma_sdk._helpers.tracing_helpers import start_span, current_span
 from huma_sdk.utils._log_utils import get_logger
 
 
 class _Paginator:
-    def __init__(self, resource_client, module, is_answer_data):
+    def __init__(self, resource_client, module, is_answer_data, max_workers=1, deadline=None):
         self.resource_client = resource_client
         self.module = module
         self.is_answer_data = is_answer_data
+        self.max_workers = max_workers
+        self.deadline = deadline
         self.logger = get_logger(__name__)
 
+    @property
+    def answer_key(self):
+        return self.module if self.module == "subscriptions" else "answer"
+
     def _call_api(self, caller_function, page=1, limit=10, *args, **kwargs):
         kwargs.update({'page': page, "limit": limit})
-        return caller_function(*args, **kwargs)
+        with start_span("huma_sdk.page", {"huma.module": self.module, "huma.page": page}):
+            return caller_function(*args, **kwargs)
+
+    def _span_attributes(self, max_page_count, limit):
+        return {"huma.module": self.module, "huma.max_page_count": max_page_count, "huma.page_limit": limit, "huma.max_workers": self.max_workers}
 
     def _validate_max_page_count(self, max_page_count):
         return max_page_count if isinstance(max_page_count, int) else 10
 
+    def _resolve_limit(self, limit, result_response):
+        """Return the page size, read from the first page when the API default was used."""
+        if limit:
+            return int(limit)
+        # The first page of a batch with more pages is full
+        return result_response['metadata'].get('limit') or len(self._extract_records(result_response)) or 1
+
+    def _validate_max_workers(self, max_workers):
+        return max_workers if isinstance(max_workers, int) and max_workers > 1 else 1
+
     def _log_total_records_info(self, total_records_present):
         self.logger.info(f"Total records present: {total_records_present}")
 
@@ -38,53 +63,147 @@ class _Paginator:
             self.logger.info(f"Fetched records from index {start_record_index} to {((page-1)*page_limit)+total_records} on page {page}.")
             self.logger.info(f"Successfully fetched all the records of this batch.")
 
-    def fetch_answer_data(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
-        answer_key = self.module if self.module == "subscriptions" else "answer"
-        answer_data = result_response.get(answer_key, {}).get('data', [])
-        for page in range(next_page, pages_to_fetch+1):
-            result_response = self._call_api(caller_function, page, limit, *args, **kwargs)
-            new_data = result_response.get(answer_key, {}).get('data', [])
-            answer_data.extend(new_data)
+    def _log_failed_page_info(self, page, error_message):
+        self.logger.error(f"Failed to fetch page {page} because {error_message}")
 
-            self._log_fetch_page_info(page, limit, pages_to_fetch, total_records=len(new_data))
+    def _extract_records(self, result_response):
+        if self.is_answer_data:
+            return result_response.get(self.answer_key, {}).get('data', [])
+        return result_response.get(self.module, [])
 
-        # Update the response structure
-        result_response[answer_key]['data'] = answer_data
-        return result_response
+    def _check_deadline(self, page):
+        """Raise instead of starting `page` once the deadline of the call is spent."""
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            self.logger.error(f"Deadline of {deadline.seconds} seconds exceeded before page {page} of {self.module}")
+            raise DeadlineExceededError("GET", f"{self.module} page {page}")
 
-    def fetch_records(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
-        answer_data = result_response.get(self.module, {})
-        for page in range(next_page, pages_to_fetch+1):
+    def _fetch_page(self, caller_function, page, limit, *args, **kwargs):
+        """Fetch one page, returning (response, error_message) instead of raising for a single failed page."""
+        self._check_deadline(page)
+        try:
             result_response = self._call_api(caller_function, page, limit, *args, **kwargs)
-            new_data = result_response.get(self.module, {})
-            answer_data.extend(new_data)
+        except (UnauthorizedException, DeadlineExceededError, CircuitOpenError):
+            raise
+        except Exception as e:
+            return None, str(e)
+
+        if not isinstance(result_response, dict):
+            return None, f"Unexpected response {result_response}"
+        if "error_message" in result_response:
+            return None, result_response["error_message"]
+        return result_response, None
+
+    def _fetch_pages(self, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        """Fetch pages next_page..pages_to_fetch and return their outcomes in page order."""
+        pages = list(range(next_page, pages_to_fetch+1))
+        max_workers = min(self._validate_max_workers(self.max_workers), len(pages))
+        if max_workers <= 1:
+            return [(page, *self._fetch_page(caller_function, page, limit, *args, **kwargs)) for page in pages]
+
+        self.logger.info(f"Fetching {len(pages)} pages with up to {max_workers} concurrent workers.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, concurrency_scope(self.resource_client.concurrency_limiter):
+            # Each worker runs in a copy of the caller's context so the deadline and the adaptive limiter follow it
+            futures = [executor.submit(contextvars.copy_context().run, self._fetch_page, caller_function, page, limit, *args, **kwargs) for page in pages]
+            try:
+                return [(page, *future.result()) for page, future in zip(pages, futures)]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _merge_pages(self, result_response, page_outcomes, limit, pages_to_fetch):
+        """Reassemble the records of every page in order, recording the pages that failed."""
+        records, failed_pages = list(self._extract_records(result_response)), []
+        for page, page_response, error_message in page_outcomes:
+            if page_response is None:
+                failed_pages.append({"page": page, "error_message": error_message})
+                self._log_failed_page_info(page, error_message)
+                continue
+
+            new_records = self._extract_records(page_response)
+            records.extend(new_records)
+            result_response = page_response
+            self._log_fetch_page_info(page, limit, pages_to_fetch, total_records=len(new_records))
+
+        # Build a new response so the page responses themselves are left untouched
+        merged_response = dict(result_response)
+        if self.is_answer_data:
+            merged_response[self.answer_key] = {**result_response.get(self.answer_key, {}), 'data': records}
+        else:
+            merged_response[self.module] = records
 
-            self._log_fetch_page_info(page, limit, pages_to_fetch, total_records=len(new_data))
+        if failed_pages:
+            merged_response['failed_pages'] = failed_pages
+            current_span().set_attribute("huma.failed_pages", len(failed_pages))
+        return merged_response
 
-        # Update the response structure
-        result_response[self.module] = answer_data
-        return result_response
+    def fetch_answer_data(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        page_outcomes = self._fetch_pages(caller_function, next_page, limit, pages_to_fetch, *args, **kwargs)
+        return self._merge_pages(result_response, page_outcomes, limit, pages_to_fetch)
+
+    def fetch_records(self, result_response, caller_function, next_page, limit, pages_to_fetch, *args, **kwargs):
+        page_outcomes = self._fetch_pages(caller_function, next_page, limit, pages_to_fetch, *args, **kwargs)
+        return self._merge_pages(result_response, page_outcomes, limit, pages_to_fetch)
+
+    def fetch_single_page(self, caller_function, page, limit, *args, **kwargs):
+        """Fetch one page within the paginator's deadline."""
+        with deadline_scope(self.deadline):
+            return self._call_api(caller_function, page, limit, *args, **kwargs)
 
     def paginate_result(self, max_page_count, caller_function, page, limit, *args, **kwargs):
-        try:
-            result_response = self._call_api(caller_function, page, limit, *args, **kwargs)
+        """Fetch `page` and up to `max_page_count` pages after it, all within the paginator's deadline and one tracing span."""
+        with deadline_scope(self.deadline), start_span("huma_sdk.paginate", self._span_attributes(max_page_count, limit)):
+            return self._paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
 
-            if 'metadata' in result_response and result_response['metadata'].get('has_next_page'):
-                max_page_count = self._validate_max_page_count(max_page_count)
-                total_records_present = result_response['metadata'].get('total_count', 0)
+    def _paginate_result(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        page = page or 1
+        result_response = self._call_api(caller_function, page, limit, *args, **kwargs)
 
-                self._log_total_records_info(total_records_present)
-                pages_to_fetch, total_records = self._calculate_pages_and_records((page-1)+max_page_count, limit, result_response)
+        if isinstance(result_response, dict) and 'metadata' in result_response and result_response['metadata'].get('has_next_page'):
+            limit = self._resolve_limit(limit, result_response)
+            max_page_count = self._validate_max_page_count(max_page_count)
+            total_records_present = result_response['metadata'].get('total_count', 0)
 
-                start_record_index =  ((page-1)*limit)+1
-                self.logger.info(f"Index Range of Records to be fetched in this batch: {start_record_index}-{total_records}")
-                self._log_fetch_page_info(page, limit, pages_to_fetch)
+            self._log_total_records_info(total_records_present)
+            pages_to_fetch, total_records = self._calculate_pages_and_records((page-1)+max_page_count, limit, result_response)
 
-                # Fetch additional pages
-                my_args = (result_response, caller_function, page+1, limit, pages_to_fetch, *args)
-                result_response = self.fetch_answer_data(*my_args, **kwargs) if self.is_answer_data else self.fetch_records(*my_args, **kwargs)
+            start_record_index =  ((page-1)*limit)+1
+            self.logger.info(f"Index Range of Records to be fetched in this batch: {start_record_index}-{total_records}")
+            self._log_fetch_page_info(page, limit, pages_to_fetch)
 
-            return result_response
+            # Fetch additional pages
+            my_args = (result_response, caller_function, page+1, limit, pages_to_fetch, *args)
+            result_response = self.fetch_answer_data(*my_args, **kwargs) if self.is_answer_data else self.fetch_records(*my_args, **kwargs)
 
-        except Exception as e:
-            self.logger.error(f'Failed to fetch paginated record because {e}')
\ No newline at end of file
+        return result_response
+
+    def iter_pages(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        """
+        Yield page responses one at a time, fetching each page only when it is requested.
+
+        Iteration starts at `page` and stops after the last page, or after `max_page_count`
+        pages when it is given. Only the current page is held in memory.
+
+        Raises:
+            PageFetchError: If a page cannot be fetched.
+        """
+        pages_fetched = 0
+        while True:
+            page_response, error_message = self._fetch_page(caller_function, page, limit, *args, **kwargs)
+            if page_response is None:
+                self._log_failed_page_info(page, error_message)
+                raise PageFetchError(page, error_message)
+
+            yield page_response
+            pages_fetched += 1
+
+            metadata = page_response.get('metadata') or {}
+            if not metadata.get('has_next_page') or (max_page_count and pages_fetched >= max_page_count):
+                return
+            page += 1
+
+    def iter_records(self, max_page_count, caller_function, page, limit, *args, **kwargs):
+        """Yield the individual records of every page yielded by `iter_pages`."""
+        for page_response in self.iter_pages(max_page_count, caller_function, page, limit, *args, **kwargs):
+            yield from self._extract_records(page_response)
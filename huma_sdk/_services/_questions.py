@@ -1,5 +1,7 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
+from huma_sdk._helpers.concurrency_helpers import concurrency_scope
 
 class _Questions(_Services):
     def __init__(self, *args, **kwargs):
@@ -8,14 +10,19 @@ class _Questions(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="favorites", is_answer_data=True)
+        paginator = self.paginator_class(self, module="favorites", is_answer_data=True, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="favorites", is_answer_data=True)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _submit_question(self, **payload):
         headers = {"Authorization": f"Bearer {self.api_secret_key}", "Content-Type": "application/json"}
@@ -37,11 +44,30 @@ class _Questions(_Services):
         submission_status = self._submit_question(**payload)
         return submission_status
 
+    def submit_questions(self, questions: list, commands: list=None, answer_format: str="json", max_workers: int=8):
+        """
+        Submit many questions concurrently and return their submission statuses in order.
+
+        Up to `max_workers` threads submit the questions, while the shared adaptive concurrency
+        limiter keeps the number in flight below the level where the API starts rejecting them.
+        """
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor, concurrency_scope(self.concurrency_limiter):
+            futures = [executor.submit(contextvars.copy_context().run, self.submit_question, question, commands, answer_format) for question in questions]
+            return [future.result() for future in futures]
+
     def check_question_status(self, *args, **kwargs):
         question_status = self._check_question_status(*args, **kwargs)
         return question_status
 
-    def fetch_answer(self, ticket_number: str=None, page: int=1, limit: int=50, is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_answer(self, ticket_number: str=None, page: int=1, limit: int=50, is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
+        args = (ticket_number, )
+        result = self._handle_pagination(self._fetch_answer, page, limit, is_batch_pages, max_page_count, *args, max_workers=max_workers, deadline=deadline)
+        return result
+
+    def iter_answer_pages(self, ticket_number: str=None, page: int=1, limit: int=50, max_page_count: int=None):
+        args = (ticket_number, )
+        return self._handle_iteration(self._fetch_answer, page, limit, max_page_count, *args)
+
+    def iter_answer_records(self, ticket_number: str=None, page: int=1, limit: int=50, max_page_count: int=None):
         args = (ticket_number, )
-        result = self._handle_pagination(self._fetch_answer, page, limit, is_batch_pages, max_page_count, *args)
-        return result
\ No newline at end of file
+        return self._handle_iteration(self._fetch_answer, page, limit, max_page_count, *args, records=True)
@@ -8,8 +8,13 @@ class _Quicklinks(_Services):
     def _fetch_quicklinks(self):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
         url = f"{self.api_url}/v1/quicklinks"
-        return self._make_request(method="GET", url=url, headers=headers)
+        return self._make_request(method="GET", url=url, headers=headers, revalidate=True)
 
-    def fetch_quicklinks(self):
+    def fetch_quicklinks(self, use_cache: bool=False):
+        if use_cache:
+            return self._cached_call(self._response_cache_key("quicklinks"), self._fetch_quicklinks)
         quicklinks = self._fetch_quicklinks()
-        return quicklinks
\ No newline at end of file
+        return quicklinks
+
+    def invalidate_quicklinks_cache(self):
+        self.response_cache.invalidate((self.api_url, self.api_secret_key, "quicklinks"))
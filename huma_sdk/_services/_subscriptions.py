@@ -1,5 +1,4 @@
 from huma_sdk._resources import _Services
-from huma_sdk._services._paginator import _Paginator
 
 class _Subscriptions(_Services):
     def __init__(self, *args, **kwargs):
@@ -8,19 +7,24 @@ class _Subscriptions(_Services):
     def _validate_page_number(self, page):
         return page or 1
 
-    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, **kwargs):
+    def _handle_pagination(self, caller_function, page, limit, is_batch_pages, max_page_count, is_answer_data:bool= True, *args, max_workers=1, deadline=None, **kwargs):
         page = self._validate_page_number(page)
-        paginator = _Paginator(self, module="subscriptions", is_answer_data=is_answer_data)
+        paginator = self.paginator_class(self, module="subscriptions", is_answer_data=is_answer_data, max_workers=max_workers, deadline=deadline)
         if is_batch_pages:
             return paginator.paginate_result(max_page_count, caller_function, page, limit, *args, **kwargs)
         else:
-            kwargs.update({"page": page, "limit": limit})
-            return caller_function(*args, **kwargs)
+            return paginator.fetch_single_page(caller_function, page, limit, *args, **kwargs)
+
+    def _handle_iteration(self, caller_function, page, limit, max_page_count, is_answer_data:bool= True, *args, records=False, **kwargs):
+        page = self._validate_page_number(page)
+        paginator = self.paginator_class(self, module="subscriptions", is_answer_data=is_answer_data)
+        iterate = paginator.iter_records if records else paginator.iter_pages
+        return iterate(max_page_count, caller_function, page, limit, *args, **kwargs)
 
     def _fetch_subscriptions(self, **params):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
         url = f"{self.api_url}/v1/subscription"
-        return self._make_request(method="GET", url=url, headers=headers, params=params)
+        return self._make_request(method="GET", url=url, headers=headers, params=params, revalidate=True)
 
     def _create_subscription(self, **payload):
         headers = {"Authorization": f"Bearer {self.api_secret_key}"}
@@ -42,9 +46,9 @@ class _Subscriptions(_Services):
         url = f"{self.api_url}/v1/subscription/{question}/status"
         return self._make_request(method="GET", url=url, headers=headers)
 
-    def fetch_subscriptions(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str=None, question: str=None, is_batch_pages: bool=False, max_page_count: int=10):
+    def fetch_subscriptions(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str=None, question: str=None, is_batch_pages: bool=False, max_page_count: int=10, max_workers: int=1, deadline: float=None):
         params = {"sort_by": sort_by, "order_by": order_by, "question": question}
-        subscription = self._handle_pagination(self._fetch_subscriptions, page, limit, is_batch_pages, max_page_count, False, **params)
+        subscription = self._handle_pagination(self._fetch_subscriptions, page, limit, is_batch_pages, max_page_count, False, max_workers=max_workers, deadline=deadline, **params)
         return subscription
 
     def create_subscription(self, ticket_number: str=None):
@@ -52,9 +56,9 @@ class _Subscriptions(_Services):
         subscription = self._create_subscription(**payload)
         return subscription
 
-    def fetch_subscription_data(self, subscribed_id: str=None, page: int=1, limit: int=20, type: str=None, is_batch_pages: bool = False, max_page_count: int = 10):
+    def fetch_subscription_data(self, subscribed_id: str=None, page: int=1, limit: int=20, type: str=None, is_batch_pages: bool = False, max_page_count: int = 10, max_workers: int = 1, deadline: float = None):
         args, params = (subscribed_id, ), {"type": type}
-        subscription = self._handle_pagination(self._fetch_subscription_data, page, limit, is_batch_pages, max_page_count, True, *args, **params)
+        subscription = self._handle_pagination(self._fetch_subscription_data, page, limit, is_batch_pages, max_page_count, True, *args, max_workers=max_workers, deadline=deadline, **params)
         return subscription
 
     def delete_subscription(self, *args,**kwargs):
@@ -63,4 +67,20 @@ class _Subscriptions(_Services):
 
     def fetch_subscription_status(self, *args,**kwargs):
         subscription = self._fetch_subscription_status(*args,**kwargs)
-        return subscription
\ No newline at end of file
+        return subscription
+
+    def iter_subscriptions_pages(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str=None, question: str=None, max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_subscriptions, page, limit, max_page_count, False, **params)
+
+    def iter_subscriptions_records(self, page: int=1, limit: int=20, sort_by: int=-1, order_by: str=None, question: str=None, max_page_count: int=None):
+        params = {"sort_by": sort_by, "order_by": order_by, "question": question}
+        return self._handle_iteration(self._fetch_subscriptions, page, limit, max_page_count, False, records=True, **params)
+
+    def iter_subscription_data_pages(self, subscribed_id: str=None, page: int=1, limit: int=20, type: str=None, max_page_count: int=None):
+        args, params = (subscribed_id, ), {"type": type}
+        return self._handle_iteration(self._fetch_subscription_data, page, limit, max_page_count, True, *args, **params)
+
+    def iter_subscription_data_records(self, subscribed_id: str=None, page: int=1, limit: int=20, type: str=None, max_page_count: int=None):
+        args, params = (subscribed_id, ), {"type": type}
+        return self._handle_iteration(self._fetch_subscription_data, page, limit, max_page_count, True, *args, records=True, **params)
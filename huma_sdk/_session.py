@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from huma_sdk._resources import _Services
 from huma_sdk._service_config import SERVICE_MAPPINGS, AVAILABLE_SERVICES
 from huma_sdk.exceptions import ResourceNotExistsError
 
@@ -11,4 +13,40 @@ class _Session:
 
     def create_connection(self, *args, **kwargs):
         required_service = f"{self.service_name}{self.mode}"
-        return SERVICE_MAPPINGS.get(required_service)(*args, **kwargs)
\ No newline at end of file
+        if required_service not in SERVICE_MAPPINGS:
+            raise ResourceNotExistsError(required_service, available_services=SERVICE_MAPPINGS.keys())
+
+        kwargs.pop('mode', None)
+        return SERVICE_MAPPINGS.get(required_service)(*args, **kwargs)
+
+    @staticmethod
+    def rest_service_names():
+        return [
+            service_name for service_name in AVAILABLE_SERVICES
+            if isinstance(SERVICE_MAPPINGS.get(f"{service_name}Sync"), type) and issubclass(SERVICE_MAPPINGS[f"{service_name}Sync"], _Services)
+        ]
+
+    @classmethod
+    def prewarm(cls, service_names=None, **kwargs):
+        """
+        Run the access-permission probes of several services concurrently.
+
+        The probe results are cached, so clients created afterwards with the same
+        credentials skip the probe until the cache entry expires.
+
+        Args:
+            service_names (list): Services to probe. Defaults to every REST service.
+            **kwargs: Client options such as `api_url`, `api_secret_key` and `probe_ttl`.
+
+        Returns:
+            dict: The access-permissions response of each service.
+        """
+        service_names = service_names or cls.rest_service_names()
+        clients = {
+            service_name: cls(service_name=service_name).create_connection(service_name=service_name, lazy_probe=True, **kwargs)
+            for service_name in service_names
+        }
+
+        with ThreadPoolExecutor(max_workers=len(clients) or 1) as executor:
+            probes = {service_name: executor.submit(client.verify_access) for service_name, client in clients.items()}
+            return {service_name: probe.result() for service_name, probe in probes.items()}
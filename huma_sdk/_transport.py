@@ -0,0 +1,433 @@
+import time, socket, asyncio, threading, weakref, contextvars
+import httpx, requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.request import ACCEPT_ENCODING
+from huma_sdk._helpers.hedge_helpers import HedgePolicy
+from huma_sdk._helpers.middleware_helpers import current_timings, record_timing
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+class TransportStats:
+    """
+    Thread-safe byte counters of the REST responses received by the transports.
+
+    `wire_bytes` counts the body bytes as received, before decompression, and
+    `body_bytes` the decoded bytes handed to the JSON decoder.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.responses = 0
+            self.compressed_responses = 0
+            self.wire_bytes = 0
+            self.body_bytes = 0
+
+    def record(self, wire_bytes, body_bytes, content_encoding=None):
+        with self._lock:
+            self.responses += 1
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+            if content_encoding and content_encoding != "identity":
+                self.compressed_responses += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "compressed_responses": self.compressed_responses,
+                "wire_bytes": self.wire_bytes,
+                "body_bytes": self.body_bytes,
+                "compression_ratio": round(self.body_bytes / self.wire_bytes, 2) if self.wire_bytes else None
+            }
+
+
+_transport_stats = TransportStats()
+
+
+def transport_stats():
+    """Return the compressed (wire) and decompressed byte counts of every REST response received so far."""
+    return _transport_stats.snapshot()
+
+
+class _BlockAllCookiesPolicy(DefaultCookiePolicy):
+    """The API authenticates with bearer tokens, so the shared session never stores cookies."""
+    def set_ok(self, cookie, request):
+        return False
+
+
+class _TimedConnectionMixin:
+    """
+    Record the DNS, TCP connect, TLS and time-to-first-byte phases of the requests sent while
+    a middleware chain collects timings. Without one, the connection behaves like urllib3's.
+    """
+    def _new_conn(self):
+        if current_timings() is None:
+            return super()._new_conn()
+
+        # Resolve once and connect to the resolved addresses, so resolution is timed on its own
+        started_at = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as error:
+            raise NameResolutionError(self.host, self, error) from error
+        resolved_at = time.perf_counter()
+        record_timing("dns", resolved_at - started_at)
+
+        dns_host, connect_error = self._dns_host, None
+        try:
+            for address in addresses:
+                self._dns_host = address[4][0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError as error:
+                    connect_error = error
+            else:
+                raise connect_error
+        finally:
+            self._dns_host = dns_host
+
+        self._connected_at = time.perf_counter()
+        record_timing("connect", self._connected_at - resolved_at)
+        return sock
+
+    def getresponse(self, *args, **kwargs):
+        if current_timings() is None:
+            return super().getresponse(*args, **kwargs)
+
+        started_at = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        record_timing("ttfb", time.perf_counter() - started_at)
+        return response
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        self._connected_at = None
+        super().connect()
+        if self._connected_at is not None:
+            record_timing("tls", time.perf_counter() - self._connected_at)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+async def _trace_phases(event_name, info):
+    # httpcore trace events; the TCP connect includes name resolution
+    timings = current_timings()
+    if timings is None:
+        return
+    phase_name, _, stage = event_name.rpartition(".")
+    phase = _TRACED_PHASES.get(phase_name.split(".", 1)[-1])
+    if phase is None:
+        return
+    if stage == "started":
+        timings[f"_{phase}_started_at"] = time.perf_counter()
+    elif stage in ("complete", "failed"):
+        started_at = timings.pop(f"_{phase}_started_at", None)
+        if started_at is not None:
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - started_at
+
+
+_TRACED_PHASES = {"connect_tcp": "connect", "start_tls": "tls", "receive_response_headers": "ttfb", "receive_response_body": "body"}
+
+
+class _Transport:
+    """
+    Pooled keep-alive HTTP transport shared by the REST service clients.
+
+    A single `requests.Session` backed by urllib3 connection pools is reused for every
+    request, so consecutive calls to the same host skip the TCP and TLS handshakes.
+    Sending requests through the session is thread-safe; the pools hand out one
+    connection per in-flight request and keep up to `pool_maxsize` idle connections per host.
+
+    Every encoding urllib3 can decode is advertised (gzip and deflate, plus brotli and
+    zstd when `brotli` or `zstandard` is installed), and response bodies are decompressed
+    chunk by chunk as they are read from the socket.
+
+    Connections record the DNS, connect, TLS, time-to-first-byte and body phases of each
+    request into the timings of the middleware chain sending it.
+
+    With a `hedge_policy`, GETs run on a small thread pool so a slow one can be hedged; the
+    losing request cannot be interrupted mid-flight, its response is closed when it arrives.
+    """
+    def __init__(self, pool_connections: int=DEFAULT_POOL_CONNECTIONS, pool_maxsize: int=DEFAULT_POOL_MAXSIZE, pool_block: bool=False, stats: TransportStats=None,
+                 hedge_policy: HedgePolicy=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.stats = stats or _transport_stats
+        self.hedge_policy = hedge_policy
+        self.session = self._create_session()
+        self._hedge_executor = None
+        self._hedge_executor_lock = threading.Lock()
+
+    def _create_session(self):
+        session = requests.Session()
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        session.cookies.set_policy(_BlockAllCookiesPolicy())
+        adapter = _TimedHTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, **request_payload):
+        if self.hedge_policy is None or request_payload.get('method', "GET").upper() != "GET":
+            return self._send(**request_payload)
+        return self._send_hedged(request_payload)
+
+    def _send(self, **request_payload):
+        if current_timings() is None:
+            response = self.session.request(**request_payload)
+        else:
+            # Stream the body so reading it is timed apart from waiting for the headers
+            response = self.session.request(stream=True, **request_payload)
+            started_at = time.perf_counter()
+            response.content
+            record_timing("body", time.perf_counter() - started_at)
+        body_bytes = len(response.content)
+        # urllib3 counts the raw bytes read from the socket, before decompression
+        wire_bytes = response.raw.tell() if hasattr(response.raw, 'tell') else body_bytes
+        self.stats.record(wire_bytes, body_bytes, response.headers.get('Content-Encoding'))
+        return response
+
+    def _send_timed(self, request_payload):
+        started_at = time.monotonic()
+        response = self._send(**request_payload)
+        self.hedge_policy.record_latency(request_payload.get('url'), time.monotonic() - started_at)
+        return response
+
+    def _get_hedge_executor(self):
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.pool_maxsize, thread_name_prefix="huma-sdk-hedge")
+            return self._hedge_executor
+
+    def _send_hedged(self, request_payload):
+        hedge_policy = self.hedge_policy
+        hedge_policy.record_request()
+        hedge_delay = hedge_policy.hedge_delay(request_payload.get('url'))
+        if hedge_delay is None:
+            return self._send_timed(request_payload)
+
+        executor = self._get_hedge_executor()
+        submit = lambda: executor.submit(contextvars.copy_context().run, self._send_timed, request_payload)
+        attempts = [submit()]
+        if not wait(attempts, timeout=hedge_delay).done and hedge_policy.try_acquire_hedge():
+            attempts.append(submit())
+
+        pending, request_error = set(attempts), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is not None:
+                    request_error = attempt.exception()
+                    continue
+                hedge_policy.record_winner(attempt is not attempts[0])
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return attempt.result()
+        raise request_error
+
+    def close(self):
+        self.session.close()
+        with self._hedge_executor_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        # Clients created before `configure_transport` still hold this transport: a later hedged GET starts a new executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _close_response(attempt):
+    if not attempt.cancelled() and attempt.exception() is None:
+        attempt.result().close()
+
+
+class _AsyncioTransport:
+    """
+    Pooled keep-alive HTTP transport for the asyncio service clients.
+
+    Requests go through an `httpx.AsyncClient`. Its connections belong to the event loop
+    that opened them, so one client is kept per running loop and shared by every
+    asyncio service client on that loop. httpx advertises and incrementally decodes the
+    same encodings as the sync transport. Connect, TLS, time-to-first-byte and body phases
+    are traced into the timings of the middleware chain sending a request. With a `hedge_policy`, the losing request of a
+    hedged GET is cancelled as soon as the other one returns.
+    """
+    def __init__(self, max_connections: int=DEFAULT_MAX_CONNECTIONS, max_keepalive_connections: int=DEFAULT_POOL_MAXSIZE, stats: TransportStats=None,
+                 hedge_policy: HedgePolicy=None):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.stats = stats or _transport_stats
+        self.hedge_policy = hedge_policy
+        self._clients = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+
+    def _create_client(self):
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections)
+        client = httpx.AsyncClient(limits=limits)
+        client.cookies.jar.set_policy(_BlockAllCookiesPolicy())
+        return client
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._clients[loop] = self._create_client()
+            return client
+
+    async def request(self, method, url, params=None, timeout=None, **request_payload):
+        # requests drops None query parameters while httpx would send them empty
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        # requests takes a (connect, read) tuple, httpx a Timeout object
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+
+        send = lambda: self._send(method, url, params=params, timeout=timeout, **request_payload)
+        if self.hedge_policy is None or method.upper() != "GET":
+            return await send()
+        return await self._send_hedged(url, send)
+
+    async def _send(self, method, url, **request_payload):
+        extensions = {"trace": _trace_phases} if current_timings() is not None else None
+        response = await self._get_client().request(method, url, extensions=extensions, **request_payload)
+        self.stats.record(response.num_bytes_downloaded, len(response.content), response.headers.get('Content-Encoding'))
+        return response
+
+    async def _send_timed(self, url, send):
+        started_at = time.monotonic()
+        response = await send()
+        self.hedge_policy.record_latency(url, time.monotonic() - started_at)
+        return response
+
+    async def _send_hedged(self, url, send):
+        hedge_policy = self.hedge_policy
+        hedge_policy.record_request()
+        hedge_delay = hedge_policy.hedge_delay(url)
+        if hedge_delay is None:
+            return await self._send_timed(url, send)
+
+        attempts = [asyncio.ensure_future(self._send_timed(url, send))]
+        pending, request_error = set(attempts), None
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+            if not done and hedge_policy.try_acquire_hedge():
+                attempts.append(asyncio.ensure_future(self._send_timed(url, send)))
+                pending.add(attempts[-1])
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is not None:
+                        request_error = attempt.exception()
+                        continue
+                    hedge_policy.record_winner(attempt is not attempts[0])
+                    return attempt.result()
+            raise request_error
+        finally:
+            # Cancel the loser, or both attempts when the caller itself was cancelled
+            for attempt in pending:
+                attempt.cancel()
+
+    async def aclose(self):
+        """Close the client of the running event loop."""
+        with self._clients_lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_shared_transport = None
+_shared_asyncio_transport = None
+_shared_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Return the process-wide transport, creating it on first use."""
+    global _shared_transport
+    if _shared_transport is None:
+        with _shared_transport_lock:
+            if _shared_transport is None:
+                _shared_transport = _Transport()
+    return _shared_transport
+
+
+def configure_transport(pool_connections: int=DEFAULT_POOL_CONNECTIONS, pool_maxsize: int=DEFAULT_POOL_MAXSIZE, pool_block: bool=False, hedge_policy: HedgePolicy=None):
+    """
+    Replace the process-wide transport used by clients created afterwards.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of idle keep-alive connections kept per host.
+        pool_block (bool): Block when every connection of a host pool is busy instead of opening extra ones.
+        hedge_policy (HedgePolicy): Hedge slow GETs with a second identical request. `None` disables hedging.
+
+    Returns:
+        _Transport: The new shared transport.
+    """
+    global _shared_transport
+    with _shared_transport_lock:
+        previous_transport = _shared_transport
+        _shared_transport = _Transport(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, hedge_policy=hedge_policy)
+
+    if previous_transport is not None:
+        previous_transport.close()
+    return _shared_transport
+
+
+def get_asyncio_transport():
+    """Return the process-wide asyncio transport, creating it on first use."""
+    global _shared_asyncio_transport
+    if _shared_asyncio_transport is None:
+        with _shared_transport_lock:
+            if _shared_asyncio_transport is None:
+                _shared_asyncio_transport = _AsyncioTransport()
+    return _shared_asyncio_transport
+
+
+def configure_asyncio_transport(max_connections: int=DEFAULT_MAX_CONNECTIONS, max_keepalive_connections: int=DEFAULT_POOL_MAXSIZE, hedge_policy: HedgePolicy=None):
+    """
+    Replace the process-wide asyncio transport used by asyncio clients created afterwards.
+
+    Args:
+        max_connections (int): Maximum number of concurrent connections per event loop.
+        max_keepalive_connections (int): Maximum number of idle keep-alive connections per event loop.
+        hedge_policy (HedgePolicy): Hedge slow GETs with a second identical request. `None` disables hedging.
+
+    Returns:
+        _AsyncioTransport: The new shared asyncio transport.
+    """
+    global _shared_asyncio_transport
+    with _shared_transport_lock:
+        _shared_asyncio_transport = _AsyncioTransport(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections, hedge_policy=hedge_policy)
+    return _shared_asyncio_transport
@@ -1,9 +1,137 @@
-import json
+import os, json, importlib
+
+
+class _JsonCodec:
+    """Standard library JSON codec, used when no faster backend is installed."""
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def dumps_pretty(self, obj):
+        return json.dumps(obj, indent=4, sort_keys=True)
+
+
+class _OrjsonCodec(_JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        self.orjson = importlib.import_module("orjson")
+
+    def loads(self, data):
+        return self.orjson.loads(data)
+
+    def dumps(self, obj):
+        return self.orjson.dumps(obj).decode('utf-8')
+
+    def dumps_pretty(self, obj):
+        # orjson only indents by two spaces
+        return self.orjson.dumps(obj, option=self.orjson.OPT_INDENT_2 | self.orjson.OPT_SORT_KEYS).decode('utf-8')
+
+
+class _MsgspecCodec(_JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        self.msgspec = importlib.import_module("msgspec")
+
+    def loads(self, data):
+        return self.msgspec.json.decode(data)
+
+    def dumps(self, obj):
+        return self.msgspec.json.encode(obj).decode('utf-8')
+
+
+class _UjsonCodec(_JsonCodec):
+    name = "ujson"
+
+    def __init__(self):
+        self.ujson = importlib.import_module("ujson")
+
+    def loads(self, data):
+        return self.ujson.loads(data)
+
+    def dumps(self, obj):
+        return self.ujson.dumps(obj)
+
+    def dumps_pretty(self, obj):
+        return self.ujson.dumps(obj, indent=4, sort_keys=True)
+
+
+# Fastest first; the first installed backend is used unless one is chosen explicitly
+_JSON_CODECS = {codec.name: codec for codec in (_OrjsonCodec, _MsgspecCodec, _UjsonCodec, _JsonCodec)}
+_stdlib_codec = _JsonCodec()
+_json_codec = None
+
+
+def _create_json_codec(backend=None):
+    if backend is not None:
+        if backend not in _JSON_CODECS:
+            raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {', '.join(_JSON_CODECS)}")
+        return _JSON_CODECS[backend]()
+
+    for codec in _JSON_CODECS.values():
+        try:
+            return codec()
+        except ImportError:
+            continue
+    return _stdlib_codec
+
+
+def set_json_backend(backend: str=None):
+    """
+    Choose the JSON library used to decode and encode API payloads.
+
+    Args:
+        backend (str): `orjson`, `msgspec`, `ujson` or `json`. `None` picks the fastest installed
+            backend, which is also the default unless the `HUMA_SDK_JSON_BACKEND` environment variable names one.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    global _json_codec
+    _json_codec = _create_json_codec(backend)
+    return _json_codec.name
+
+
+def get_json_codec():
+    if _json_codec is None:
+        set_json_backend(os.environ.get('HUMA_SDK_JSON_BACKEND') or None)
+    return _json_codec
+
+
+def json_loads(data):
+    """Decode JSON from str or bytes, falling back to the stdlib for input the fast backend rejects, such as NaN."""
+    codec = get_json_codec()
+    try:
+        return codec.loads(data)
+    except ValueError:
+        if codec.name == _stdlib_codec.name:
+            raise
+        return _stdlib_codec.loads(data)
+
+
+def json_dumps(obj, pretty: bool=False):
+    """Encode `obj` as a JSON str; `pretty` indents it and sorts the keys for display."""
+    codec = get_json_codec()
+    try:
+        return codec.dumps_pretty(obj) if pretty else codec.dumps(obj)
+    except TypeError:
+        # The fast backends reject some objects the stdlib accepts, such as non-string keys
+        if codec.name == _stdlib_codec.name:
+            raise
+        return _stdlib_codec.dumps_pretty(obj) if pretty else _stdlib_codec.dumps(obj)
 
 
 def parse_json_response(response_text):
     try:
-        response_data = json.loads(response_text)
+        response_data = json_loads(response_text)
         return response_data
-    except json.JSONDecodeError as e:
-        return response_text
\ No newline at end of file
+    except ValueError:
+        if isinstance(response_text, (bytes, bytearray)):
+            return response_text.decode('utf-8', errors='replace')
+        return response_text
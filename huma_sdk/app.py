@@ -1,12 +1,14 @@
 import huma_sdk
-import os, logging
-import json, threading
+import os, json, logging
+import threading
 import asyncio, timeit
 from pygments import highlight
 from dotenv import load_dotenv
 from pygments.lexers import JsonLexer
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from pygments.formatters import TerminalFormatter
+from huma_sdk._utils import json_dumps, json_loads
+from huma_sdk._helpers.metrics_helpers import MetricsRegistry, render_client_stats, CONTENT_TYPE
 
 load_dotenv()
 
@@ -20,6 +22,29 @@ PAGE, LIMIT = 1, 100
 MAX_PAGE_COUNT = 100
 IS_BATCH_PAGES = bool(MAX_PAGE_COUNT)
 
+metrics = MetricsRegistry()
+ROUTE_REQUESTS = metrics.counter("huma_webhook_requests_total", "Webhook server requests by route and status code.", ("route", "status"))
+ROUTE_LATENCY = metrics.histogram("huma_webhook_request_duration_seconds", "Webhook server request latency by route.", ("route",))
+BACKGROUND_JOBS_PENDING = metrics.gauge("huma_background_jobs_pending", "Background jobs started by a webhook and not finished yet.")
+BACKGROUND_JOB_DURATION = metrics.histogram("huma_background_job_duration_seconds", "Background job duration by module.", ("module",))
+BACKGROUND_JOB_FAILURES = metrics.counter("huma_background_job_failures_total", "Background jobs that failed to fetch or save their result, by module.", ("module",))
+
+# One client per service for the whole process, so their connections and stats() accumulate
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service_name):
+    with _clients_lock:
+        client = _clients.get(service_name)
+    if client is not None:
+        return client
+
+    # Created outside the lock: the access probe is a network call and must not stall /metrics
+    client = huma_sdk.session(service_name=service_name)
+    with _clients_lock:
+        return _clients.setdefault(service_name, client)
+
 
 async def background_task(response):
     module = response.get('module')
@@ -29,11 +54,25 @@ async def background_task(response):
             "question": async_fetch_answer,
             "subscription": subscribed_answer
         }
-        async_functions[module](payload)
+        started_at, succeeded = timeit.default_timer(), False
+        try:
+            succeeded = async_functions[module](payload)
+        finally:
+            BACKGROUND_JOB_DURATION.observe(timeit.default_timer() - started_at, module=module)
+            if not succeeded:
+                BACKGROUND_JOB_FAILURES.inc(module=module)
+
+
+def run_background_task(payload):
+    try:
+        asyncio.run(background_task(payload))
+    finally:
+        BACKGROUND_JOBS_PENDING.dec()
 
 
 def start_background_thread(payload):
-    background_thread = threading.Thread(target=lambda: asyncio.run(background_task(payload)))
+    BACKGROUND_JOBS_PENDING.inc()
+    background_thread = threading.Thread(target=run_background_task, args=(payload, ))
     background_thread.daemon = True
     background_thread.start()
 
@@ -41,11 +80,12 @@ def start_background_thread(payload):
 def save_result_to_json(data, filename):
     """Save the result to a JSON file."""
 
+    # The saved file is read by people and scripts: keep the stdlib key order and 4-space indent whatever the JSON backend
     os.makedirs("output", exist_ok=True)
     with open(f'output/{filename}.json', 'w') as f:
         json.dump(data, f, indent=4)
 
-    print(highlight(json.dumps(data, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+    print(highlight(json_dumps(data, pretty=True), JsonLexer(), TerminalFormatter()))
     print(f"Result saved to output/{filename}.json")
 
 
@@ -60,13 +100,13 @@ def async_fetch_answer(payload):
             print(f'Question with ticket number "{ticket_number}" failed to process.')
 
         elif question_status == 'succeeded':
-            questions_client = huma_sdk.session(service_name="Questions")
+            questions_client = get_client("Questions")
             print(f"Getting result of question with ticket number '{ticket_number}'")
             result_response = questions_client.fetch_answer(ticket_number=ticket_number, page=PAGE, \
                 limit=LIMIT, is_batch_pages=IS_BATCH_PAGES, max_page_count=MAX_PAGE_COUNT)
 
             if result_response.get('error_response'):
-                print(highlight(json.dumps(result_response, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+                print(highlight(json_dumps(result_response, pretty=True), JsonLexer(), TerminalFormatter()))
                 return False
 
             sanitized_question = ''.join(e for e in question if e.isalnum() or e.isspace()).replace(' ', '_')
@@ -91,13 +131,13 @@ def subscribed_answer(payload):
         if not subscribed_id:
             print(f'Subscribed Question with "{subscribed_id}" id Not Found.')
 
-        subscription_client = huma_sdk.session(service_name="Subscriptions")
+        subscription_client = get_client("Subscriptions")
         print(f"Getting result of subscribed question with ID '{subscribed_id}'")
         subscribed_visual = subscription_client.fetch_subscription_data(subscribed_id=subscribed_id, page=PAGE, \
                 limit=LIMIT, is_batch_pages=IS_BATCH_PAGES, max_page_count=MAX_PAGE_COUNT)
 
         if subscribed_visual.get('error_message'):
-            print(highlight(json.dumps(subscribed_visual, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+            print(highlight(json_dumps(subscribed_visual, pretty=True), JsonLexer(), TerminalFormatter()))
             return False
 
         save_result_to_json(subscribed_visual, f'{subscribed_id}_result')
@@ -109,6 +149,19 @@ def subscribed_answer(payload):
     return True
 
 
+@app.before_request
+def start_request_timer():
+    g.request_started_at = timeit.default_timer()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    ROUTE_REQUESTS.inc(route=route, status=response.status_code)
+    ROUTE_LATENCY.observe(timeit.default_timer() - g.request_started_at, route=route)
+    return response
+
+
 @app.route('/api/webhook-question-answered', methods=['POST'])
 def question_answered_hook():
     start_time = timeit.default_timer()
@@ -125,9 +178,10 @@ def question_answered_hook():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        logging.info(f"Webhook processed successfully with payload {request.json}\n")
-        payload = request.json
-        print(highlight(json.dumps(payload, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+        payload = json_loads(request.get_data())
+        serialized_payload = json_dumps(payload, pretty=True)
+        logging.info(f"Webhook processed successfully with payload {serialized_payload}\n")
+        print(highlight(serialized_payload, JsonLexer(), TerminalFormatter()))
         answer_payload = { "module": "question", "payload": payload }
 
         # Start the background task when the Flask app starts
@@ -164,13 +218,13 @@ def history_visualized_hook():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        logging.info(f"Webhook processed successfully with payload {request.json}\n")
-        histories_client = huma_sdk.session(service_name="Histories")
-        payload = request.json
+        payload = json_loads(request.get_data())
+        logging.info(f"Webhook processed successfully with payload {payload}\n")
+        histories_client = get_client("Histories")
         conversion_id = payload.get("conversion_id")
         history_visual = histories_client.fetch_history_visual_result(conversion_id)
         print(f'Copy the link from the result and paste in your favorite browser for downloading the visual file')
-        print(highlight(json.dumps(history_visual, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+        print(highlight(json_dumps(history_visual, pretty=True), JsonLexer(), TerminalFormatter()))
         end_time = timeit.default_timer()
         duration = end_time - start_time
         print(f"webhook-history-visualized took {duration:.2f} seconds.")
@@ -202,9 +256,10 @@ def subscription_updated_hook():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        logging.info(f"Webhook processed successfully with payload {request.json}\n")
-        payload = request.json
-        print(highlight(json.dumps(payload, indent=4, sort_keys=True), JsonLexer(), TerminalFormatter()))
+        payload = json_loads(request.get_data())
+        serialized_payload = json_dumps(payload, pretty=True)
+        logging.info(f"Webhook processed successfully with payload {serialized_payload}\n")
+        print(highlight(serialized_payload, JsonLexer(), TerminalFormatter()))
         subscription_payload = { "module": "subscription", "payload": payload }
 
         # Start the background task when the Flask app starts
@@ -230,6 +285,13 @@ def hello():
     return "hello!"
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    with _clients_lock:
+        client_stats = {service_name: client.stats() for service_name, client in _clients.items()}
+    return metrics.render() + render_client_stats(client_stats), 200, {'Content-Type': CONTENT_TYPE}
+
+
 if __name__ == '__main__':
     import uvicorn
     from asgiref.wsgi import WsgiToAsgi
@@ -16,4 +16,36 @@ class UnauthorizedException(Exception):
         msg = (
             f"Access to the '{service_name}' service is restricted due to {error_message}"
         )
-        super().__init__(msg)
\ No newline at end of file
+        super().__init__(msg)
+
+class PageFetchError(Exception):
+    """Raised when a page of a paginated result cannot be fetched."""
+    def __init__(self, page, error_message) -> None:
+        self.page = page
+        self.error_message = error_message
+        msg = (
+            f"Failed to fetch page {page} due to {error_message}"
+        )
+        super().__init__(msg)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a call cannot finish within its deadline."""
+    def __init__(self, method, url) -> None:
+        self.method = method
+        self.url = url
+        msg = (
+            f"Deadline exceeded before {method} {url} could complete"
+        )
+        super().__init__(msg)
+
+
+class CircuitOpenError(Exception):
+    """Raised without sending the request while the circuit breaker of an endpoint family is open."""
+    def __init__(self, endpoint_family, retry_after) -> None:
+        self.endpoint_family = endpoint_family
+        self.retry_after = retry_after
+        msg = (
+            f"Circuit breaker of the '{endpoint_family}' endpoints is open, retry in {retry_after:.1f} seconds"
+        )
+        super().__init__(msg)
@@ -21,6 +21,7 @@ setup(
     install_requires=[
         'flask[async]',
         'requests',
+        'httpx',
         'bson',
         'nose2==0.13.0',
         'nose2[coverage_plugin]',
@@ -31,6 +32,12 @@ setup(
         'pydantic',
         'websocket-client'
     ],
+    extras_require={
+        'orjson': ['orjson'],
+        'msgspec': ['msgspec'],
+        'ujson': ['ujson'],
+        'compression': ['brotli', 'zstandard'],
+    },
     license='Proprietary',
     keywords='',
     classifiers=[
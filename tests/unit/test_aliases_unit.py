@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch
 from huma_sdk._services._aliases import _Aliases
+from huma_sdk._helpers.cache_helpers import StaleWhileRevalidateCache
 
 
 class TestFetchAliasesUnitCase(unittest.TestCase):
@@ -29,6 +30,17 @@ class TestFetchAliasesUnitCase(unittest.TestCase):
         aliases_payload = client.fetch_aliases(**self.keyword_parameters)
         self.assert_result(aliases_payload, expected_response)
 
+    @patch.object(_Aliases, '_make_request')
+    def test_cached_aliases_are_keyed_by_search(self, mock_make_request):
+        mock_make_request.return_value = self.create_expected_response_payload()
+        client = _Aliases(response_cache=StaleWhileRevalidateCache(ttl=60, max_entries=1))
+        request_count = mock_make_request.call_count
+        client.fetch_aliases(search_by="rule_name", search_for="nsclc", use_cache=True)
+        client.fetch_aliases(search_by="rule_name", search_for="nsclc", use_cache=True)
+        client.fetch_aliases(search_by="rule_name", search_for="sclc", use_cache=True)
+        client.fetch_aliases(search_by="rule_name", search_for="nsclc", use_cache=True)
+        self.assertEqual(mock_make_request.call_count, request_count + 3)
+
     @patch.object(_Aliases, '_make_request')
     def test_fetch_aggregated_aliases_success(self, mock_make_request):
         expected_response = self.create_expected_response_payload()
@@ -0,0 +1,199 @@
+import httpx
+import asyncio
+import unittest
+from bson import ObjectId
+from unittest.mock import patch, AsyncMock
+from huma_sdk._session import _Session
+from huma_sdk._resources import _access_probe_cache
+from huma_sdk._transport import _AsyncioTransport
+from huma_sdk._asyncio_services._questions import _AsyncioQuestions
+from huma_sdk._asyncio_services._favorites import _AsyncioFavorites
+from huma_sdk._asyncio_services._threads import _AsyncioThreads
+from huma_sdk._asyncio_resources import AsyncioChatServiceV1
+from huma_sdk._helpers.coalesce_helpers import AsyncSingleFlight
+from huma_sdk._helpers.circuit_breaker_helpers import CircuitBreakerRegistry, OPEN, HALF_OPEN
+from huma_sdk._schema.events import QuestionAskedEvent, StreamEvent, MessageCompletedEvent
+
+
+def create_answer_page(page, page_count=3, limit=2):
+    return {
+        "answer": {"type": "table", "data": [{"row": ((page-1)*limit)+index} for index in range(limit)]},
+        "metadata": {"page": page, "page_count": page_count, "total_count": page_count*limit, "has_next_page": page < page_count}
+    }
+
+
+async def answer_side_effect(**request_payload):
+    page = (request_payload.get('params') or {}).get('page')
+    return create_answer_page(page) if page else {}
+
+
+class TestAsyncioQuestionsUnitCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        self.mock_ticket_number = str(ObjectId())
+
+    def test_session_maps_asyncio_mode(self):
+        client = _Session(service_name="Questions", mode="asyncio").create_connection(service_name="Questions", mode="asyncio")
+        self.assertIsInstance(client, _AsyncioQuestions)
+        self.assertIsInstance(client.transport, _AsyncioTransport)
+
+    @patch.object(_AsyncioQuestions, '_make_request', new_callable=AsyncMock)
+    async def test_submit_question_is_awaitable(self, mock_make_request):
+        expected_response = {"question_status": "accepted", "ticket_number": self.mock_ticket_number}
+        mock_make_request.return_value = expected_response
+        client = _AsyncioQuestions()
+        submission_payload = await client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(submission_payload, expected_response)
+
+    @patch.object(_AsyncioQuestions, '_make_request')
+    async def test_fetch_answer_batch_pages(self, mock_make_request):
+        mock_make_request.side_effect = answer_side_effect
+        client = _AsyncioQuestions()
+        answer_payload = await client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=3, max_workers=2)
+        self.assertEqual(answer_payload['answer']['data'], [{"row": index} for index in range(6)])
+
+    @patch.object(_AsyncioQuestions, '_make_request')
+    async def test_iter_answer_records(self, mock_make_request):
+        mock_make_request.side_effect = answer_side_effect
+        client = _AsyncioQuestions()
+        records = [record async for record in client.iter_answer_records(self.mock_ticket_number, limit=2)]
+        self.assertEqual(records, [{"row": index} for index in range(6)])
+
+    async def test_make_request_probes_once_through_transport(self):
+        transport = AsyncMock()
+        transport.request.return_value = httpx.Response(200, json={"favorites": []})
+        client = _AsyncioFavorites(service_name="Favorites", api_url="https://api.example.com", api_secret_key="secret", transport=transport)
+        self.assertEqual(transport.request.await_count, 0)
+
+        await client.fetch_favorites()
+        await client.fetch_favorites()
+        requested_urls = [call.kwargs['url'] for call in transport.request.await_args_list]
+        self.assertEqual(requested_urls.count("https://api.example.com/v1/sdk/access-permissions"), 1)
+        self.assertEqual(len(requested_urls), 3)
+
+    async def test_identical_gets_share_one_call(self):
+        async def slow_request(**request_payload):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"favorites": []})
+        transport = AsyncMock()
+        transport.request.side_effect = slow_request
+        client = _AsyncioFavorites(service_name="Favorites", api_url="https://api.example.com", api_secret_key="secret", transport=transport)
+        await client.verify_access()
+
+        results = await asyncio.gather(*(client.fetch_favorites() for _ in range(3)))
+        self.assertEqual(transport.request.await_count, 2)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    async def test_waiter_runs_the_call_when_the_leader_is_cancelled(self):
+        single_flight = AsyncSingleFlight()
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "status"
+
+        leader = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        self.assertEqual(await waiter, "status")
+        self.assertTrue(leader.cancelled())
+
+    async def test_transport_drops_none_params(self):
+        transport = _AsyncioTransport()
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock, return_value=httpx.Response(200, json={})) as mock_request:
+            await transport.request("GET", "https://api.example.com/v1/subscription", params={"order_by": None, "page": 1})
+        self.assertEqual(mock_request.await_args.kwargs['params'], {"page": 1})
+        await transport.aclose()
+
+    async def test_transport_converts_timeout_tuple(self):
+        transport = _AsyncioTransport()
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock, return_value=httpx.Response(200, json={})) as mock_request:
+            await transport.request("GET", "https://api.example.com/v1/subscription", timeout=(5, 30))
+        self.assertEqual(mock_request.await_args.kwargs['timeout'], httpx.Timeout(30, connect=5))
+        await transport.aclose()
+
+
+    async def test_cancelled_probe_releases_half_open_circuit(self):
+        transport = AsyncMock()
+        transport.request.return_value = httpx.Response(200, json={"status": "done"})
+        client = _AsyncioQuestions(api_url="https://api.example.com", transport=transport, circuit_breakers=CircuitBreakerRegistry())
+        client._access_verified = True
+        circuit_breaker = client.circuit_breakers.get("https://api.example.com/v1/questions/ticket/status")
+        circuit_breaker.state, circuit_breaker.opened_at = OPEN, 0
+
+        # Cancelled while sleeping for a rate-limit token
+        with patch.object(_AsyncioQuestions, '_reserve_rate_limit', return_value=10):
+            request_task = asyncio.ensure_future(client.check_question_status("ticket"))
+            await asyncio.sleep(0.01)
+            request_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await request_task
+        self.assertEqual(circuit_breaker.state, HALF_OPEN)
+
+        self.assertEqual(await client.check_question_status("ticket"), {"status": "done"})
+
+class TestAsyncioThreadsUnitCase(unittest.IsolatedAsyncioTestCase):
+
+    def create_client(self):
+        graphql_responses = {
+            "newChat": {"data": {"newChat": {"id": "chat"}}},
+            "sendMessage": {"data": {"sendMessage": {"messageId": "message"}}},
+            "processUtterance": {"data": {"processUtterance": True}},
+        }
+
+        async def send_graphql(method, url, content=None, **request_payload):
+            operation = next(name for name in graphql_responses if name in content)
+            return httpx.Response(200, json=graphql_responses[operation])
+
+        transport = AsyncMock()
+        transport.request.side_effect = send_graphql
+        return _AsyncioThreads(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", transport=transport)
+
+    def test_session_maps_asyncio_mode(self):
+        client = _Session(service_name="Threads", mode="asyncio").create_connection(service_name="Threads", mode="asyncio")
+        self.assertIsInstance(client.chat_service, AsyncioChatServiceV1)
+        self.assertIsInstance(client.chat_service.transport, _AsyncioTransport)
+
+    @patch.object(AsyncioChatServiceV1, 'unsubscribe')
+    @patch.object(AsyncioChatServiceV1, 'subscribe', return_value="subscription")
+    async def test_ask_question_streams_typed_events(self, mock_subscribe, mock_unsubscribe):
+        client = self.create_client()
+        event_stream = await client.submit_question(question="Top Sponsors in NSCLC")
+        callback = mock_subscribe.call_args.args[2]
+
+        question_event = await event_stream.__anext__()
+        self.assertIsInstance(question_event, QuestionAskedEvent)
+        self.assertEqual((question_event.thread_id, question_event.message_id), ("chat", "message"))
+
+        # Subscription events arrive on a realtime dispatcher thread
+        stream_message = {"contentType": "stream", "contentsubType": "stream", "messageId": "message"}
+        completion_message = {"contentType": "system", "contentsubType": "system", "messageId": "message", "content": '{"is_processed": true}'}
+        await asyncio.to_thread(callback, stream_message)
+        await asyncio.to_thread(callback, completion_message)
+
+        events = [event async for event in event_stream]
+        self.assertEqual([type(event) for event in events], [StreamEvent, MessageCompletedEvent])
+        self.assertEqual(events[1].result["final_status"], True)
+        mock_unsubscribe.assert_called_once_with("subscription")
+        self.assertEqual(client.stats()["endpoints"]["POST graphql newChat"]["latency"]["count"], 1)
+
+
+    async def test_visual_response_fetches_answer_pages_concurrently(self):
+        client = _AsyncioThreads(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", answer_max_workers=2)
+        requested_pages = []
+
+        async def fetch_answer_data(variables=None):
+            requested_pages.append(variables["page"])
+            return {"data": f'[{{"row": {variables["page"]}}}]', "hasNextPage": variables["page"] < 4}
+
+        message = {"contentType": "analyzer", "debug_and_status_state": "complete", "content": '{"utterance_id": "utterance"}'}
+        with patch.object(AsyncioChatServiceV1, 'fetch_answer_data', side_effect=fetch_answer_data):
+            message = await client.chat_service.prepare_message(message)
+
+        self.assertEqual(message["content"], [{"row": page} for page in range(1, 5)])
+        self.assertEqual(sorted(requested_pages), [1, 2, 3, 4, 5])
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
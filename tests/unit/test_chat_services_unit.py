@@ -0,0 +1,49 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch
+from huma_sdk._async_resources import ChatServiceV1, ChatServiceV2
+
+
+def create_answer_data_side_effect(page_count, has_next_page_key, requested_variables):
+    lock = threading.Lock()
+
+    def fetch_answer_data(variables=None):
+        with lock:
+            requested_variables.append(variables)
+        page = variables["page"]
+        return {"data": json.dumps([{"row": page}]), has_next_page_key: page < page_count}
+    return fetch_answer_data
+
+
+class TestChatServiceUnitCase(unittest.TestCase):
+
+    def test_v1_visual_response_fetches_fixed_size_pages_concurrently(self):
+        requested_variables = []
+        chat_service = ChatServiceV1(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", answer_max_workers=3)
+        message = {"content": '{"utterance_id": "utterance"}'}
+        side_effect = create_answer_data_side_effect(5, "hasNextPage", requested_variables)
+        with patch.object(ChatServiceV1, 'fetch_answer_data', side_effect=side_effect):
+            chat_service.manage_visual_response(message)
+
+        self.assertEqual(message["content"], [{"row": page} for page in range(1, 6)])
+        self.assertEqual({variables["limit"] for variables in requested_variables}, {100})
+        # Page 1, then windows of pages 2-4 and 5-7; pages past the last one are dropped
+        self.assertEqual(sorted(variables["page"] for variables in requested_variables), list(range(1, 8)))
+
+    def test_v2_visual_response_keeps_one_entry_per_page(self):
+        requested_variables = []
+        chat_service = ChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", answer_page_size=50, answer_max_workers=1)
+        visual = {"delta": '{"utterance_id": "utterance"}'}
+        message = {"event_metadata": {"event_data": {"sub_message_metadata": {"delta": visual}}}}
+        side_effect = create_answer_data_side_effect(3, "has_next_page", requested_variables)
+        with patch.object(ChatServiceV2, 'fetch_answer_data', side_effect=side_effect):
+            chat_service.manage_visual_response(message)
+
+        self.assertEqual(visual["delta"], [[{"row": 1}], [{"row": 2}], [{"row": 3}]])
+        self.assertEqual([(variables["page"], variables["limit"]) for variables in requested_variables], [(1, 50), (2, 50), (3, 50)])
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
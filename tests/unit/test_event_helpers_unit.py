@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from huma_sdk._helpers.event_helpers import EventHandler, ThreadEventManager
+from huma_sdk._helpers.questions_helper import QuestionQueue
+
+
+def create_completion_message(message_id):
+    return {"contentType": "system", "contentsubType": "system", "messageId": message_id, "content": '{"is_processed": true}'}
+
+
+class TestEventHandlerUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.sent_questions = []
+        self.questions_queue = QuestionQueue()
+
+    def send_message(self, question, **kwargs):
+        self.sent_questions.append(question)
+        return f"message-{len(self.sent_questions)}"
+
+    def create_event_manager(self, questions, event_handler=None, max_in_flight=1):
+        self.questions_queue.push_multiple(questions)
+        return ThreadEventManager(event_handler or EventHandler(), {}, "thread", self.questions_queue, self.send_message, max_in_flight=max_in_flight)
+
+    def test_until_done_submits_questions_as_answers_complete(self):
+        with self.create_event_manager(["first", "second"]) as event_handler:
+            def answer_questions():
+                for message_id in ("message-1", "message-2"):
+                    while message_id not in event_handler._result:
+                        time.sleep(0.005)
+                    event_handler._emit_subscription_event(create_completion_message(message_id), "v1")
+
+            answering_thread = threading.Thread(target=answer_questions)
+            answering_thread.start()
+            self.assertTrue(event_handler.until_done(timeout=2))
+            answering_thread.join()
+
+        self.assertEqual(self.sent_questions, ["first", "second"])
+        self.assertTrue(all(result.get('final_status') for result in event_handler._result.values()))
+        with self.assertWarns(DeprecationWarning):
+            self.assertTrue(event_handler.check_final_processing())
+
+    def test_until_done_times_out_while_waiting_for_an_answer(self):
+        with self.create_event_manager(["first", "second"]) as event_handler:
+            started_at = time.monotonic()
+            self.assertFalse(event_handler.until_done(timeout=0.05))
+            self.assertLess(time.monotonic() - started_at, 1)
+
+        # The second question waits for the first answer
+        self.assertEqual(self.sent_questions, ["first"])
+
+    def test_leaving_the_event_manager_wakes_waiters(self):
+        event_manager = self.create_event_manager(["first"])
+        event_handler = event_manager.__enter__()
+        event_handler.submit_question_from_queue()
+        threading.Timer(0.05, event_manager.__exit__, (None, None, None)).start()
+        self.assertTrue(event_handler.until_done(timeout=2))
+
+    def test_in_flight_window_keeps_completions_in_order(self):
+        completed_questions = []
+
+        class RecordingEventHandler(EventHandler):
+            def on_message_completion(self, message, full_result):
+                completed_questions.append(full_result["question"])
+
+        with self.create_event_manager(["first", "second", "third"], RecordingEventHandler(), max_in_flight=2) as event_handler:
+            self.assertFalse(event_handler.until_done(timeout=0.01))
+            self.assertEqual(self.sent_questions, ["first", "second"])
+
+            # The second answer finishes first: the third question is sent, its callback waits for the first
+            event_handler._emit_subscription_event(create_completion_message("message-2"), "v1")
+            self.assertFalse(event_handler.until_done(timeout=0.01))
+            self.assertEqual(self.sent_questions, ["first", "second", "third"])
+            self.assertEqual(completed_questions, [])
+
+            event_handler._emit_subscription_event(create_completion_message("message-1"), "v1")
+            self.assertEqual(completed_questions, ["first", "second"])
+            event_handler._emit_subscription_event(create_completion_message("message-3"), "v1")
+            self.assertTrue(event_handler.until_done(timeout=0.01))
+
+        self.assertEqual(completed_questions, ["first", "second", "third"])
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
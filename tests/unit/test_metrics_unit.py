@@ -0,0 +1,123 @@
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from huma_sdk import app as webhook_app
+from huma_sdk._helpers.metrics_helpers import MetricsRegistry, render_client_stats
+from huma_sdk._helpers.stats_helpers import ClientStats
+
+
+class TestMetricsRegistryUnitCase(unittest.TestCase):
+
+    def test_counter_and_gauge_are_rendered(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs.", ("module",))
+        gauge = registry.gauge("jobs_pending", "Pending jobs.")
+        counter.inc(module="question")
+        counter.inc(2, module="question")
+        gauge.inc()
+
+        rendered = registry.render()
+        self.assertIn("# TYPE jobs_total counter\n", rendered)
+        self.assertIn('jobs_total{module="question"} 3\n', rendered)
+        self.assertIn("jobs_pending 1\n", rendered)
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("duration_seconds", "Duration.", ("route",), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, route="/")
+
+        rendered = registry.render()
+        self.assertIn('duration_seconds_bucket{route="/",le="0.1"} 1\n', rendered)
+        self.assertIn('duration_seconds_bucket{route="/",le="1"} 2\n', rendered)
+        self.assertIn('duration_seconds_bucket{route="/",le="+Inf"} 3\n', rendered)
+        self.assertIn('duration_seconds_count{route="/"} 3\n', rendered)
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors.", ("error",)).inc(error='say "hi"\n')
+        self.assertIn('errors_total{error="say \\"hi\\"\\n"} 1', registry.render())
+
+    def test_client_stats_are_rendered(self):
+        stats = ClientStats()
+        stats.record("GET /v1/questions/{id}/status", 0.2, status_code=200, bytes_in=10)
+        stats.record("GET /v1/questions/{id}/status", 0.4, status_code=503, retry=True)
+
+        rendered = render_client_stats({"Questions": stats.snapshot()})
+        self.assertIn('huma_sdk_requests_total{service="Questions"} 2\n', rendered)
+        self.assertIn('huma_sdk_retries_total{service="Questions"} 1\n', rendered)
+        self.assertIn('huma_sdk_errors_total{service="Questions",error="503"} 1\n', rendered)
+        self.assertIn('huma_sdk_request_duration_seconds_count{service="Questions",endpoint="GET /v1/questions/{id}/status"} 2\n', rendered)
+        self.assertIn('quantile="0.99"', rendered)
+
+
+class TestWebhookMetricsUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = webhook_app.app.test_client()
+
+    def test_metrics_route_reports_requests_and_sdk_clients(self):
+        sdk_client = MagicMock()
+        sdk_client.stats.return_value = ClientStats().snapshot()
+        with patch.dict(webhook_app._clients, {"Questions": sdk_client}):
+            self.client.get("/")
+            response = self.client.get("/metrics")
+
+        body = response.get_data(as_text=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        self.assertIn('huma_webhook_requests_total{route="/",status="200"}', body)
+        self.assertIn('huma_webhook_request_duration_seconds_count{route="/"}', body)
+        self.assertIn('huma_sdk_requests_total{service="Questions"} 0', body)
+
+    def test_client_is_created_outside_the_clients_lock(self):
+        created_clients = []
+
+        def create_client(service_name):
+            # The access probe of a new client must not block /metrics and other lookups
+            self.assertTrue(webhook_app._clients_lock.acquire(blocking=False))
+            webhook_app._clients_lock.release()
+            created_clients.append(object())
+            return created_clients[-1]
+
+        with patch.dict(webhook_app._clients, clear=True), patch.object(webhook_app.huma_sdk, 'session', new=create_client):
+            client = webhook_app.get_client("Questions")
+            self.assertIs(webhook_app.get_client("Questions"), client)
+        self.assertEqual(created_clients, [client])
+
+    def test_saved_result_keeps_key_order_and_indent(self):
+        data = {"b": 1, "a": {"d": 2, "c": 3}}
+        with tempfile.TemporaryDirectory() as directory, patch('builtins.print'):
+            current_directory = os.getcwd()
+            os.chdir(directory)
+            try:
+                webhook_app.save_result_to_json(data, "result")
+                with open(os.path.join("output", "result.json")) as f:
+                    saved = f.read()
+            finally:
+                os.chdir(current_directory)
+
+        self.assertEqual(saved, json.dumps(data, indent=4))
+
+    def test_background_job_failures_are_counted(self):
+        failures = lambda: webhook_app.BACKGROUND_JOB_FAILURES._samples.get(("question",), 0)
+        failures_before = failures()
+        with patch.object(webhook_app, 'async_fetch_answer', return_value=False):
+            asyncio.run(webhook_app.background_task({"module": "question", "payload": {}}))
+        self.assertEqual(failures(), failures_before + 1)
+        self.assertIn('huma_background_job_duration_seconds_count{module="question"}', webhook_app.metrics.render())
+
+    def test_pending_jobs_are_released(self):
+        with patch.object(webhook_app, 'background_task', new=MagicMock(side_effect=RuntimeError("failed"))):
+            with self.assertRaises(RuntimeError):
+                webhook_app.BACKGROUND_JOBS_PENDING.inc()
+                webhook_app.run_background_task({})
+        self.assertEqual(webhook_app.BACKGROUND_JOBS_PENDING._samples[()], 0)
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
@@ -0,0 +1,190 @@
+import time
+import unittest
+from bson import ObjectId
+from unittest.mock import patch
+from huma_sdk._services._questions import _Questions
+from huma_sdk._services._favorites import _Favorites
+from huma_sdk._services._aliases import _Aliases
+from huma_sdk.exceptions import PageFetchError, DeadlineExceededError
+from huma_sdk._helpers.timeout_helpers import current_deadline
+
+
+def create_answer_page(page, page_count=5, limit=2):
+    return {
+        "answer": {"type": "table", "data": [{"row": ((page-1)*limit)+index} for index in range(limit)]},
+        "metadata": {"page": page, "page_count": page_count, "total_count": page_count*limit, "has_next_page": page < page_count}
+    }
+
+
+def create_favorites_page(page, page_count=5, limit=2):
+    return {
+        "favorites": [{"row": ((page-1)*limit)+index} for index in range(limit)],
+        "metadata": {"page": page, "page_count": page_count, "total_count": page_count*limit, "has_next_page": page < page_count}
+    }
+
+
+class TestConcurrentPaginationUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_ticket_number = str(ObjectId())
+        self.expected_rows = [{"row": index} for index in range(10)]
+
+    def answer_side_effect(self, failed_pages=()):
+        def make_request(**request_payload):
+            params = request_payload.get('params') or {}
+            page = params.get('page')
+            if page is None:
+                return {}
+            # Later pages answer first so ordered reassembly is exercised
+            time.sleep(0.01 * (6 - page))
+            if page in failed_pages:
+                return {"error_message": "Request timed out"}
+            return create_answer_page(page)
+        return make_request
+
+    @patch.object(_Questions, '_make_request')
+    def test_concurrent_pages_are_reassembled_in_order(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect()
+        client = _Questions()
+        answer_payload = client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, max_workers=4)
+        self.assertEqual(answer_payload['answer']['data'], self.expected_rows)
+        self.assertNotIn('failed_pages', answer_payload)
+
+    @patch.object(_Questions, '_make_request')
+    def test_serial_and_concurrent_results_match(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect()
+        client = _Questions()
+        serial_payload = client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5)
+        concurrent_payload = client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, max_workers=3)
+        self.assertEqual(serial_payload, concurrent_payload)
+
+    @patch.object(_Questions, '_make_request')
+    def test_failed_pages_are_reported(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect(failed_pages=(3,))
+        client = _Questions()
+        answer_payload = client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, max_workers=4)
+        self.assertEqual(answer_payload['failed_pages'], [{"page": 3, "error_message": "Request timed out"}])
+        self.assertEqual(answer_payload['answer']['data'], [row for row in self.expected_rows if row['row'] not in (4, 5)])
+
+    @patch.object(_Favorites, '_make_request')
+    def test_concurrent_record_pages(self, mock_make_request):
+        mock_make_request.side_effect = lambda **request_payload: create_favorites_page((request_payload.get('params') or {}).get('page', 1))
+        client = _Favorites()
+        favorites_payload = client.fetch_favorites(limit=2, is_batch_pages=True, max_page_count=5, max_workers=4)
+        self.assertEqual(favorites_payload['favorites'], self.expected_rows)
+
+    @patch.object(_Questions, '_make_request')
+    def test_deadline_reaches_worker_threads(self, mock_make_request):
+        deadlines = []
+        def make_request(**request_payload):
+            deadlines.append(current_deadline())
+            return create_answer_page((request_payload.get('params') or {}).get('page', 1))
+        mock_make_request.side_effect = make_request
+        client = _Questions()
+        client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, max_workers=4, deadline=30)
+        self.assertEqual(len(deadlines), 5)
+        self.assertEqual(len(set(deadlines)), 1)
+        self.assertEqual(deadlines[0].seconds, 30)
+        self.assertIsNone(current_deadline())
+
+    @patch.object(_Questions, '_make_request')
+    def test_spent_deadline_aborts_batch(self, mock_make_request):
+        def make_request(**request_payload):
+            page = (request_payload.get('params') or {}).get('page', 1)
+            if page > 1:
+                raise DeadlineExceededError("GET", "https://api.example.com")
+            return create_answer_page(page)
+        mock_make_request.side_effect = make_request
+        client = _Questions()
+        with self.assertRaises(DeadlineExceededError):
+            client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, max_workers=4, deadline=30)
+
+    @patch.object(_Aliases, '_make_request')
+    def test_batch_without_limit_uses_the_api_page_size(self, mock_make_request):
+        requests = []
+        def make_request(**request_payload):
+            params = request_payload.get('params') or {}
+            requests.append((params.get('page'), params.get('limit')))
+            page = params.get('page')
+            return {
+                "aliases": [{"row": ((page-1)*3)+index} for index in range(3)],
+                "metadata": {"page": page, "page_count": 3, "total_count": 9, "has_next_page": page < 3}
+            }
+        mock_make_request.side_effect = make_request
+        client = _Aliases()
+        aliases = client.fetch_aliases(is_batch_pages=True, max_workers=2)
+        self.assertEqual(aliases['aliases'], [{"row": index} for index in range(9)])
+        self.assertEqual(sorted(requests), [(1, None), (2, 3), (3, 3)])
+
+    @patch.object(_Questions, '_make_request')
+    def test_pages_are_not_started_after_the_deadline(self, mock_make_request):
+        requested_pages = []
+        def make_request(**request_payload):
+            page = (request_payload.get('params') or {}).get('page', 1)
+            requested_pages.append(page)
+            # A slow response that still arrives within its read timeout
+            time.sleep(0.06)
+            return create_answer_page(page)
+        mock_make_request.side_effect = make_request
+        client = _Questions()
+        with self.assertRaises(DeadlineExceededError):
+            client.fetch_answer(self.mock_ticket_number, limit=2, is_batch_pages=True, max_page_count=5, deadline=0.1)
+        self.assertEqual(requested_pages, [1, 2])
+
+
+class TestStreamingIteratorsUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_ticket_number = str(ObjectId())
+
+    def answer_side_effect(self, failed_pages=()):
+        def make_request(**request_payload):
+            page = (request_payload.get('params') or {}).get('page')
+            if page is None:
+                return {}
+            if page in failed_pages:
+                return {"error_message": "Request timed out"}
+            return create_answer_page(page)
+        return make_request
+
+    @patch.object(_Questions, '_make_request')
+    def test_iter_answer_records_fetches_lazily(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect()
+        client = _Questions()
+        mock_make_request.reset_mock()
+
+        records = client.iter_answer_records(self.mock_ticket_number, limit=2)
+        self.assertEqual(mock_make_request.call_count, 0)
+        self.assertEqual(next(records), {"row": 0})
+        self.assertEqual(mock_make_request.call_count, 1)
+        self.assertEqual([record['row'] for record in records], list(range(1, 10)))
+        self.assertEqual(mock_make_request.call_count, 5)
+
+    @patch.object(_Questions, '_make_request')
+    def test_iter_answer_pages_honours_max_page_count(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect()
+        client = _Questions()
+        pages = list(client.iter_answer_pages(self.mock_ticket_number, page=2, limit=2, max_page_count=2))
+        self.assertEqual([page_response['metadata']['page'] for page_response in pages], [2, 3])
+
+    @patch.object(_Questions, '_make_request')
+    def test_iter_answer_pages_raises_on_failed_page(self, mock_make_request):
+        mock_make_request.side_effect = self.answer_side_effect(failed_pages=(2,))
+        client = _Questions()
+        pages = client.iter_answer_pages(self.mock_ticket_number, limit=2)
+        next(pages)
+        with self.assertRaises(PageFetchError) as context:
+            next(pages)
+        self.assertEqual(context.exception.page, 2)
+
+    @patch.object(_Favorites, '_make_request')
+    def test_iter_favorites_records(self, mock_make_request):
+        mock_make_request.side_effect = lambda **request_payload: create_favorites_page((request_payload.get('params') or {}).get('page', 1))
+        client = _Favorites()
+        records = list(client.iter_favorites_records(limit=2))
+        self.assertEqual(records, [{"row": index} for index in range(10)])
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
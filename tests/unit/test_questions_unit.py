@@ -32,6 +32,14 @@ class TestSubmitQuestionUnitCase(unittest.TestCase):
         submission_payload = client.submit_question(**self.payload)
         self.assert_result(submission_payload, expected_response)
 
+    @patch.object(_Questions, '_make_request')
+    def test_submit_questions_keeps_order(self, mock_make_request):
+        mock_make_request.side_effect = lambda **request_payload: {"question": request_payload['json']['question'], "question_status": "accepted"}
+        client = _Questions()
+        questions = [f"Top Sponsors in NSCLC {index}" for index in range(10)]
+        submission_payloads = client.submit_questions(questions, commands=self.payload["commands"], max_workers=4)
+        self.assertEqual([payload["question"] for payload in submission_payloads], questions)
+
 
 class TestCheckQuestionStatusUnitCase(unittest.TestCase):
 
@@ -1,7 +1,9 @@
+import threading
 import unittest
 from bson import ObjectId
 from unittest.mock import patch
 from huma_sdk._services._quicklinks import _Quicklinks
+from huma_sdk._helpers.cache_helpers import StaleWhileRevalidateCache
 
 
 class TestFetchQuicklinksUnitCase(unittest.TestCase):
@@ -26,6 +28,72 @@ class TestFetchQuicklinksUnitCase(unittest.TestCase):
         self.assert_result(quicklinks_payload, expected_response)
 
 
+    @patch.object(_Quicklinks, '_make_request')
+    def test_fetch_quicklinks_from_cache(self, mock_make_request):
+        expected_response = self.create_expected_response_payload()
+        mock_make_request.return_value = expected_response
+        client = _Quicklinks(response_cache=StaleWhileRevalidateCache(ttl=60))
+        request_count = mock_make_request.call_count
+        client.fetch_quicklinks(use_cache=True)
+        quicklinks_payload = client.fetch_quicklinks(use_cache=True)
+        self.assert_result(quicklinks_payload, expected_response)
+        self.assertEqual(mock_make_request.call_count, request_count + 1)
+
+    @patch.object(_Quicklinks, '_make_request')
+    def test_stale_quicklinks_are_refreshed_in_background(self, mock_make_request):
+        stale_response, fresh_response = self.create_expected_response_payload(), {"categories": []}
+        refreshed = threading.Event()
+        def make_request(**request_payload):
+            if refreshed.is_set():
+                return fresh_response
+            return stale_response
+        mock_make_request.side_effect = make_request
+        client = _Quicklinks(response_cache=StaleWhileRevalidateCache(ttl=0))
+        client.fetch_quicklinks(use_cache=True)
+
+        refreshed.set()
+        with patch.object(client, '_refresh_cached', wraps=client._refresh_cached) as mock_refresh:
+            self.assert_result(client.fetch_quicklinks(use_cache=True), stale_response)
+            for thread in threading.enumerate():
+                if thread is not threading.current_thread() and thread.daemon:
+                    thread.join(timeout=1)
+        self.assertEqual(mock_refresh.call_count, 1)
+        self.assertIs(client.response_cache.lookup(client._response_cache_key("quicklinks"))[1], fresh_response)
+
+    @patch.object(_Quicklinks, '_make_request')
+    def test_invalidate_quicklinks_cache(self, mock_make_request):
+        mock_make_request.return_value = self.create_expected_response_payload()
+        client = _Quicklinks(response_cache=StaleWhileRevalidateCache(ttl=60))
+        client.fetch_quicklinks(use_cache=True)
+        client.invalidate_quicklinks_cache()
+        request_count = mock_make_request.call_count
+        client.fetch_quicklinks(use_cache=True)
+        self.assertEqual(mock_make_request.call_count, request_count + 1)
+
+    @patch.object(_Quicklinks, '_make_request')
+    def test_partial_batch_result_is_not_cached(self, mock_make_request):
+        mock_make_request.return_value = {"categories": [], "failed_pages": [{"page": 2, "error_message": "timeout"}]}
+        client = _Quicklinks(response_cache=StaleWhileRevalidateCache(ttl=60))
+        client.fetch_quicklinks(use_cache=True)
+        self.assertFalse(client.response_cache.lookup(client._response_cache_key("quicklinks"))[0])
+
+    @patch.object(_Quicklinks, '_make_request')
+    def test_refresh_does_not_overwrite_an_invalidation(self, mock_make_request):
+        client = _Quicklinks(response_cache=StaleWhileRevalidateCache(ttl=0))
+        mock_make_request.return_value = self.create_expected_response_payload()
+        client.fetch_quicklinks(use_cache=True)
+
+        def make_request(**request_payload):
+            # The cache is invalidated while the refresh is in flight
+            client.invalidate_quicklinks_cache()
+            return {"categories": []}
+        mock_make_request.side_effect = make_request
+        cache_key = client._response_cache_key("quicklinks")
+        client.response_cache.lookup(cache_key)
+        client._refresh_cached(cache_key, client._fetch_quicklinks)
+        self.assertFalse(client.response_cache.lookup(cache_key)[0])
+
+
 if __name__ == '__main__':
     import nose2
     nose2.discover()
@@ -0,0 +1,190 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from huma_sdk._helpers import realtime_helpers
+from huma_sdk._helpers.async_helpers import SubscriptionClient
+from huma_sdk._helpers.realtime_helpers import RealtimeConnection, SerialDispatcher, get_realtime_connection
+
+
+class _FakeWebSocketApp:
+    """Records sent messages and blocks in `run_forever` until closed, like a live socket."""
+    instances = []
+
+    def __init__(self, url, subprotocols=None, on_open=None, on_message=None, on_error=None, on_close=None):
+        self.url = url
+        self.on_open = on_open
+        self.on_message = on_message
+        self.sent = []
+        self._closed = threading.Event()
+        self._opened = threading.Event()
+        _FakeWebSocketApp.instances.append(self)
+
+    def run_forever(self):
+        self.on_open(self)
+        self._opened.set()
+        self._closed.wait()
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def close(self):
+        self._closed.set()
+
+    def receive(self, message):
+        self.on_message(self, json.dumps(message))
+
+    def messages(self, message_type):
+        return [message for message in self.sent if message["type"] == message_type]
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met")
+        time.sleep(0.005)
+
+
+class TestRealtimeConnectionUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _FakeWebSocketApp.instances = []
+        patcher = patch('websocket.WebSocketApp', _FakeWebSocketApp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection = RealtimeConnection("wss://api.example.com/graphql/realtime", {"host": "api.example.com", "authorization": "secret"})
+        self.addCleanup(self.connection.close)
+
+    def open_socket(self):
+        wait_for(lambda: _FakeWebSocketApp.instances)
+        ws = _FakeWebSocketApp.instances[-1]
+        ws._opened.wait(2)
+        ws.receive({"type": "connection_ack"})
+        return ws
+
+    def test_subscriptions_share_one_socket(self):
+        first_id = self.connection.subscribe('{"query": "a"}', lambda data: None, "eventReceiver")
+        ws = self.open_socket()
+        second_id = self.connection.subscribe('{"query": "b"}', lambda data: None, "eventReceiver")
+
+        self.assertEqual(len(_FakeWebSocketApp.instances), 1)
+        self.assertEqual(ws.messages("connection_init")[0]["payload"]["connectionTimeoutMs"], 300000000)
+        started = {message["id"]: message["payload"]["data"] for message in ws.messages("start")}
+        self.assertEqual(started, {first_id: '{"query": "a"}', second_id: '{"query": "b"}'})
+        self.assertNotEqual(first_id, second_id)
+
+    def test_events_are_routed_by_subscription_id(self):
+        received = {"first": [], "second": []}
+        first_id = self.connection.subscribe("{}", received["first"].append, "eventReceiver")
+        second_id = self.connection.subscribe("{}", received["second"].append, "eventReceiver")
+        ws = self.open_socket()
+
+        ws.receive({"type": "data", "id": second_id, "payload": {"data": {"eventReceiver": {"n": 1}}}})
+        ws.receive({"type": "data", "id": first_id, "payload": {"data": {"eventReceiver": {"n": 2}}}})
+        wait_for(lambda: received["first"] and received["second"])
+        self.assertEqual(received, {"first": [{"n": 2}], "second": [{"n": 1}]})
+
+    def test_callback_returning_true_stops_the_subscription(self):
+        subscription_id = self.connection.subscribe("{}", lambda data: data["done"], "eventReceiver")
+        ws = self.open_socket()
+
+        ws.receive({"type": "data", "id": subscription_id, "payload": {"data": {"eventReceiver": {"done": True}}}})
+        wait_for(lambda: ws.messages("stop"))
+        self.assertEqual(ws.messages("stop"), [{"id": subscription_id, "type": "stop"}])
+        self.assertEqual(self.connection.subscription_count, 0)
+
+    def test_subscriptions_are_restarted_after_reconnect(self):
+        self.connection.reconnect_delay = 0
+        subscription_id = self.connection.subscribe("{}", lambda data: None, "eventReceiver")
+        ws = self.open_socket()
+        ws.close()
+
+        wait_for(lambda: len(_FakeWebSocketApp.instances) == 2)
+        new_ws = self.open_socket()
+        self.assertEqual([message["id"] for message in new_ws.messages("start")], [subscription_id])
+
+    def test_socket_is_closed_after_the_last_unsubscribe(self):
+        first_id = self.connection.subscribe("{}", lambda data: None, "eventReceiver")
+        second_id = self.connection.subscribe("{}", lambda data: None, "eventReceiver")
+        ws = self.open_socket()
+
+        self.connection.unsubscribe(first_id)
+        self.assertFalse(ws._closed.is_set())
+        self.connection.unsubscribe(second_id)
+        self.assertTrue(ws._closed.is_set())
+        wait_for(lambda: self.connection._thread is None)
+        self.assertEqual(len(_FakeWebSocketApp.instances), 1)
+
+    def test_idle_connection_leaves_the_registry(self):
+        url = "wss://api.example.com/graphql/realtime?idle"
+        self.addCleanup(realtime_helpers._realtime_connections.pop, url, None)
+        connection = get_realtime_connection(url, {})
+        subscription_id = connection.subscribe("{}", lambda data: None, "eventReceiver")
+        self.assertIs(get_realtime_connection(url, {}), connection)
+
+        self.open_socket()
+        connection.unsubscribe(subscription_id)
+        self.assertIsNot(get_realtime_connection(url, {}), connection)
+
+    def test_deprecated_subscription_thread_runs_on_the_shared_connection(self):
+        client = SubscriptionClient(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql")
+        received = []
+        def callback(data):
+            received.append(data)
+            return data["done"]
+
+        with self.assertWarns(DeprecationWarning):
+            subscription_thread = threading.Thread(target=client.subscription_thread, args=("subscription {}", {}, callback, "eventReceiver"))
+            subscription_thread.start()
+            wait_for(lambda: _FakeWebSocketApp.instances)
+            ws = self.open_socket()
+            wait_for(lambda: ws.messages("start"))
+            subscription_id = ws.messages("start")[0]["id"]
+            ws.receive({"type": "data", "id": subscription_id, "payload": {"data": {"eventReceiver": {"done": True}}}})
+            subscription_thread.join(2)
+
+        self.assertFalse(subscription_thread.is_alive())
+        self.assertEqual(received, [{"done": True}])
+        self.assertTrue(ws._closed.is_set())
+
+
+class TestSerialDispatcherUnitCase(unittest.TestCase):
+
+    def test_callbacks_keep_order_per_key(self):
+        dispatcher = SerialDispatcher(max_workers=4)
+        received, done = {"slow": [], "fast": []}, threading.Event()
+
+        def handle(key, value):
+            if key == "slow":
+                time.sleep(0.01)
+            received[key].append(value)
+            if len(received["slow"]) == 5:
+                done.set()
+
+        for value in range(5):
+            dispatcher.submit("slow", handle, "slow", value)
+            dispatcher.submit("fast", handle, "fast", value)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(received, {"slow": [0, 1, 2, 3, 4], "fast": [0, 1, 2, 3, 4]})
+
+    def test_slow_keys_do_not_block_other_keys_when_workers_are_busy(self):
+        dispatcher = SerialDispatcher(max_workers=2)
+        release, delivered = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+
+        for key in ("slow-1", "slow-2", "slow-3"):
+            dispatcher.submit(key, release.wait, 2)
+        dispatcher.submit("fast", delivered.set)
+
+        self.assertTrue(delivered.wait(0.5))
+        release.set()
+        wait_for(lambda: not dispatcher._queues)
+        self.assertEqual(dispatcher._pooled, 0)
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
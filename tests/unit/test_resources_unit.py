@@ -0,0 +1,734 @@
+import requests
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from huma_sdk._session import _Session
+from huma_sdk._resources import _Services, _access_probe_cache
+from huma_sdk._services._questions import _Questions
+from huma_sdk._services._histories import _Histories
+from huma_sdk._services._quicklinks import _Quicklinks
+from huma_sdk._helpers.cache_helpers import HTTPCache
+from huma_sdk._helpers.rate_limit_helpers import RateLimiter, TokenBucket, endpoint_group
+from huma_sdk._helpers.concurrency_helpers import AdaptiveConcurrencyLimiter, concurrency_scope
+from huma_sdk._helpers.circuit_breaker_helpers import CircuitBreaker, CircuitBreakerRegistry, OPEN, HALF_OPEN, CLOSED
+from huma_sdk.exceptions import CircuitOpenError
+from huma_sdk._helpers.retry_helpers import RetryPolicy, RetryBudget
+from huma_sdk._helpers.timeout_helpers import DEFAULT_TIMEOUT, deadline_scope
+from huma_sdk.exceptions import DeadlineExceededError
+from huma_sdk._helpers.coalesce_helpers import SingleFlight, request_group
+from huma_sdk._helpers.middleware_helpers import Middleware, configure_middleware
+from huma_sdk._async_resources import ChatServiceV2
+from huma_sdk._helpers.stats_helpers import LatencyHistogram, endpoint_template
+
+
+class TestAccessProbeUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        self.client_parameters = dict(service_name="Questions", api_url="https://api.example.com", api_secret_key="secret")
+
+    def tearDown(self):
+        _access_probe_cache.invalidate()
+
+    def create_expected_response_payload(self):
+        return {"service": "Questions", "access": True}
+
+    @patch.object(_Services, 'test_connection')
+    def test_probe_result_is_cached(self, mock_test_connection):
+        mock_test_connection.return_value = self.create_expected_response_payload()
+        _Questions(**self.client_parameters)
+        _Questions(**self.client_parameters)
+        self.assertEqual(mock_test_connection.call_count, 1)
+
+    @patch.object(_Services, 'test_connection')
+    def test_failed_probe_is_not_cached(self, mock_test_connection):
+        mock_test_connection.return_value = {"error_message": "ConnectionError"}
+        _Questions(**self.client_parameters)
+        _Questions(**self.client_parameters)
+        self.assertEqual(mock_test_connection.call_count, 2)
+
+    @patch.object(_Services, 'test_connection')
+    def test_probe_cache_is_keyed_by_credentials(self, mock_test_connection):
+        mock_test_connection.return_value = self.create_expected_response_payload()
+        _Questions(**self.client_parameters)
+        _Questions(**dict(self.client_parameters, api_secret_key="another-secret"))
+        self.assertEqual(mock_test_connection.call_count, 2)
+
+    @patch.object(_Services, 'test_connection')
+    def test_probe_ttl_zero_disables_cache(self, mock_test_connection):
+        mock_test_connection.return_value = self.create_expected_response_payload()
+        _Questions(probe_ttl=0, **self.client_parameters)
+        _Questions(probe_ttl=0, **self.client_parameters)
+        self.assertEqual(mock_test_connection.call_count, 2)
+
+    @patch.object(_Services, 'test_connection')
+    def test_lazy_probe_runs_on_first_request(self, mock_test_connection):
+        mock_test_connection.return_value = self.create_expected_response_payload()
+        client = _Questions(lazy_probe=True, **self.client_parameters)
+        self.assertEqual(mock_test_connection.call_count, 0)
+
+        with patch.object(client.transport, 'request') as mock_request:
+            mock_request.return_value.status_code = 200
+            mock_request.return_value.content = b'{"question_status": "accepted"}'
+            client.check_question_status("ticket")
+            client.check_question_status("ticket")
+
+        self.assertEqual(mock_test_connection.call_count, 1)
+
+    @patch.object(_Services, 'test_connection')
+    def test_prewarm_probes_every_service(self, mock_test_connection):
+        mock_test_connection.return_value = self.create_expected_response_payload()
+        service_names = ["Questions", "Histories"]
+        probes = _Session.prewarm(service_names, api_url="https://api.example.com", api_secret_key="secret")
+        self.assertEqual(set(probes), set(service_names))
+        self.assertEqual(mock_test_connection.call_count, 2)
+
+        _Histories(service_name="Histories", api_url="https://api.example.com", api_secret_key="secret")
+        self.assertEqual(mock_test_connection.call_count, 2)
+
+    def test_rest_service_names(self):
+        service_names = _Session.rest_service_names()
+        self.assertIn("Questions", service_names)
+        self.assertNotIn("Webhooks", service_names)
+
+
+def create_mock_response(status_code=200, text='{"question_status": "accepted"}', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = text.encode("utf-8")
+    response.headers = headers or {}
+    return response
+
+
+@patch('huma_sdk._resources.time.sleep')
+class TestRetryPolicyUnitCase(unittest.TestCase):
+
+    def create_client(self, responses, **kwargs):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        retry_policy = kwargs.pop('retry_policy', None) or RetryPolicy(budget=RetryBudget())
+        return _Questions(transport=transport, lazy_probe=True, retry_policy=retry_policy, circuit_breakers=CircuitBreakerRegistry(), **kwargs), transport
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_is_retried_on_server_error(self, mock_sleep):
+        client, transport = self.create_client([create_mock_response(503, '{"error_message": "unavailable"}'), create_mock_response()])
+        question_status = client.check_question_status("ticket")
+        self.assertEqual(question_status, {"question_status": "accepted"})
+        self.assertEqual(transport.request.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_post_is_not_retried_on_server_error(self, mock_sleep):
+        client, transport = self.create_client([create_mock_response(503, '{"error_message": "unavailable"}'), create_mock_response()])
+        submission_status = client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(submission_status, {"error_message": "unavailable"})
+        self.assertEqual(transport.request.call_count, 1)
+
+    def test_post_is_retried_on_rate_limit_with_retry_after(self, mock_sleep):
+        client, transport = self.create_client([create_mock_response(429, '{"error_message": "slow down"}', {"Retry-After": "2"}), create_mock_response()])
+        client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(transport.request.call_count, 2)
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_attempts_are_capped(self, mock_sleep):
+        client, transport = self.create_client([create_mock_response(502, '{"error_message": "bad gateway"}')] * 5, retry_policy=RetryPolicy(max_attempts=3, budget=RetryBudget()))
+        question_status = client.check_question_status("ticket")
+        self.assertEqual(question_status, {"error_message": "bad gateway"})
+        self.assertEqual(transport.request.call_count, 3)
+
+    def test_connect_timeout_is_retried_for_post(self, mock_sleep):
+        client, transport = self.create_client([requests.ConnectTimeout("connect timed out"), create_mock_response()])
+        submission_status = client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(submission_status, {"question_status": "accepted"})
+
+    def test_read_timeout_is_not_retried_for_post(self, mock_sleep):
+        client, transport = self.create_client([requests.ReadTimeout("read timed out"), create_mock_response()])
+        submission_status = client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(submission_status, {"error_message": "Request timed out"})
+        self.assertEqual(transport.request.call_count, 1)
+
+    def test_exhausted_budget_stops_retries(self, mock_sleep):
+        retry_policy = RetryPolicy(budget=RetryBudget(ratio=0, min_retries_per_second=0))
+        client, transport = self.create_client([create_mock_response(503, '{"error_message": "unavailable"}'), create_mock_response()], retry_policy=retry_policy)
+        client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_count, 1)
+
+    def test_retry_after_http_date(self, mock_sleep):
+        retry_policy = RetryPolicy()
+        self.assertEqual(retry_policy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(retry_policy.parse_retry_after("soon"))
+
+
+class TestTimeoutUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_client(self, responses, **kwargs):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        return _Questions(transport=transport, lazy_probe=True, retry_policy=RetryPolicy(budget=RetryBudget()), **kwargs), transport
+
+    def test_default_timeout_is_sent(self):
+        client, transport = self.create_client([create_mock_response()])
+        client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_args.kwargs['timeout'], DEFAULT_TIMEOUT)
+
+    def test_timeout_is_clamped_to_deadline(self):
+        client, transport = self.create_client([create_mock_response()], timeout=(10, 60))
+        with deadline_scope(2):
+            client.check_question_status("ticket")
+        connect_timeout, read_timeout = transport.request.call_args.kwargs['timeout']
+        self.assertLessEqual(connect_timeout, 2)
+        self.assertLessEqual(read_timeout, 2)
+
+    def test_nested_scope_keeps_tighter_deadline(self):
+        with deadline_scope(1) as outer_deadline:
+            with deadline_scope(100) as inner_deadline:
+                self.assertIs(inner_deadline, outer_deadline)
+
+    def test_expired_deadline_raises(self):
+        client, transport = self.create_client([create_mock_response()])
+        with deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_count, 0)
+
+    @patch('huma_sdk._resources.time.sleep')
+    def test_retry_is_skipped_when_backoff_outlasts_deadline(self, mock_sleep):
+        responses = [create_mock_response(503, '{"error_message": "unavailable"}', {"Retry-After": "30"}), create_mock_response()]
+        client, transport = self.create_client(responses)
+        with deadline_scope(5):
+            with self.assertRaises(DeadlineExceededError):
+                client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+
+class TestRequestCoalescingUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_client(self, **kwargs):
+        transport = MagicMock()
+        def slow_request(**request_payload):
+            time.sleep(0.1)
+            return create_mock_response()
+        transport.request.side_effect = slow_request
+        return _Questions(transport=transport, lazy_probe=True, **kwargs), transport
+
+    def run_concurrently(self, function, callers=5):
+        barrier = threading.Barrier(callers)
+        def call(_):
+            barrier.wait()
+            return function()
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            return list(executor.map(call, range(callers)))
+
+    def test_identical_gets_share_one_call(self):
+        client, transport = self.create_client()
+        collapsed_before = request_group.stats()["collapsed"]
+        results = self.run_concurrently(lambda: client.check_question_status("ticket"))
+        self.assertEqual(transport.request.call_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(request_group.stats()["collapsed"] - collapsed_before, 4)
+
+    def test_different_credentials_are_not_shared(self):
+        client, transport = self.create_client()
+        other_client = _Questions(transport=transport, lazy_probe=True, api_secret_key="another-secret")
+        clients = iter([client, other_client])
+        lock = threading.Lock()
+        def check_status():
+            with lock:
+                caller = next(clients)
+            return caller.check_question_status("ticket")
+        self.run_concurrently(check_status, callers=2)
+        self.assertEqual(transport.request.call_count, 2)
+
+    def test_posts_are_not_shared(self):
+        client, transport = self.create_client()
+        self.run_concurrently(lambda: client.submit_question(question="Top Sponsors in NSCLC"), callers=3)
+        self.assertEqual(transport.request.call_count, 3)
+
+    def run_collapsed(self, single_flight, leader_function, waiter_function, waiters=2):
+        release = threading.Event()
+        def leader():
+            release.wait(2)
+            return leader_function()
+        def wait_until(condition):
+            deadline = time.monotonic() + 2
+            while not condition() and time.monotonic() < deadline:
+                time.sleep(0.001)
+        def call(index):
+            if index:
+                wait_until(lambda: single_flight.stats()["in_flight"])
+                function = waiter_function
+            else:
+                function = leader
+            try:
+                return single_flight.do("key", function, leader_errors=(DeadlineExceededError,))
+            except Exception as error:
+                return error
+        with ThreadPoolExecutor(max_workers=waiters + 1) as executor:
+            futures = [executor.submit(call, index) for index in range(waiters + 1)]
+            wait_until(lambda: single_flight.stats()["collapsed"] >= waiters)
+            release.set()
+            return [future.result() for future in futures]
+
+    def test_waiters_raise_their_own_copy_of_the_error(self):
+        def fail():
+            raise ValueError("Invalid response")
+        leader_error, *waiter_errors = self.run_collapsed(SingleFlight(), fail, fail)
+        self.assertIsInstance(leader_error, ValueError)
+        for waiter_error in waiter_errors:
+            self.assertIsInstance(waiter_error, ValueError)
+            self.assertIsNot(waiter_error, leader_error)
+            self.assertIs(waiter_error.__cause__, leader_error)
+            self.assertEqual(str(waiter_error), "Invalid response")
+
+    def test_waiters_retry_after_the_leader_deadline_expires(self):
+        def expire():
+            raise DeadlineExceededError("GET", "https://api.example.com/v1/questions/ticket/status")
+        single_flight = SingleFlight()
+        leader_error, *results = self.run_collapsed(single_flight, expire, lambda: "status")
+        self.assertIsInstance(leader_error, DeadlineExceededError)
+        self.assertEqual(results, ["status", "status"])
+
+    def test_coalescing_can_be_disabled(self):
+        client, transport = self.create_client(coalesce_requests=False)
+        self.run_concurrently(lambda: client.check_question_status("ticket"), callers=3)
+        self.assertEqual(transport.request.call_count, 3)
+
+
+class TestHTTPCacheUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.quicklinks_body = '{"quicklinks": [{"title": "Top Sponsors"}]}'
+
+    def create_client(self, responses):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        return _Quicklinks(transport=transport, lazy_probe=True, http_cache=HTTPCache()), transport
+
+    def test_not_modified_serves_cached_body(self):
+        client, transport = self.create_client([
+            create_mock_response(200, self.quicklinks_body, {"ETag": '"v1"'}),
+            create_mock_response(304, "")
+        ])
+        first_quicklinks = client.fetch_quicklinks()
+        second_quicklinks = client.fetch_quicklinks()
+
+        self.assertIs(second_quicklinks, first_quicklinks)
+        self.assertNotIn('If-None-Match', transport.request.call_args_list[0].kwargs['headers'])
+        self.assertEqual(transport.request.call_args_list[1].kwargs['headers']['If-None-Match'], '"v1"')
+        self.assertEqual(client.http_cache.stats()["hits"], 1)
+        self.assertEqual(client.http_cache.stats()["misses"], 1)
+
+    def test_modified_response_replaces_entry(self):
+        client, transport = self.create_client([
+            create_mock_response(200, self.quicklinks_body, {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+            create_mock_response(200, '{"quicklinks": []}', {"Last-Modified": "Thu, 22 Oct 2015 07:28:00 GMT"})
+        ])
+        client.fetch_quicklinks()
+        self.assertEqual(client.fetch_quicklinks(), {"quicklinks": []})
+        self.assertEqual(transport.request.call_args_list[1].kwargs['headers']['If-Modified-Since'], "Wed, 21 Oct 2015 07:28:00 GMT")
+
+    def test_response_without_validators_is_not_cached(self):
+        client, transport = self.create_client([create_mock_response(200, self.quicklinks_body)] * 2)
+        client.fetch_quicklinks()
+        client.fetch_quicklinks()
+        self.assertNotIn('If-None-Match', transport.request.call_args_list[1].kwargs['headers'])
+        self.assertEqual(client.http_cache.stats()["entries"], 0)
+
+    def test_cache_is_bounded_by_bytes(self):
+        http_cache = HTTPCache(max_bytes=100)
+        for index in range(3):
+            http_cache.set(("url", index), {"ETag": f'"{index}"'}, {"index": index}, 40)
+        self.assertIsNone(http_cache.get(("url", 0)))
+        self.assertIsNotNone(http_cache.get(("url", 2)))
+        self.assertEqual(http_cache.stats()["bytes"], 80)
+        self.assertEqual(http_cache.stats()["evictions"], 1)
+
+
+class TestRateLimiterUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_endpoint_group(self):
+        self.assertEqual(endpoint_group("https://api.example.com/v1/questions/ticket/status"), "questions")
+        self.assertEqual(endpoint_group("https://api.example.com/v1/subscription/create"), "subscription")
+        self.assertEqual(endpoint_group("https://api.example.com/api/v2/histories"), "histories")
+
+    def test_token_bucket_reserves_in_order(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, places=2)
+        self.assertAlmostEqual(waits[3], 0.2, places=2)
+        self.assertIsNone(bucket.reserve(max_wait=0.1))
+
+    @patch('huma_sdk._resources.time.sleep')
+    def test_requests_are_throttled_per_group(self, mock_sleep):
+        transport = MagicMock()
+        transport.request.side_effect = lambda **request_payload: create_mock_response()
+        rate_limiter = RateLimiter({"questions": (2, 1)})
+        client = _Questions(transport=transport, lazy_probe=True, rate_limiter=rate_limiter, coalesce_requests=False)
+        client.check_question_status("ticket")
+        client.check_question_status("ticket")
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.5, places=2)
+
+        histories_client = _Histories(transport=transport, lazy_probe=True, rate_limiter=rate_limiter)
+        histories_client.fetch_history()
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch('huma_sdk._resources.time.sleep')
+    def test_rate_limit_beyond_deadline_raises(self, mock_sleep):
+        transport = MagicMock()
+        transport.request.side_effect = lambda **request_payload: create_mock_response()
+        client = _Questions(transport=transport, lazy_probe=True, rate_limiter=RateLimiter(default=(0.1, 1)))
+        client.check_question_status("ticket")
+        with deadline_scope(1):
+            with self.assertRaises(DeadlineExceededError):
+                client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_count, 1)
+
+    def test_token_is_refunded_when_no_concurrency_slot_is_free(self):
+        transport = MagicMock()
+        transport.request.side_effect = lambda **request_payload: create_mock_response()
+        rate_limiter = RateLimiter({"questions": (1, 1)})
+        client = _Questions(transport=transport, lazy_probe=True, rate_limiter=rate_limiter, coalesce_requests=False)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        self.assertTrue(limiter.acquire())
+
+        with concurrency_scope(limiter), deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                client.check_question_status("ticket")
+        self.assertEqual(rate_limiter.reserve("https://api.example.com/v1/questions/ticket/status"), 0.0)
+        self.assertEqual(transport.request.call_count, 0)
+
+
+class TestAdaptiveConcurrencyUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_limit_grows_while_latency_is_flat(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+        for _ in range(20):
+            self.assertTrue(limiter.acquire(timeout=0))
+            limiter.release(latency=0.1)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_limit_backs_off_once_per_round_trip(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        limiter.acquire()
+        limiter.release(latency=10)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats()["decreases"], 1)
+
+    def test_latency_baselines_are_per_endpoint(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8)
+        for _ in range(40):
+            for endpoint, latency in (("GET /v1/questions/{id}/status", 0.01), ("GET /v1/questions/{id}/result", 0.5)):
+                self.assertTrue(limiter.acquire(timeout=0))
+                limiter.release(latency=latency, endpoint=endpoint)
+
+        # Slow result pages are normal for their endpoint, so the fast status polls do not shrink the limit
+        self.assertEqual(limiter.stats()["decreases"], 0)
+        self.assertEqual(limiter.limit, 8)
+        self.assertEqual(limiter.stats()["min_latency"], {"GET /v1/questions/{id}/status": 0.01, "GET /v1/questions/{id}/result": 0.5})
+
+    def test_latency_baseline_expires_after_two_windows(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, baseline_window=0.01)
+        limiter.acquire()
+        limiter.release(latency=0.01, endpoint="GET /v1/histories")
+        time.sleep(0.025)
+        limiter.acquire()
+        limiter.release(latency=0.1, endpoint="GET /v1/histories")
+        self.assertEqual(limiter.stats()["min_latency"], {"GET /v1/histories": 0.1})
+        self.assertEqual(limiter.stats()["decreases"], 0)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        threading.Timer(0.05, limiter.release, kwargs={"latency": 0.05}).start()
+        self.assertTrue(limiter.acquire(timeout=1))
+
+    @patch('huma_sdk._resources.time.sleep')
+    def test_rate_limited_responses_shrink_the_limit(self, mock_sleep):
+        transport = MagicMock()
+        transport.request.side_effect = lambda **request_payload: create_mock_response(429, '{"error_message": "slow down"}')
+        client = _Questions(transport=transport, lazy_probe=True, retry_policy=RetryPolicy(max_attempts=1))
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        with concurrency_scope(limiter):
+            client.submit_question(question="Top Sponsors in NSCLC")
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_concurrent_pages_respect_the_limit(self):
+        in_flight, peak, lock = [0], [0], threading.Lock()
+        def slow_request(**request_payload):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            page = request_payload['params']['page']
+            return create_mock_response(200, f'{{"answer": {{"data": [{page}]}}, "metadata": {{"page_count": 6, "total_count": 6, "has_next_page": true}}}}')
+        transport = MagicMock()
+        transport.request.side_effect = slow_request
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        client = _Questions(transport=transport, lazy_probe=True, concurrency_limiter=limiter)
+        answer_payload = client.fetch_answer("ticket", limit=1, is_batch_pages=True, max_page_count=6, max_workers=5)
+        self.assertEqual(answer_payload['answer']['data'], [1, 2, 3, 4, 5, 6])
+        self.assertLessEqual(peak[0], 2)
+
+
+class TestCircuitBreakerUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_client(self, responses, **kwargs):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        circuit_breakers = CircuitBreakerRegistry(failure_threshold=2, cooldown=30)
+        client = _Questions(api_url="https://api.example.com", transport=transport, lazy_probe=True,
+                            retry_policy=RetryPolicy(max_attempts=1), circuit_breakers=circuit_breakers, **kwargs)
+        return client, transport
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        client, transport = self.create_client([create_mock_response(503, '{"error_message": "unavailable"}')] * 2)
+        client.check_question_status("ticket")
+        client.check_question_status("ticket")
+        with self.assertRaises(CircuitOpenError) as context:
+            client.check_question_status("ticket")
+        self.assertEqual(context.exception.endpoint_family, "questions")
+        self.assertEqual(transport.request.call_count, 2)
+
+    def test_circuits_are_per_endpoint_family(self):
+        client, transport = self.create_client([create_mock_response(503, '{"error_message": "unavailable"}')] * 2 + [create_mock_response(200, '{"histories": []}')])
+        client.check_question_status("ticket")
+        client.check_question_status("ticket")
+        histories_client = _Histories(api_url="https://api.example.com", transport=transport, lazy_probe=True, circuit_breakers=client.circuit_breakers)
+        self.assertEqual(histories_client.fetch_history(), {"histories": []})
+
+    def test_half_open_probe_closes_circuit(self):
+        circuit_breaker = CircuitBreaker("questions", failure_threshold=1, cooldown=30)
+        circuit_breaker.before_request()
+        circuit_breaker.record(False)
+        self.assertEqual(circuit_breaker.state, OPEN)
+
+        circuit_breaker.opened_at -= 30
+        circuit_breaker.before_request()
+        self.assertEqual(circuit_breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_request()
+
+        circuit_breaker.record(True)
+        self.assertEqual(circuit_breaker.state, CLOSED)
+
+    def test_failed_probe_reopens_circuit(self):
+        circuit_breaker = CircuitBreaker("questions", failure_threshold=3, cooldown=30)
+        circuit_breaker.state, circuit_breaker.opened_at = OPEN, 0
+        circuit_breaker.before_request()
+        circuit_breaker.record(False)
+        self.assertEqual(circuit_breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            circuit_breaker.before_request()
+
+    def test_probe_is_released_when_acquisition_fails(self):
+        client, transport = self.create_client([create_mock_response(200, '{"status": "done"}')])
+        circuit_breaker = client.circuit_breakers.get("https://api.example.com/v1/questions/ticket/status")
+        circuit_breaker.state, circuit_breaker.opened_at = OPEN, 0
+
+        deadline_error = DeadlineExceededError("GET", "https://api.example.com/v1/questions/ticket/status")
+        with patch.object(_Questions, '_reserve_rate_limit', side_effect=deadline_error):
+            with self.assertRaises(DeadlineExceededError):
+                client.check_question_status("ticket")
+
+        # The probe that never went out does not keep the circuit stuck half-open
+        self.assertEqual(client.check_question_status("ticket"), {"status": "done"})
+        self.assertEqual(circuit_breaker.state, CLOSED)
+
+
+class _RecordingMiddleware(Middleware):
+    def __init__(self, name, events, response=None):
+        self.name, self.events, self.response = name, events, response
+
+    def before_request(self, request):
+        self.events.append((self.name, "before", request.method, request.attempt))
+        return self.response
+
+    def after_response(self, request, response):
+        self.events.append((self.name, "after", response.status_code))
+
+    def on_error(self, request, error):
+        self.events.append((self.name, "error", type(error).__name__))
+
+
+class TestMiddlewareUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_client(self, responses, middleware):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        client = _Questions(transport=transport, lazy_probe=True, middleware=middleware, coalesce_requests=False,
+                            retry_policy=RetryPolicy(jitter=False, backoff_factor=0, budget=RetryBudget()), circuit_breakers=CircuitBreakerRegistry())
+        return client, transport
+
+    def test_hooks_wrap_every_attempt(self):
+        events = []
+        middleware = [_RecordingMiddleware("outer", events), _RecordingMiddleware("inner", events)]
+        client, transport = self.create_client([requests.ConnectionError("reset"), create_mock_response(200, '{"status": "done"}')], middleware)
+        self.assertEqual(client.check_question_status("ticket"), {"status": "done"})
+        self.assertEqual(events, [
+            ("outer", "before", "GET", 1), ("inner", "before", "GET", 1),
+            ("inner", "error", "ConnectionError"), ("outer", "error", "ConnectionError"),
+            ("outer", "before", "GET", 2), ("inner", "before", "GET", 2),
+            ("inner", "after", 200), ("outer", "after", 200),
+        ])
+
+    def test_before_request_can_short_circuit(self):
+        events = []
+        cached_response = create_mock_response(200, '{"status": "cached"}')
+        middleware = [_RecordingMiddleware("cache", events, cached_response), _RecordingMiddleware("inner", events)]
+        client, transport = self.create_client([], middleware)
+        self.assertEqual(client.check_question_status("ticket"), {"status": "cached"})
+        transport.request.assert_not_called()
+        self.assertEqual(events, [("cache", "before", "GET", 1), ("inner", "after", 200), ("cache", "after", 200)])
+
+    def test_middleware_can_modify_the_request(self):
+        class HeaderMiddleware(Middleware):
+            def before_request(self, request):
+                request.payload['headers'] = {**request.payload.get('headers', {}), 'X-Request-Source': "batch"}
+
+        client, transport = self.create_client([create_mock_response(200, '{}')], [HeaderMiddleware()])
+        client.check_question_status("ticket")
+        self.assertEqual(transport.request.call_args.kwargs['headers']['X-Request-Source'], "batch")
+
+    def test_shared_middleware_applies_to_existing_clients(self):
+        events = []
+        client, transport = self.create_client([create_mock_response(200, '{}')], None)
+        configure_middleware([_RecordingMiddleware("shared", events)])
+        self.addCleanup(configure_middleware)
+        client.check_question_status("ticket")
+        self.assertEqual(events, [("shared", "before", "GET", 1), ("shared", "after", 200)])
+
+    def test_execute_gql_runs_middleware(self):
+        events = []
+        transport = MagicMock()
+        transport.request.return_value = create_mock_response(200, '{"data": {"getMessages": []}}')
+        chat_service = ChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql",
+                                     transport=transport, middleware=[_RecordingMiddleware("chat", events)])
+        response = chat_service.execute_gql("query GetMessages { getMessages { id } }", {"chat_id": "thread"})
+        self.assertEqual(response, {"data": {"getMessages": []}})
+        self.assertEqual(events, [("chat", "before", "POST", 1), ("chat", "after", 200)])
+        self.assertEqual(transport.request.call_args.kwargs['url'], "https://api.example.com/graphql")
+
+
+class TestClientStatsUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_client(self, responses):
+        transport = MagicMock()
+        transport.request.side_effect = responses
+        client = _Questions(api_url="https://api.example.com", transport=transport, lazy_probe=True, coalesce_requests=False,
+                            retry_policy=RetryPolicy(jitter=False, backoff_factor=0, budget=RetryBudget()), circuit_breakers=CircuitBreakerRegistry())
+        return client, transport
+
+    def test_attempts_are_counted_per_endpoint_template(self):
+        client, transport = self.create_client([
+            create_mock_response(503, '{}'), requests.ConnectionError("reset"), create_mock_response(200, '{"status": "done"}'),
+            create_mock_response(404, '{"error_message": "Not found"}'),
+        ])
+        client.check_question_status("ticket-1")
+        client.fetch_answer("ticket-2")
+
+        stats = client.stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["errors"], {"503": 1, "ConnectionError": 1, "404": 1})
+        self.assertEqual(stats["bytes_in"], len(b'{}') + len(b'{"status": "done"}') + len(b'{"error_message": "Not found"}'))
+        self.assertEqual(set(stats["endpoints"]), {"GET /v1/questions/{id}/status", "GET /v1/questions/{id}/result"})
+
+        status_stats = stats["endpoints"]["GET /v1/questions/{id}/status"]
+        self.assertEqual(status_stats["requests"], 3)
+        self.assertEqual(status_stats["latency"]["count"], 3)
+        self.assertLessEqual(status_stats["latency"]["p50"], status_stats["latency"]["p99"])
+
+    def test_clients_keep_separate_stats(self):
+        client, transport = self.create_client([create_mock_response(200, '{}')])
+        other_client, other_transport = self.create_client([])
+        client.check_question_status("ticket")
+        self.assertEqual(client.stats()["requests"], 1)
+        self.assertEqual(other_client.stats()["requests"], 0)
+
+    def test_endpoint_template(self):
+        self.assertEqual(endpoint_template("https://api.example.com/v1/histories/conversion/visual/status"), "/v1/histories/{id}/visual/status")
+        self.assertEqual(endpoint_template("https://api.example.com/v1/subscription/create"), "/v1/subscription/create")
+        self.assertEqual(endpoint_template("https://api.example.com/v1/favorites"), "/v1/favorites")
+
+    def test_histogram_percentiles_are_within_precision(self):
+        histogram = LatencyHistogram()
+        latencies = [index / 1000 for index in range(1, 1001)]
+        for latency in latencies:
+            histogram.record(latency)
+        for percentile, expected in ((50, 0.5), (90, 0.9), (99, 0.99)):
+            self.assertAlmostEqual(histogram.percentile(percentile), expected, delta=expected / 32)
+        self.assertEqual(histogram.snapshot()["max"], 1.0)
+
+    def test_chat_service_counts_graphql_operations(self):
+        transport = MagicMock()
+        transport.request.return_value = create_mock_response(200, '{"data": {"newChat": {"id": "chat"}}}')
+        chat_service = ChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", transport=transport)
+        chat_service.execute_gql("mutation newChat($topic: String!) { newChat(topic: $topic) { id } }", {"topic": "Trials"})
+        self.assertEqual(chat_service.stats()["endpoints"]["POST graphql newChat"]["requests"], 1)
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
@@ -0,0 +1,165 @@
+import asyncio
+import contextvars
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch, MagicMock
+from huma_sdk._resources import _Services, _access_probe_cache
+from huma_sdk._services._questions import _Questions
+from huma_sdk._async_resources import ChatServiceV2
+from huma_sdk._asyncio_resources import AsyncioChatServiceV2
+from huma_sdk._helpers.event_helpers import EventHandler
+from huma_sdk._helpers.questions_helper import QuestionQueue
+from huma_sdk._helpers.circuit_breaker_helpers import CircuitBreakerRegistry
+from huma_sdk._helpers.tracing_helpers import configure_tracer, start_span, _NOOP_SPAN
+
+
+class _RecordedSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.events = []
+        self.ended = 0
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, attributes=None):
+        self.events.append(name)
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self):
+        self.ended += 1
+
+
+class _RecordingTracer:
+    """Minimal stand-in for an OpenTelemetry tracer that keeps its current span in a context variable."""
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar("recorded_span", default=None)
+
+    def start_span(self, name, attributes=None):
+        span = _RecordedSpan(name, attributes, self._current.get())
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = self.start_span(name, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+            span.end()
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+def create_mock_response(status_code, content):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content.encode('utf-8')
+    response.headers = {}
+    return response
+
+
+class TestTracingUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        _access_probe_cache.invalidate()
+        patcher = patch.object(_Services, 'test_connection', return_value={"access": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracer = _RecordingTracer()
+        configure_tracer(self.tracer)
+        self.addCleanup(configure_tracer)
+
+    def test_spans_are_no_ops_without_tracer(self):
+        configure_tracer(None)
+        self.assertIs(start_span("huma_sdk.request"), _NOOP_SPAN)
+
+    def test_request_span_records_status_and_attempts(self):
+        transport = MagicMock()
+        transport.request.side_effect = [create_mock_response(503, '{}'), create_mock_response(200, '{"status": "done"}')]
+        client = _Questions(api_url="https://api.example.com", transport=transport, lazy_probe=True, coalesce_requests=False, circuit_breakers=CircuitBreakerRegistry())
+        with patch('time.sleep'):
+            client.check_question_status("ticket")
+
+        request_span, = self.tracer.named("huma_sdk.request")
+        self.assertEqual(request_span.attributes["http.request.method"], "GET")
+        self.assertEqual(request_span.attributes["url.full"], "https://api.example.com/v1/questions/ticket/status")
+        self.assertEqual(request_span.attributes["http.response.status_code"], 200)
+        self.assertEqual(request_span.attributes["huma.attempts"], 2)
+
+    @patch.object(_Questions, '_make_request')
+    def test_concurrent_pages_are_children_of_the_pagination_span(self, mock_make_request):
+        def make_request(**request_payload):
+            page = request_payload['params']['page']
+            return {"answer": {"data": [page]}, "metadata": {"page_count": 4, "total_count": 4, "has_next_page": page < 4}}
+        mock_make_request.side_effect = make_request
+
+        client = _Questions(lazy_probe=True)
+        client.fetch_answer("ticket", limit=1, is_batch_pages=True, max_page_count=4, max_workers=3)
+
+        paginate_span, = self.tracer.named("huma_sdk.paginate")
+        page_spans = self.tracer.named("huma_sdk.page")
+        self.assertEqual(sorted(span.attributes["huma.page"] for span in page_spans), [1, 2, 3, 4])
+        self.assertTrue(all(span.parent is paginate_span for span in page_spans))
+
+    def test_execute_gql_span(self):
+        transport = MagicMock()
+        transport.request.return_value = create_mock_response(200, '{"data": {}}')
+        chat_service = ChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", transport=transport)
+        chat_service.execute_gql("query getMessages { getMessages { id } }")
+
+        graphql_span, = self.tracer.named("huma_sdk.graphql")
+        self.assertEqual(graphql_span.attributes["graphql.operation.name"], "getMessages")
+        self.assertEqual(graphql_span.attributes["http.response.status_code"], 200)
+
+    def test_question_span_records_first_delta_and_completion(self):
+        span = self.tracer.start_span("huma_sdk.ask_question")
+        questions_queue = QuestionQueue()
+        questions_queue.push_multiple(["question"])
+        event_handler = EventHandler()
+        event_handler._init(True, {"message": {"final_status": False}}, "thread", questions_queue, MagicMock(), span)
+
+        stream_event = {"contentType": "stream", "contentsubType": "stream", "messageId": "message"}
+        event_handler._emit_subscription_event(stream_event, "v1")
+        event_handler._emit_subscription_event(stream_event, "v1")
+        self.assertEqual(span.events, ["first_stream_delta"])
+
+        completion_event = {"contentType": "system", "contentsubType": "system", "messageId": "message", "content": '{"is_processed": true}'}
+        event_handler._emit_subscription_event(completion_event, "v1")
+        self.assertIn("huma.time_to_first_delta", span.attributes)
+        self.assertIn("huma.time_to_completion", span.attributes)
+        self.assertTrue(span.attributes["huma.completed"])
+
+        event_handler._end_span(completed=False)
+        self.assertEqual(span.ended, 1)
+
+    def test_question_span_is_ended_when_the_chat_cannot_start(self):
+        chat_service = ChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", transport=MagicMock())
+        with patch.object(ChatServiceV2, 'start_new_chat', side_effect=RuntimeError("chat unavailable")):
+            with self.assertRaises(RuntimeError):
+                chat_service.ask_question(["question"])
+
+        span, = self.tracer.named("huma_sdk.ask_question")
+        self.assertEqual(span.ended, 1)
+
+    def test_asyncio_question_span_is_ended_when_the_chat_cannot_start(self):
+        chat_service = AsyncioChatServiceV2(api_secret_key="secret", graphql_api_url="https://api.example.com/graphql", transport=MagicMock())
+        with patch.object(AsyncioChatServiceV2, 'verify_thread_id', side_effect=RuntimeError("unknown thread")):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(chat_service.ask_question(["question"], thread_id="thread"))
+
+        span, = self.tracer.named("huma_sdk.ask_question")
+        self.assertEqual(span.ended, 1)
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
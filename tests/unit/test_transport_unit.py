@@ -0,0 +1,245 @@
+import gzip
+import json
+import time
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from huma_sdk import _transport
+from huma_sdk._transport import _Transport, _AsyncioTransport, TransportStats, get_transport, configure_transport
+from huma_sdk._helpers.hedge_helpers import HedgePolicy
+from huma_sdk._helpers.middleware_helpers import Middleware, MiddlewareChain, RequestContext
+from huma_sdk._services._questions import _Questions
+from huma_sdk._services._favorites import _Favorites
+
+
+class TestSharedTransportUnitCase(unittest.TestCase):
+
+    def create_mock_response(self):
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b'{"question_status": "accepted"}'
+        return response
+
+    @patch.object(_Questions, 'test_connection')
+    @patch.object(_Favorites, 'test_connection')
+    def test_services_share_transport(self, *mock_test_connections):
+        questions_client = _Questions()
+        favorites_client = _Favorites()
+        self.assertIs(questions_client.transport, favorites_client.transport)
+        self.assertIs(questions_client.transport, get_transport())
+
+    @patch.object(_Questions, 'test_connection')
+    def test_make_request_uses_transport(self, mock_test_connection):
+        transport = MagicMock()
+        transport.request.return_value = self.create_mock_response()
+        client = _Questions(transport=transport)
+        question_status = client.check_question_status("ticket")
+        self.assertEqual(question_status, {"question_status": "accepted"})
+        self.assertEqual(transport.request.call_args.kwargs['method'], "GET")
+
+    def test_configure_transport_pool_size(self):
+        previous_transport = _transport._shared_transport
+        try:
+            transport = configure_transport(pool_connections=4, pool_maxsize=32)
+            adapter = transport.session.get_adapter("https://api.example.com")
+            self.assertIs(get_transport(), transport)
+            self.assertEqual(adapter._pool_connections, 4)
+            self.assertEqual(adapter._pool_maxsize, 32)
+        finally:
+            _transport._shared_transport = previous_transport
+
+    def test_transport_does_not_store_cookies(self):
+        transport = _Transport()
+        self.assertFalse(transport.session.cookies._policy.set_ok(MagicMock(), MagicMock()))
+
+
+ANSWER_PAGE = json.dumps({"answer": {"type": "table", "data": [{"sponsor": "Sponsor", "trials": index} for index in range(200)]}}).encode("utf-8")
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = gzip.compress(ANSWER_PAGE) if accepts_gzip else ANSWER_PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if accepts_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCompressionUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/questions/ticket/result"
+
+    def test_compressed_response_is_decoded_and_counted(self):
+        stats = TransportStats()
+        transport = _Transport(stats=stats)
+        self.addCleanup(transport.close)
+
+        response = transport.request(method="GET", url=self.url)
+        self.assertEqual(response.content, ANSWER_PAGE)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["responses"], 1)
+        self.assertEqual(snapshot["compressed_responses"], 1)
+        self.assertEqual(snapshot["body_bytes"], len(ANSWER_PAGE))
+        self.assertEqual(snapshot["wire_bytes"], len(gzip.compress(ANSWER_PAGE)))
+        self.assertGreater(snapshot["compression_ratio"], 1)
+
+    def test_phases_are_timed_for_middleware(self):
+        transport = _Transport(stats=TransportStats())
+        self.addCleanup(transport.close)
+        chain = MiddlewareChain([Middleware()])
+
+        first_request = RequestContext({"method": "GET", "url": self.url})
+        response = chain.send(first_request, transport.request)
+        self.assertEqual(response.content, ANSWER_PAGE)
+        self.assertEqual(set(first_request.timings), {"dns", "connect", "ttfb", "body", "total"})
+        self.assertGreaterEqual(first_request.timings["total"], first_request.timings["ttfb"])
+
+        # The second request reuses the keep-alive connection
+        second_request = RequestContext({"method": "GET", "url": self.url})
+        chain.send(second_request, transport.request)
+        self.assertEqual(set(second_request.timings), {"ttfb", "body", "total"})
+
+    def test_asyncio_phases_are_timed_for_middleware(self):
+        transport = _AsyncioTransport(stats=TransportStats())
+        chain = MiddlewareChain([Middleware()])
+        request = RequestContext({"method": "GET", "url": self.url})
+
+        async def send():
+            try:
+                return await chain.send_async(request, transport.request)
+            finally:
+                await transport.aclose()
+
+        self.assertEqual(asyncio.run(send()).content, ANSWER_PAGE)
+        self.assertTrue({"connect", "ttfb", "body", "total"} <= set(request.timings))
+        self.assertFalse(any(phase.startswith("_") for phase in request.timings))
+
+
+class TestHedgedRequestsUnitCase(unittest.TestCase):
+    url = "https://api.example.com/v1/questions/ticket/status"
+
+    def create_hedge_policy(self, **kwargs):
+        kwargs.setdefault('min_delay', 0.01)
+        kwargs.setdefault('max_delay', 0.05)
+        kwargs.setdefault('max_extra_load', 1)
+        hedge_policy = HedgePolicy(min_samples=1, **kwargs)
+        hedge_policy.record_latency(self.url, 0.01)
+        return hedge_policy
+
+    def create_transport(self, hedge_policy, delays):
+        transport = _Transport(hedge_policy=hedge_policy)
+        self.addCleanup(transport.close)
+        delays = iter(delays)
+
+        def send(**request_payload):
+            time.sleep(next(delays))
+            response = MagicMock()
+            response.sent_at = time.monotonic()
+            return response
+
+        transport._send = MagicMock(side_effect=send)
+        return transport
+
+    def test_slow_get_is_hedged(self):
+        hedge_policy = self.create_hedge_policy()
+        transport = self.create_transport(hedge_policy, [0.5, 0])
+        started_at = time.monotonic()
+        transport.request(method="GET", url=self.url)
+        self.assertLess(time.monotonic() - started_at, 0.4)
+        self.assertEqual(transport._send.call_count, 2)
+        self.assertEqual(hedge_policy.stats(), {"requests": 1, "hedged": 1, "hedge_wins": 1})
+
+    @patch.object(_Questions, 'test_connection')
+    def test_client_keeps_working_after_transport_is_reconfigured(self, mock_test_connection):
+        previous_transport = _transport._shared_transport
+        self.addCleanup(setattr, _transport, '_shared_transport', previous_transport)
+        transport = configure_transport(hedge_policy=self.create_hedge_policy())
+        transport._send = MagicMock(return_value=MagicMock(status_code=200, content=b'{"question_status": "accepted"}'))
+        client = _Questions(api_url="https://api.example.com", coalesce_requests=False)
+        client.check_question_status("ticket")
+
+        self.addCleanup(configure_transport(pool_maxsize=5).close)
+        self.assertEqual(client.check_question_status("ticket"), {"question_status": "accepted"})
+        self.assertIs(client.transport, transport)
+        transport.close()
+
+    def test_fast_get_is_not_hedged(self):
+        hedge_policy = self.create_hedge_policy(min_delay=0.2, max_delay=None)
+        transport = self.create_transport(hedge_policy, [0])
+        transport.request(method="GET", url=self.url)
+        self.assertEqual(transport._send.call_count, 1)
+
+    def test_post_is_never_hedged(self):
+        transport = self.create_transport(self.create_hedge_policy(), [0.05])
+        transport.request(method="POST", url=self.url)
+        self.assertEqual(transport._send.call_count, 1)
+
+    def test_hedges_are_capped_by_extra_load(self):
+        hedge_policy = self.create_hedge_policy(max_extra_load=0.5)
+        transport = self.create_transport(hedge_policy, [0.2, 0.2, 0])
+        transport.request(method="GET", url=self.url)
+        transport.request(method="GET", url=self.url)
+        self.assertEqual(transport._send.call_count, 3)
+        self.assertEqual(hedge_policy.stats()["hedged"], 1)
+
+    def test_hedge_delay_follows_latency_percentile(self):
+        hedge_policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+        for latency in range(1, 10):
+            hedge_policy.record_latency(self.url, latency / 100)
+        self.assertIsNone(hedge_policy.hedge_delay(self.url))
+        hedge_policy.record_latency(self.url, 1.0)
+        self.assertEqual(hedge_policy.hedge_delay(self.url), 1.0)
+        self.assertIsNone(HedgePolicy(endpoint_groups={"answers"}).hedge_delay(self.url))
+
+    def test_hedge_delay_is_per_endpoint_template(self):
+        hedge_policy = HedgePolicy(percentile=50, min_samples=2, min_delay=0)
+        status_url, result_url = "https://api.example.com/v1/questions/a1/status", "https://api.example.com/v1/questions/b2/result"
+        for _ in range(2):
+            hedge_policy.record_latency(status_url, 0.05)
+            hedge_policy.record_latency(result_url, 2.0)
+        self.assertEqual(hedge_policy.hedge_delay("https://api.example.com/v1/questions/c3/status"), 0.05)
+        self.assertEqual(hedge_policy.hedge_delay("https://api.example.com/v1/questions/d4/result"), 2.0)
+
+    def test_asyncio_loser_is_cancelled(self):
+        hedge_policy = self.create_hedge_policy()
+        transport = _AsyncioTransport(hedge_policy=hedge_policy)
+        cancelled = []
+
+        async def send(method, url, **request_payload):
+            delay = 0.5 if not transport._send.await_count > 1 else 0
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return "response"
+
+        async def run():
+            transport._send = AsyncMock(side_effect=send)
+            return await transport.request("GET", self.url)
+
+        self.assertEqual(asyncio.run(run()), "response")
+        self.assertEqual(cancelled, [self.url])
+        self.assertEqual(hedge_policy.stats()["hedge_wins"], 1)
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()
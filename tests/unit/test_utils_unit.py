@@ -0,0 +1,45 @@
+import math
+import unittest
+from huma_sdk import _utils
+from huma_sdk._utils import parse_json_response, json_loads, json_dumps, set_json_backend
+
+
+class TestJsonCodecUnitCase(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, _utils, '_json_codec', _utils._json_codec)
+
+    def test_parse_json_response_from_bytes(self):
+        self.assertEqual(parse_json_response(b'{"answer": {"data": [1, 2]}}'), {"answer": {"data": [1, 2]}})
+
+    def test_parse_json_response_returns_text_when_not_json(self):
+        self.assertEqual(parse_json_response(b"Bad Gateway"), "Bad Gateway")
+        self.assertEqual(parse_json_response("Bad Gateway"), "Bad Gateway")
+
+    def test_backends_round_trip(self):
+        payload = {"answer": {"type": "table", "data": [{"Sponsor": "Merck", "count": 12, "ratio": 0.5, "active": True, "note": None}]}}
+        for backend in _utils._JSON_CODECS:
+            try:
+                set_json_backend(backend)
+            except ImportError:
+                continue
+            self.assertEqual(json_loads(json_dumps(payload)), payload)
+            self.assertEqual(json_loads(json_dumps(payload, pretty=True).encode("utf-8")), payload)
+
+    def test_fast_backend_falls_back_to_stdlib(self):
+        set_json_backend()
+        self.assertTrue(math.isnan(json_loads('{"ratio": NaN}')["ratio"]))
+        self.assertEqual(json_dumps({1: "first"}), '{"1": "first"}')
+
+    def test_stdlib_backend(self):
+        self.assertEqual(set_json_backend("json"), "json")
+        self.assertEqual(json_dumps({"b": 1, "a": 2}, pretty=True), '{\n    "a": 2,\n    "b": 1\n}')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_json_backend("simplejson")
+
+
+if __name__ == '__main__':
+    import nose2
+    nose2.discover()